@@ -0,0 +1,109 @@
+"""
+assets.py
+Asset statis ber-fingerprint di branch output, di-cache browser selamanya.
+
+    assets/{nama}.{hash}.css    isi tidak pernah berubah untuk path yang sama
+    _headers                    Cache-Control immutable untuk /assets/* dan
+                                noindex untuk /source/*, di dalam blok
+                                bertanda; aturan lain di file itu (ditulis
+                                tangan) dibiarkan apa adanya
+
+Nama file memuat hash isi, jadi CSS yang berubah selalu mendapat URL baru
+dan halaman lama tetap menunjuk ke versi yang cocok dengannya (file lama
+tidak dihapus). Modul yang mendefinisikan CSS mendaftarkannya sekali saat
+import:
+
+    SITE_CSS = assets.stylesheet("site", _BASE_CSS + _NAV_CSS + _FOOTER_CSS)
+    SITE_CSS.link()        # <link rel="stylesheet" href="/assets/site.3f2a….css">
+    SITE_CSS.preload()     # sama, tanpa memblokir render; dipasangkan dengan
+                           # inline_style(...) berisi CSS kritis halaman
+
+Setiap commit yang mempublish halaman memanggil add_to(batch, store) supaya asset
+yang dirujuk ikut di commit yang sama; asset yang sudah ada di branch output
+dilewati oleh PublishBatch (blob sha sama).
+"""
+import re
+import hashlib
+from typing import NamedTuple
+
+import minify
+
+ASSET_DIR     = "assets"
+HEADERS_PATH  = "_headers"
+HASH_LEN      = 10
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Bukan halaman situs: snapshot body sumber untuk rerender.py (SOURCE_DIR)
+NOINDEX_PATHS = ("/source/*",)
+
+_BLOCK_START = "# >>> assets.py: dikelola otomatis, jangan diedit"
+_BLOCK_END   = "# <<< assets.py"
+_BLOCK       = re.compile(rf"\n*{re.escape(_BLOCK_START)}\n.*?{re.escape(_BLOCK_END)}\n?", re.S)
+
+_registry = {}   # path → Asset
+
+
+class Asset(NamedTuple):
+    name:    str
+    path:    str      # path di branch output
+    href:    str      # URL absolut-path di situs
+    content: str
+
+    def link(self) -> str:
+        return f'<link rel="stylesheet" href="{self.href}">'
+
+    def preload(self) -> str:
+        """Stylesheet yang tidak memblokir render (pasangan inline_style)."""
+        return (f'<link rel="preload" href="{self.href}" as="style" '
+                f'onload="this.onload=null;this.rel=\'stylesheet\'">'
+                f'<noscript>{self.link()}</noscript>')
+
+
+def fingerprint(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:HASH_LEN]
+
+
+def stylesheet(name: str, css: str) -> Asset:
+    """Daftarkan CSS (di-minify) sebagai assets/{name}.{hash}.css."""
+    css   = minify.css(css)
+    path  = f"{ASSET_DIR}/{name}.{fingerprint(css)}.css"
+    asset = Asset(name, path, f"/{path}", css)
+    _registry[path] = asset
+    return asset
+
+
+def inline_style(*parts: str) -> str:
+    """<style> inline (di-minify) untuk CSS kritis — bukan asset, tidak di-cache terpisah."""
+    css = minify.css("\n".join(parts))
+    return f"<style>{css}</style>"
+
+
+def registered() -> list:
+    return [_registry[path] for path in sorted(_registry)]
+
+
+def headers() -> str:
+    """Blok aturan _headers milik modul ini (format Cloudflare Pages / Netlify)."""
+    rules = [f"/{ASSET_DIR}/*\n  Cache-Control: {CACHE_CONTROL}\n"]
+    rules.extend(f"{path}\n  X-Robots-Tag: noindex\n" for path in NOINDEX_PATHS)
+    return f"{_BLOCK_START}\n{''.join(rules)}{_BLOCK_END}\n"
+
+
+def merge_headers(current: str) -> str:
+    """_headers yang ada dengan blok assets.py diganti / ditambahkan di akhir."""
+    rest = _BLOCK.sub("\n", current).strip("\n")
+    return f"{rest}\n\n{headers()}" if rest else headers()
+
+
+def add_to(batch, store) -> int:
+    """
+    Tambahkan semua asset terdaftar + _headers ke batch. store = backend
+    branch output (isi _headers saat ini). Return jumlah asset.
+    """
+    for asset in registered():
+        batch.add(asset.path, asset.content)
+    try:
+        current = store.read(HEADERS_PATH)
+    except FileNotFoundError:
+        current = ""
+    batch.add(HEADERS_PATH, merge_headers(current))
+    return len(_registry)
@@ -39,10 +39,12 @@ import re
 import sys
 import json
 import base64
-import urllib.request
 import urllib.error
 import urllib.parse
 
+import http_client
+import tracing
+
 WORKER_URL     = os.environ.get("WORKER_URL", "").rstrip("/") + "/"
 BRIEF_TOKEN    = os.environ.get("BRIEF_TOKEN", "")
 OPENROUTER_KEY = os.environ.get("OPENROUTER_API_KEY", "")
@@ -93,30 +95,20 @@ else:
 
 def worker_get(path: str) -> str:
     url = WORKER_URL + path.lstrip("/")
-    req = urllib.request.Request(
-        url,
+    return http_client.request(
+        "GET", url,
         headers={"X-Brief-Token": BRIEF_TOKEN, "User-Agent": "ai-engine"},
-        method="GET"
-    )
-    with urllib.request.urlopen(req, timeout=30) as r:
-        return r.read().decode("utf-8")
+        timeout=30
+    ).text()
 
 
 def worker_post(path: str, data: dict) -> str:
-    url  = WORKER_URL + path.lstrip("/")
-    body = urllib.parse.urlencode(data).encode("utf-8")
-    req  = urllib.request.Request(
-        url,
-        data=body,
-        headers={
-            "X-Brief-Token": BRIEF_TOKEN,
-            "Content-Type":  "application/x-www-form-urlencoded",
-            "User-Agent":    "ai-engine"
-        },
-        method="POST"
-    )
-    with urllib.request.urlopen(req, timeout=60) as r:
-        return r.read().decode("utf-8")
+    url = WORKER_URL + path.lstrip("/")
+    return http_client.post_form(
+        url, data,
+        headers={"X-Brief-Token": BRIEF_TOKEN, "User-Agent": "ai-engine"},
+        timeout=60
+    ).text()
 
 
 # ─── Slug (identik dengan Worker JS) ──────────────────────────────────────────
@@ -181,6 +173,7 @@ def pick_best_keyword(stock: dict, is_article: bool,
 
 # ─── Staging slug check ────────────────────────────────────────────────────────
 
+@tracing.traced()
 def get_staged_slugs(is_article: bool) -> set:
     """
     Ambil semua slug yang sudah ada di staging via /get_memory.
@@ -197,6 +190,7 @@ def get_staged_slugs(is_article: bool) -> set:
 
 # ─── Brief ────────────────────────────────────────────────────────────────────
 
+@tracing.traced()
 def call_brief(kw: dict, content_type: str) -> dict:
     """
     Panggil Worker /brief.
@@ -259,27 +253,24 @@ def call_openrouter(messages: list, label: str = "") -> str:
             print(f"    Skip {model}: API key tidak tersedia.")
             continue
 
-        payload = json.dumps({
+        payload = {
             "model":      model,
             "messages":   messages,
             "max_tokens": MAX_TOKENS,
-        }).encode("utf-8")
-
-        req = urllib.request.Request(
-            url,
-            data=payload,
-            headers={
-                "Authorization": f"Bearer {key}",
-                "Content-Type":  "application/json",
-                "HTTP-Referer":  SITE_BASE_URL,
-                "X-Title":       "SaaS Tools Content Engine",
-                "User-Agent":    "ai-engine",
-            },
-            method="POST"
-        )
+        }
+
         try:
-            with urllib.request.urlopen(req, timeout=120) as r:
-                data = json.loads(r.read())
+            with tracing.span(f"llm:{label or 'call'}", model=model):
+                data = http_client.send_json(
+                    "POST", url, payload,
+                    headers={
+                        "Authorization": f"Bearer {key}",
+                        "HTTP-Referer":  SITE_BASE_URL,
+                        "X-Title":       "SaaS Tools Content Engine",
+                        "User-Agent":    "ai-engine",
+                    },
+                    timeout=120
+                ).json()
         except urllib.error.HTTPError as e:
             body = e.read().decode()
             if _should_fallback(e.code, body):
@@ -488,7 +479,8 @@ def run() -> None:
     # 1. Ambil keyword stock
     print("1/8 Mengambil keyword stock...")
     try:
-        stock = json.loads(worker_get("list_keywords"))
+        with tracing.span("list_keywords"):
+            stock = json.loads(worker_get("list_keywords"))
     except Exception as e:
         print(f"FATAL: Gagal ambil keyword stock: {e}")
         sys.exit(1)
@@ -579,10 +571,11 @@ def run() -> None:
     #    Identik dengan tombol UPDATE MEMORY di BriefActivity
     print("7/8 Mendaftarkan slug ke keyword stock (Fase 1)...")
     try:
-        worker_get(
-            "update_keyword?"
-            + urllib.parse.urlencode({"keyword": kw["keyword"], "slug": slug})
-        )
+        with tracing.span("register_slug"):
+            worker_get(
+                "update_keyword?"
+                + urllib.parse.urlencode({"keyword": kw["keyword"], "slug": slug})
+            )
         print(f"    Slug '{slug}' terdaftar.")
     except Exception as e:
         print(
@@ -595,11 +588,12 @@ def run() -> None:
     print(f"8/8 Upload ke staging/{content_type}s/ready/{slug}.html (Fase 2)...")
     content_b64 = base64.b64encode(html_final.encode("utf-8")).decode("utf-8")
     try:
-        result = worker_post("upload_staging", {
-            "slug":    slug,
-            "type":    content_type,
-            "content": content_b64,
-        })
+        with tracing.span("upload_staging", bytes=len(content_b64)):
+            result = worker_post("upload_staging", {
+                "slug":    slug,
+                "type":    content_type,
+                "content": content_b64,
+            })
     except Exception as e:
         print(f"FATAL: Gagal upload ke staging: {e}")
         sys.exit(1)
@@ -617,4 +611,5 @@ def run() -> None:
 
 
 if __name__ == "__main__":
-    run()
+    with tracing.span("auto_generate", task_type=TASK_TYPE):
+        run()
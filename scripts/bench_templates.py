@@ -0,0 +1,105 @@
+"""
+bench_templates.py
+Micro-benchmark render halaman postprocess (wrap_article_html / wrap_tool_html):
+halaman per detik untuk re-render massal, tanpa storage dan network.
+
+    # Body sintetis
+    python scripts/bench_templates.py
+
+    # Body staging nyata, mis. dari fixture replay.py
+    python scripts/bench_templates.py --dir .replay/fixture/ai-brain/staging/articles/ready
+
+Setiap body di-render sekali sebagai pemanasan (parse html_meta ikut
+ter-cache, sama seperti di run_pipeline), lalu diulang selama --seconds
+per jenis halaman.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+os.environ.setdefault("TRACE", "0")      # span minify per halaman tidak perlu dicatat
+
+from postprocess import wrap_article_html, wrap_tool_html
+
+BENCH_SECONDS = 3.0
+BENCH_PAGES   = 50
+
+_WORDS = ("saas founder churn revenue pricing mrr cohort runway burn growth "
+          "retention onboarding trial annual discount cac ltv payback").split()
+
+
+def synthetic_bodies(count: int = BENCH_PAGES, seed: int = 0) -> list:
+    """[(slug, body_html)] mirip output AI: h1, meta, paragraf, FAQ."""
+    rng    = random.Random(seed)
+    bodies = []
+    for i in range(count):
+        paras = "".join(
+            "<p>" + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(40, 120))) + "</p>\n"
+            for _ in range(rng.randint(8, 25))
+        )
+        faq = "".join(
+            f'<details><summary>Question {n}?</summary>'
+            f'<div class="faq-answer">{" ".join(rng.choice(_WORDS) for _ in range(30))}</div>'
+            f'</details>'
+            for n in range(rng.randint(0, 5))
+        )
+        bodies.append((f"bench-page-{i}", (
+            f"<h1>Bench page {i}</h1>\n"
+            f'<meta name="description" content="Benchmark page {i}">\n'
+            f'<meta name="cluster" content="cluster-{i % 5}">\n'
+            f'{paras}<div class="faq">{faq}</div>\n'
+        )))
+    return bodies
+
+
+def load_bodies(folder: str) -> list:
+    bodies = []
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".html"):
+            with open(os.path.join(folder, name), encoding="utf-8") as f:
+                bodies.append((name[:-len(".html")], f.read()))
+    return bodies
+
+
+def bench(render, bodies: list, seconds: float) -> dict:
+    for slug, body in bodies:
+        render(body, slug)
+
+    pages, out_bytes = 0, 0
+    started = time.perf_counter()
+    while True:
+        for slug, body in bodies:
+            out_bytes += len(render(body, slug))
+            pages     += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            break
+    return {"pages": pages, "seconds": elapsed, "pages_per_sec": pages / elapsed,
+            "mb_per_sec": out_bytes / elapsed / 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark render template postprocess")
+    parser.add_argument("--dir", help="folder body .html (default: body sintetis)")
+    parser.add_argument("--pages", type=int, default=BENCH_PAGES,
+                        help="jumlah body sintetis (tanpa --dir)")
+    parser.add_argument("--seconds", type=float, default=BENCH_SECONDS,
+                        help="durasi per jenis halaman")
+    args = parser.parse_args()
+
+    bodies = load_bodies(args.dir) if args.dir else synthetic_bodies(args.pages)
+    if not bodies:
+        print(f"FATAL: tidak ada body .html di {args.dir}")
+        sys.exit(1)
+
+    print(f"{len(bodies)} body, {args.seconds:.1f}s per jenis halaman")
+    for label, render in (("article", wrap_article_html), ("tool", wrap_tool_html)):
+        r = bench(render, bodies, args.seconds)
+        print(f"  {label:<8} {r['pages_per_sec']:>9,.0f} halaman/s  "
+              f"{r['mb_per_sec']:>7.1f} MB/s  ({r['pages']:,} render)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+blob_registry.py
+Registry blob SHA selama satu run: (repo, ref, path) → sha.
+
+Diisi dari listing folder (Contents API), tree rekursif (Git Trees API),
+serta setiap response GET/PUT. Write berikutnya ke path yang sama bisa
+langsung PUT dengan sha yang sudah diketahui — tanpa GET tambahan.
+
+Nilai None berarti "diketahui tidak ada" (404, atau tidak muncul di folder
+yang sudah di-list lengkap), jadi file baru juga tidak perlu GET dulu.
+ref "" dipakai untuk default branch repo.
+
+git_blob_sha menghitung sha blob secara lokal, jadi penulis bisa membandingkan
+isi baru dengan sha remote dan melewati write yang isinya tidak berubah.
+"""
+import hashlib
+import threading
+
+_lock      = threading.Lock()
+_shas      = {}      # (repo, ref, path) → sha | None
+_listed    = set()   # (repo, ref, folder) yang isinya sudah diketahui lengkap
+_recursive = set()   # (repo, ref) yang seluruh tree-nya sudah di-list
+_unknown   = set()   # (repo, ref, path) yang di-forget setelah listing
+
+
+def git_blob_sha(data: bytes | str) -> str:
+    """sha blob git: sha1("blob <len>\\0" + data), sama dengan yang dihitung GitHub."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def git_tree_sha(items: list) -> str:
+    """
+    sha tree git untuk folder datar. items: [{name, sha}] (blob mode 100644).
+    Sama dengan sha folder yang dilaporkan GitHub selama folder tidak punya
+    subfolder / file executable.
+    """
+    body = b"".join(
+        b"100644 " + item["name"].encode("utf-8") + b"\0" + bytes.fromhex(item["sha"])
+        for item in sorted(items, key=lambda i: i["name"].encode("utf-8"))
+    )
+    return hashlib.sha1(b"tree %d\0" % len(body) + body).hexdigest()
+
+
+def unchanged(repo: str, ref: str, path: str, data: bytes | str) -> bool:
+    """True jika sha remote yang diketahui sama dengan sha isi baru."""
+    sha = lookup(repo, ref, path)
+    return sha is not None and sha == git_blob_sha(data)
+
+
+def _parent(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+def remember(repo: str, ref: str, path: str, sha: str | None) -> None:
+    """Catat sha terbaru sebuah path (None = file tidak ada)."""
+    with _lock:
+        _shas[(repo, ref, path)] = sha
+        _unknown.discard((repo, ref, path))
+
+
+def forget(repo: str, ref: str, path: str) -> None:
+    """Lupakan path (sha tidak lagi bisa dipercaya)."""
+    with _lock:
+        _shas.pop((repo, ref, path), None)
+        _unknown.add((repo, ref, path))
+
+
+def remember_listing(repo: str, ref: str, folder: str, items: list) -> None:
+    """
+    Catat hasil list satu folder. items: [{path, sha}] berisi SEMUA file
+    di folder tersebut, jadi path lain di folder itu dianggap tidak ada.
+    """
+    folder = folder.strip("/")
+    with _lock:
+        for item in items:
+            _shas[(repo, ref, item["path"])] = item["sha"]
+            _unknown.discard((repo, ref, item["path"]))
+        _listed.add((repo, ref, folder))
+
+
+def remember_tree(repo: str, ref: str, tree: list) -> None:
+    """Catat hasil git/trees?recursive=1 — semua blob dan folder jadi diketahui."""
+    with _lock:
+        _recursive.add((repo, ref))
+        for item in tree:
+            if item.get("type") == "blob":
+                _shas[(repo, ref, item["path"])] = item["sha"]
+                _unknown.discard((repo, ref, item["path"]))
+
+
+def known(repo: str, ref: str, path: str) -> bool:
+    """True jika status path (ada + sha, atau tidak ada) sudah diketahui."""
+    key = (repo, ref, path)
+    with _lock:
+        if key in _shas:
+            return True
+        if key in _unknown:
+            return False
+        return (repo, ref) in _recursive or (repo, ref, _parent(path)) in _listed
+
+
+def lookup(repo: str, ref: str, path: str) -> str | None:
+    """Return sha yang diketahui, atau None (tidak ada / belum diketahui)."""
+    with _lock:
+        return _shas.get((repo, ref, path))
@@ -0,0 +1,126 @@
+"""
+checkpoint.py
+Journal langkah per slug untuk run_pipeline, disimpan di samping manifest
+(staging/{articles|tools}/journal.json di ai-brain).
+
+Setelah commit output berhasil, setiap slug dicatat beserta langkah yang
+sudah selesai. Run berikutnya membaca journal lebih dulu: slug yang sudah
+dipublish tapi langkah lanjutannya belum lengkap (mis. proses mati sebelum
+hapus staging) TIDAK dirender / dipublish ulang, hanya langkah yang belum
+selesai yang dijalankan. Slug yang semua langkahnya selesai dibuang dari
+journal, jadi file ini biasanya kosong. save() memakai transact_json: slug
+milik run lain yang ditulis sejak journal dibaca tidak ikut tertimpa.
+
+Format:
+    {"slugs": {"<slug>": {"filename", "sha", "title", "og",
+                          "done": {"<step>": "<iso timestamp>"}}}}
+"""
+
+import clock
+from loader import fetch_json, transact_json
+
+# Urutan = urutan eksekusi normal di run_pipeline
+STEPS = (
+    "published",          # HTML ada di branch output
+    "indexed",            # event content-index.log (content_index.py)
+    "og_published",       # og/{slug}.png (hanya artikel dengan OG image)
+    "staged_removed",     # file staging dihapus
+    "keyword_notified",   # keyword_stock → DONE via Worker
+    "memory_updated",     # editorial memory (shard slug)
+    "warm_queued",        # job warm_queue.py (hanya jika ada OG image)
+)
+# Langkah yang ikut commit output (atomik, selalu selesai bersamaan)
+COMMIT_STEPS = ("published", "indexed", "og_published", "warm_queued")
+_OG_STEPS    = ("og_published", "warm_queued")
+
+
+def journal_path(folder_type: str) -> str:
+    return f"staging/{folder_type}/journal.json"
+
+
+class Journal:
+    def __init__(self, path: str):
+        self.path  = path
+        self.slugs = {}
+        self.dirty = False
+        self._removed = set()   # slug yang dibuang run ini (drop / lengkap)
+
+    def load(self) -> "Journal":
+        """Baca journal; tidak ada / rusak → journal kosong."""
+        try:
+            self.slugs = fetch_json(self.path).get("slugs", {})
+        except FileNotFoundError:
+            self.slugs = {}
+        except Exception as e:
+            print(f"Warning: journal {self.path} tidak bisa dibaca, mulai kosong: {e}")
+            self.slugs = {}
+        return self
+
+    # ── Query ─────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def required(entry: dict) -> tuple:
+        """Langkah yang wajib selesai untuk entri ini."""
+        return tuple(s for s in STEPS if entry.get("og") or s not in _OG_STEPS)
+
+    def missing(self, slug: str) -> list:
+        entry = self.slugs.get(slug)
+        if entry is None:
+            return list(STEPS)
+        return [s for s in self.required(entry) if s not in entry.get("done", {})]
+
+    def is_done(self, slug: str, step: str) -> bool:
+        return step in self.slugs.get(slug, {}).get("done", {})
+
+    def incomplete(self) -> list:
+        """[(slug, entry)] yang sudah dipublish tapi belum semua langkah selesai."""
+        return [(slug, entry) for slug, entry in self.slugs.items()
+                if "published" in entry.get("done", {}) and self.missing(slug)]
+
+    # ── Update ────────────────────────────────────────────────────────────────
+
+    def record(self, slug: str, filename: str, sha: str, title: str, og: bool) -> None:
+        """Catat slug yang baru dipublish (langkah commit langsung selesai)."""
+        self.slugs[slug] = {
+            "filename": filename,
+            "sha":      sha,
+            "title":    title,
+            "og":       og,
+            "done":     {},
+        }
+        self.mark(slug, *(s for s in COMMIT_STEPS if og or s not in _OG_STEPS))
+
+    def mark(self, slug: str, *steps: str) -> None:
+        entry = self.slugs.get(slug)
+        if entry is None:
+            return
+        now = clock.utcnow().isoformat()
+        for step in steps:
+            if step not in entry["done"]:
+                entry["done"][step] = now
+                self.dirty = True
+
+    def drop(self, slug: str) -> None:
+        if self.slugs.pop(slug, None) is not None:
+            self._removed.add(slug)
+            self.dirty = True
+
+    def save(self, message: str) -> bool:
+        """Tulis journal; slug yang sudah lengkap dibuang lebih dulu."""
+        for slug in [s for s in self.slugs if not self.missing(s)]:
+            self.drop(slug)
+        if not self.dirty:
+            return True
+
+        def mutate(doc: dict) -> dict | None:
+            slugs = {s: e for s, e in doc.get("slugs", {}).items()
+                     if s not in self._removed}
+            slugs.update(self.slugs)
+            return None if slugs == doc.get("slugs") else {"slugs": slugs}
+
+        result = transact_json(self.path, mutate, message)
+        if result.ok:
+            self.dirty = False
+        else:
+            print(f"Warning: journal {self.path} gagal ditulis")
+        return result.ok
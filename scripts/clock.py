@@ -0,0 +1,21 @@
+"""
+clock.py
+Sumber waktu bersama untuk pipeline. FROZEN_NOW (ISO, mis. "2025-01-15" atau
+"2025-01-15T08:00:00") membekukan waktu, dipakai replay.py supaya render
+ulang dari fixture yang sama menghasilkan output yang byte-identik.
+"""
+import os
+from datetime import datetime
+
+FROZEN_NOW = os.environ.get("FROZEN_NOW", "")
+
+_frozen = datetime.fromisoformat(FROZEN_NOW) if FROZEN_NOW else None
+
+
+def utcnow() -> datetime:
+    """datetime.utcnow(), atau waktu beku jika FROZEN_NOW di-set."""
+    return _frozen or datetime.utcnow()
+
+
+def frozen() -> bool:
+    return _frozen is not None
@@ -0,0 +1,185 @@
+"""
+content_index.py
+content-index.json di branch output, dirawat sebagai log event append-only
+yang dikompaksi sekali per build.
+
+    content-index.json                    hasil kompaksi (dibaca situs & sitemap_gen)
+    content-index.log/{waktu}-{id}.jsonl  event yang belum dikompaksi
+
+Publish tidak lagi membaca dan menulis ulang seluruh index: setiap commit
+publish menambahkan SATU file event baru (beberapa ratus byte), satu baris
+per event:
+    {"op": "add" | "update" | "remove", "kind": "articles" | "tools",
+     "slug": "...", "entry": {...}, "ts": "<iso>"}
+
+Nama file event unik per commit, jadi dua run yang publish bersamaan tidak
+pernah menulis path yang sama: commit yang di-rebase (PublishBatch retry)
+tetap membawa event keduanya.
+
+compact() (dipanggil sitemap_gen) menerapkan semua event sesuai urutan nama
+file ke content-index.json, lalu file event yang sudah diterapkan dihapus
+di commit yang sama dengan index hasil kompaksi.
+"""
+import json
+import hashlib
+
+import clock
+
+INDEX_PATH = "content-index.json"
+LOG_DIR    = "content-index.log"
+KINDS      = ("articles", "tools")
+OPS        = ("add", "update", "remove")
+
+
+def kind_for(content_type: str) -> str:
+    return "articles" if content_type == "article" else "tools"
+
+
+def empty() -> dict:
+    return {kind: [] for kind in KINDS}
+
+
+# ── Append ────────────────────────────────────────────────────────────────────
+
+def event(op: str, kind: str, slug: str, entry: dict | None = None) -> dict:
+    if op not in OPS:
+        raise ValueError(f"op content index tidak dikenal: {op}")
+    if kind not in KINDS:
+        raise ValueError(f"kind content index tidak dikenal: {kind}")
+    ev = {"op": op, "kind": kind, "slug": slug}
+    if entry is not None:
+        ev["entry"] = entry
+    ev["ts"] = clock.utcnow().isoformat()
+    return ev
+
+
+def log_path(body: str) -> str:
+    """
+    Path file event baru; urutan nama = urutan waktu. id = hash isi, jadi
+    replay dengan waktu beku (clock.py) menghasilkan nama yang sama.
+    """
+    stamp  = clock.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    digest = hashlib.sha1(body.encode("utf-8")).hexdigest()[:8]
+    return f"{LOG_DIR}/{stamp}-{digest}.jsonl"
+
+
+def append(batch, events: list) -> str | None:
+    """
+    Tambahkan file event ke batch publish (ikut commit yang sama dengan HTML).
+    Return path file event, atau None jika tidak ada event.
+    """
+    if not events:
+        return None
+    body = "".join(json.dumps(ev, ensure_ascii=False) + "\n" for ev in events)
+    path = log_path(body)
+    batch.add(path, body)
+    return path
+
+
+# ── Kompaksi ──────────────────────────────────────────────────────────────────
+
+def apply(index: dict, events: list) -> int:
+    """
+    Terapkan event ke index (in-place). Return jumlah perubahan.
+    add    → tambah jika slug belum ada (publish ulang tidak menduplikasi)
+    update → gabungkan field ke entri yang ada, atau tambah jika belum ada
+    remove → hapus entri slug
+    """
+    positions = {kind: {e["slug"]: i for i, e in enumerate(index.setdefault(kind, []))}
+                 for kind in KINDS}
+    changes = 0
+    for ev in events:
+        kind, slug = ev.get("kind"), ev.get("slug")
+        if kind not in KINDS or not slug:
+            print(f"Warning: event content index tidak valid, dilewati: {ev}")
+            continue
+        entries, pos = index[kind], positions[kind]
+        op = ev.get("op")
+        if op in ("add", "update") and slug not in pos:
+            entries.append(dict(ev.get("entry") or {}, slug=slug))
+            pos[slug] = len(entries) - 1
+            changes += 1
+        elif op == "update":
+            merged = dict(entries[pos[slug]], **(ev.get("entry") or {}), slug=slug)
+            if merged != entries[pos[slug]]:
+                entries[pos[slug]] = merged
+                changes += 1
+        elif op == "remove" and slug in pos:
+            del entries[pos.pop(slug)]
+            positions[kind] = pos = {e["slug"]: i for i, e in enumerate(entries)}
+            changes += 1
+        elif op not in OPS:
+            print(f"Warning: op content index tidak dikenal, dilewati: {op}")
+    return changes
+
+
+def parse_log(text: str, path: str = "") -> list:
+    events = []
+    for n, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            print(f"Warning: {path}:{n} bukan JSON valid, dilewati: {e}")
+    return events
+
+
+def read_log(store) -> tuple:
+    """(events, paths) dari semua file event di store, urut nama file."""
+    paths = sorted(f["path"] for f in store.list_folder(LOG_DIR)
+                   if f["name"].endswith(".jsonl"))
+    events = []
+    for path in paths:
+        events.extend(parse_log(store.read(path), path))
+    return events, paths
+
+
+def load(store) -> dict:
+    """content-index.json hasil kompaksi terakhir (tanpa event yang tertunda)."""
+    try:
+        return json.loads(store.read(INDEX_PATH))
+    except FileNotFoundError:
+        return empty()
+
+
+def current(store) -> dict:
+    """
+    Index terkini (content-index.json + event tertunda) tanpa menulis apa pun
+    dan tanpa membuang entri stale — untuk related content saat build.
+    """
+    index     = load(store)
+    events, _ = read_log(store)
+    apply(index, events)
+    return index
+
+
+def compact(store, active_slugs: set | None = None) -> tuple:
+    """
+    Index terkini = content-index.json + semua event yang tertunda.
+    active_slugs: jika diberikan, entri yang file-nya sudah tidak ada di
+    branch output ikut dibuang.
+    Return (index, body, consumed): body = isi baru content-index.json atau
+    None jika tidak berubah; consumed = file event yang harus dihapus.
+    Error baca selain file tidak ada di-raise: menulis index dari keadaan
+    kosong akan menghapus semua entri lama.
+    """
+    index           = load(store)
+    events, paths   = read_log(store)
+    changes         = apply(index, events)
+    if paths:
+        print(f"Content index: {len(events)} event dari {len(paths)} file log, "
+              f"{changes} perubahan")
+
+    if active_slugs is not None:
+        stale = 0
+        for kind in KINDS:
+            before      = len(index[kind])
+            index[kind] = [e for e in index[kind] if e["slug"] in active_slugs]
+            stale      += before - len(index[kind])
+        if stale:
+            print(f"{INDEX_PATH}: {stale} stale entries pruned")
+        changes += stale
+
+    body = json.dumps(index, indent=2) if changes else None
+    return index, body, paths
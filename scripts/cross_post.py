@@ -10,111 +10,67 @@ import os
 import re
 import sys
 import json
-import base64
-import urllib.request
 import urllib.error
 from datetime import datetime
 
+import http_client
+import tracing
+import html_meta
+from publisher import output_store
+
 # ── Environment ───────────────────────────────────────────────────────────────
 ENGINE_REPO    = os.environ.get("ENGINE_REPO", "")
 GITHUB_TOKEN   = os.environ.get("GITHUB_TOKEN", "")
 SITE_URL       = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
 DEV_TO_KEY     = os.environ.get("DEV_TO_API_KEY", "")
 OUTPUT_BRANCH  = "output"
-API_BASE       = "https://api.github.com"
 
 # Tag tetap untuk semua artikel (relevan untuk niche SaaS metrics)
 ARTICLE_TAGS = ["saas", "startup", "metrics", "bootstrapped"]
 
 # ── GitHub helpers ─────────────────────────────────────────────────────────────
 
-def _gh_headers() -> dict:
-    return {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept":        "application/vnd.github.v3+json",
-        "User-Agent":    "ai-engine"
-    }
-
-
+@tracing.traced()
 def fetch_article_html(slug: str) -> str:
     """Fetch HTML artikel dari output branch."""
     path = f"articles/{slug}.html"
-    url  = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}?ref={OUTPUT_BRANCH}"
-    req  = urllib.request.Request(url, headers=_gh_headers())
     try:
-        with urllib.request.urlopen(req, timeout=30) as r:
-            data = json.loads(r.read())
-            return base64.b64decode(data["content"]).decode("utf-8")
+        return output_store(ENGINE_REPO, OUTPUT_BRANCH).read(path)
     except urllib.error.HTTPError as e:
         raise RuntimeError(f"Gagal fetch {path}: HTTP {e.code}")
+    except FileNotFoundError:
+        raise RuntimeError(f"Gagal fetch {path}: tidak ada")
 
 
+@tracing.traced()
 def check_already_posted(slug: str) -> dict | None:
     """Return tracking data jika artikel sudah pernah di-cross-post, None jika belum."""
     path = f"cross_posts/{slug}.json"
-    url  = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}?ref={OUTPUT_BRANCH}"
-    req  = urllib.request.Request(url, headers=_gh_headers())
     try:
-        with urllib.request.urlopen(req, timeout=15) as r:
-            data = json.loads(r.read())
-            return json.loads(base64.b64decode(data["content"]).decode("utf-8"))
+        return json.loads(output_store(ENGINE_REPO, OUTPUT_BRANCH).read(path))
     except Exception:
         return None
 
 
+@tracing.traced()
 def save_tracking(slug: str, results: dict) -> None:
     """Simpan tracking cross_posts/{slug}.json ke output branch."""
-    path    = f"cross_posts/{slug}.json"
-    api_url = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}"
-
-    sha = None
-    try:
-        req = urllib.request.Request(
-            f"{api_url}?ref={OUTPUT_BRANCH}", headers=_gh_headers()
-        )
-        with urllib.request.urlopen(req, timeout=15) as r:
-            sha = json.loads(r.read()).get("sha")
-    except Exception:
-        pass
-
-    payload = {
-        "message": f"[cross-post] Tracking for {slug}",
-        "content": base64.b64encode(
-            json.dumps(results, indent=2, ensure_ascii=False).encode()
-        ).decode(),
-        "branch": OUTPUT_BRANCH
-    }
-    if sha:
-        payload["sha"] = sha
-
-    req = urllib.request.Request(
-        api_url,
-        data=json.dumps(payload).encode(),
-        headers={**_gh_headers(), "Content-Type": "application/json"},
-        method="PUT"
+    path = f"cross_posts/{slug}.json"
+    # sha sudah tercatat di blob_registry oleh check_already_posted (404 → file baru)
+    ok = output_store(ENGINE_REPO, OUTPUT_BRANCH).write(
+        path, json.dumps(results, indent=2, ensure_ascii=False),
+        f"[cross-post] Tracking for {slug}"
     )
-    with urllib.request.urlopen(req, timeout=30) as r:
-        print(f"    Tracking saved: HTTP {r.status}")
+    print(f"    Tracking saved: {'OK' if ok else 'FAILED'}")
 
 
 # ── Content extraction ─────────────────────────────────────────────────────────
 
 def extract_meta(html: str) -> dict:
     """Ambil title, description, dan cluster dari HTML."""
-    title_m   = re.search(r'<title>([^<]+)</title>', html, re.IGNORECASE)
-    desc_m    = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']',
-        html, re.IGNORECASE
-    )
-    cluster_m = re.search(
-        r'<meta\s+name=["\']cluster["\']\s+content=["\'](.*?)["\']',
-        html, re.IGNORECASE
-    )
-    title = title_m.group(1).strip() if title_m else ""
-    title = re.sub(r'\s*[—\-]\s*SaaS Tools.*$', '', title).strip()
-    desc  = desc_m.group(1).strip() if desc_m else ""
-    cluster = cluster_m.group(1).strip() if cluster_m else ""
-    return {"title": title, "description": desc, "cluster": cluster}
+    meta  = html_meta.extract(html)
+    title = re.sub(r'\s*[—\-]\s*SaaS Tools.*$', '', meta.title).strip()
+    return {"title": title, "description": meta.description, "cluster": meta.cluster}
 
 
 def extract_article_body(html: str) -> str:
@@ -141,6 +97,7 @@ def fix_markdown_formatting(md: str) -> str:
     return md
 
 
+@tracing.traced()
 def html_to_markdown(html: str, base_url: str) -> str:
     """
     Konversi HTML ke Markdown menggunakan html2text.
@@ -178,6 +135,7 @@ def html_to_markdown(html: str, base_url: str) -> str:
 
 # ── Dev.to ─────────────────────────────────────────────────────────────────────
 
+@tracing.traced()
 def post_to_devto(title: str, markdown: str, canonical_url: str,
                   description: str) -> dict:
     """
@@ -206,22 +164,15 @@ def post_to_devto(title: str, markdown: str, canonical_url: str,
         }
     }
 
-    req = urllib.request.Request(
-        "https://dev.to/api/articles",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "api-key":      DEV_TO_KEY,
-            "Content-Type": "application/json",
-            "User-Agent":   "ai-engine"
-        },
-        method="POST"
-    )
     try:
-        with urllib.request.urlopen(req, timeout=60) as r:
-            result = json.loads(r.read())
-            url    = result.get("url", "")
-            print(f"    Dev.to posted: {url}")
-            return {"url": url, "id": result.get("id")}
+        result = http_client.send_json(
+            "POST", "https://dev.to/api/articles", payload,
+            headers={"api-key": DEV_TO_KEY, "User-Agent": "ai-engine"},
+            timeout=60
+        ).json()
+        url = result.get("url", "")
+        print(f"    Dev.to posted: {url}")
+        return {"url": url, "id": result.get("id")}
     except urllib.error.HTTPError as e:
         err = e.read().decode(errors="replace")
         raise RuntimeError(f"Dev.to API {e.code}: {err[:300]}")
@@ -303,4 +254,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with tracing.span("cross_post"):
+        main()
\ No newline at end of file
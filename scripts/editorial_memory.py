@@ -0,0 +1,236 @@
+"""
+editorial_memory.py
+Editorial memory di ai-brain, di-shard per jenis konten + hash slug.
+
+Layout:
+  editorial_memory/index.json           {"shards": n} — ada = shard adalah sumber data
+  editorial_memory/articles-{n}.json    {"last_updated", "entries": [...]}
+  editorial_memory/tools-{n}.json
+  editorial_memory.json                 tampilan penuh format lama, dibangun
+                                        ulang dari shard (rebuild), bukan di
+                                        setiap publish
+
+Shard sebuah slug ditentukan dari hash slug (stabil), jadi upsert hanya
+membaca dan menulis SATU shard kecil; di dalam shard, slug → posisi dicari
+lewat index dict (O(1)), bukan scan list. Shard ditulis satu entri per baris
+(tanpa indent=2) supaya kecil dan diff-nya rapi. Shard yang isinya tidak
+berubah tidak ditulis. Setiap write lewat transact_json: jika shard diubah
+run lain sejak dibaca, upsert diterapkan ulang di atas isi terbaru.
+
+Pembaca yang butuh semua entri memakai load() (format lama
+{"last_updated", "published_articles", "published_tools"}). Worker
+(/brief, /get_memory) membaca editorial_memory.json langsung dari repo,
+jadi file itu di-rebuild dari shard sebelum Worker dipakai:
+
+    python scripts/editorial_memory.py rebuild     # auto-stage.yml
+
+Saat write pertama (index.json belum ada) entri editorial_memory.json
+baseline dipecah ke shard; file itu sendiri tidak diubah.
+"""
+import os
+import sys
+import json
+import zlib
+
+import clock
+from loader import fetch_json, transact_json
+
+LEGACY_PATH = "editorial_memory.json"
+SHARD_DIR   = "editorial_memory"
+INDEX_PATH  = f"{SHARD_DIR}/index.json"
+SHARDS      = int(os.environ.get("EDITORIAL_MEMORY_SHARDS", 8))
+
+_LEGACY_KEY = {"articles": "published_articles", "tools": "published_tools"}
+
+
+def kind_for(content_type: str) -> str:
+    return "articles" if content_type == "article" else "tools"
+
+
+def _dumps_shard(shard: dict) -> str:
+    lines = ",\n".join(json.dumps(e, ensure_ascii=False) for e in shard["entries"])
+    return (f'{{"last_updated": {json.dumps(shard["last_updated"])},\n'
+            f'"entries": [\n{lines}\n]}}\n')
+
+
+class Shard:
+    def __init__(self, path: str, data: dict | None = None):
+        self.path         = path
+        data              = data or {}
+        self.last_updated = data.get("last_updated", "")
+        self.entries      = list(data.get("entries", []))
+        self.index        = {e["slug"]: i for i, e in enumerate(self.entries)}
+        self.dirty        = False
+
+    @classmethod
+    def load(cls, path: str) -> "Shard":
+        try:
+            return cls(path, fetch_json(path))
+        except FileNotFoundError:
+            return cls(path)
+
+    def upsert(self, entry: dict) -> None:
+        pos = self.index.get(entry["slug"])
+        if pos is None:
+            self.index[entry["slug"]] = len(self.entries)
+            self.entries.append(entry)
+            self.dirty = True
+        elif self.entries[pos] != entry:
+            self.entries[pos] = entry
+            self.dirty = True
+
+    def to_dict(self) -> dict:
+        return {"last_updated": self.last_updated, "entries": self.entries}
+
+
+class EditorialMemory:
+    def __init__(self):
+        self.index  = None
+        self.shards = {}   # path → Shard (dimuat sesuai kebutuhan)
+
+    def _load_index(self) -> dict:
+        if self.index is None:
+            try:
+                self.index = fetch_json(INDEX_PATH)
+            except FileNotFoundError:
+                self.index = {}
+        return self.index
+
+    @property
+    def sharded(self) -> bool:
+        return bool(self._load_index())
+
+    @property
+    def shard_count(self) -> int:
+        return int(self._load_index().get("shards", SHARDS))
+
+    def shard_path(self, kind: str, slug: str) -> str:
+        n = zlib.crc32(slug.encode("utf-8")) % self.shard_count
+        return f"{SHARD_DIR}/{kind}-{n}.json"
+
+    def _shard(self, path: str) -> Shard:
+        shard = self.shards.get(path)
+        if shard is None:
+            shard = self.shards[path] = Shard.load(path)
+        return shard
+
+    # ── Write ─────────────────────────────────────────────────────────────────
+
+    def _upsert_shard(self, path: str, entries: list, message: str) -> bool:
+        """Upsert ke satu shard lewat transact_json (diulang saat konflik)."""
+        today = clock.utcnow().strftime("%Y-%m-%d")
+
+        def mutate(data: dict) -> dict | None:
+            shard = Shard(path, data)
+            for entry in entries:
+                shard.upsert(entry)
+            if not shard.dirty:
+                return None
+            shard.last_updated = today
+            return shard.to_dict()
+
+        result = transact_json(path, mutate, message, encode=_dumps_shard)
+        if result.ok:
+            self.shards[path] = Shard(path, result.value)
+        return result.ok
+
+    def _group(self, kind: str, entries: list) -> dict:
+        """{path shard: [entri]} — urutan entri dalam shard dipertahankan."""
+        groups = {}
+        for entry in entries:
+            groups.setdefault(self.shard_path(kind, entry["slug"]), []).append(entry)
+        return groups
+
+    def _migrate(self) -> bool:
+        """editorial_memory.json baseline → shard + index.json. Return False jika gagal."""
+        if self.sharded:
+            return True
+        try:
+            legacy = fetch_json(LEGACY_PATH)
+        except FileNotFoundError:
+            legacy = {}
+        self.index = {"shards": SHARDS}
+        entries    = {kind: legacy.get(key, []) for kind, key in _LEGACY_KEY.items()}
+        total      = sum(len(v) for v in entries.values())
+        if total:
+            print(f"Editorial memory: migrasi {total} entri ke {SHARDS} shard per jenis")
+        for kind, kind_entries in entries.items():
+            for path, group in self._group(kind, kind_entries).items():
+                if not self._upsert_shard(path, group,
+                                          "[pipeline] Migrate editorial memory shard"):
+                    self.index = None
+                    return False
+
+        # Run lain sudah migrasi lebih dulu → index miliknya dipakai apa adanya
+        new_index = self.index
+        result    = transact_json(INDEX_PATH, lambda index: None if index else new_index,
+                                  "[pipeline] Editorial memory shard index")
+        self.index = result.value if result.ok else None
+        return result.ok
+
+    def upsert(self, kind: str, entries: list, message: str) -> bool:
+        """
+        Tambah / perbarui entri {slug, title, published_date}.
+        Hanya shard yang berubah yang ditulis. Return True jika semua berhasil.
+        """
+        if not self._migrate():
+            return False
+        return all([self._upsert_shard(path, group, message)
+                    for path, group in self._group(kind, entries).items()])
+
+    # ── Read (kompatibel format lama) ─────────────────────────────────────────
+
+    def load(self) -> dict:
+        """Tampilan penuh format lama: last_updated, published_articles / published_tools."""
+        if not self.sharded:
+            try:
+                legacy = fetch_json(LEGACY_PATH)
+            except FileNotFoundError:
+                legacy = {}
+            return {"last_updated": legacy.get("last_updated", ""),
+                    **{key: legacy.get(key, []) for key in _LEGACY_KEY.values()}}
+        view = {"last_updated": ""}
+        for kind, key in _LEGACY_KEY.items():
+            entries = []
+            for n in range(self.shard_count):
+                shard = self._shard(f"{SHARD_DIR}/{kind}-{n}.json")
+                entries.extend(shard.entries)
+                view["last_updated"] = max(view["last_updated"], shard.last_updated)
+            view[key] = sorted(entries, key=lambda e: e.get("published_date", ""))
+        return view
+
+    def rebuild_legacy(self) -> bool:
+        """
+        Tulis ulang editorial_memory.json dari shard (hanya jika isinya
+        berubah). Key lain di file itu dipertahankan.
+        """
+        if not self.sharded:
+            print("Editorial memory: belum di-shard, editorial_memory.json sudah lengkap")
+            return True
+        view = self.load()
+
+        def mutate(memory: dict) -> dict | None:
+            new = dict(memory, **view)
+            return new if new != memory else None
+
+        result = transact_json(LEGACY_PATH, mutate,
+                               "[pipeline] Rebuild editorial memory full view")
+        if result.ok:
+            counts = ", ".join(f"{len(view[key])} {kind}" for kind, key in _LEGACY_KEY.items())
+            print(f"{LEGACY_PATH}: {'ditulis ulang' if result.written else 'tidak berubah'} "
+                  f"({counts})")
+        return result.ok
+
+
+def load() -> dict:
+    """Semua entri editorial memory dalam format lama."""
+    return EditorialMemory().load()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        print("Usage: python scripts/editorial_memory.py rebuild")
+        sys.exit(2)
+    if not EditorialMemory().rebuild_legacy():
+        print(f"FATAL: {LEGACY_PATH} gagal dibangun ulang")
+        sys.exit(1)
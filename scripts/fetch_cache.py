@@ -0,0 +1,107 @@
+"""
+fetch_cache.py
+Cache on-disk untuk conditional request (ETag / If-None-Match) ke GitHub.
+
+Setiap entri disimpan per repo+path: ETag terakhir + isi file yang sudah
+di-decode. Request berikutnya mengirim If-None-Match; jika GitHub membalas
+304, isi diambil dari cache (tidak memotong kuota rate-limit, tanpa decode).
+
+Ukuran total dibatasi FETCH_CACHE_MAX_BYTES; entri yang paling lama tidak
+dipakai (mtime file) dibuang lebih dulu (LRU).
+"""
+import os
+import json
+import atexit
+import hashlib
+
+CACHE_DIR       = os.environ.get(
+    "FETCH_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ai-engine", "fetch")
+)
+CACHE_MAX_BYTES = int(os.environ.get("FETCH_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+CACHE_ENABLED   = os.environ.get("FETCH_CACHE", "1") != "0"
+
+
+class FetchCache:
+    def __init__(self, directory: str, max_bytes: int, enabled: bool = True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled   = enabled
+        self.hits      = 0
+        self.misses    = 0
+        self.evicted   = 0
+
+    def _file(self, repo: str, path: str) -> str:
+        key = hashlib.sha1(f"{repo}:{path}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, repo: str, path: str) -> dict | None:
+        """Return {"etag", "body"} atau None jika belum ada di cache."""
+        if not self.enabled:
+            return None
+        fpath = self._file(repo, path)
+        try:
+            with open(fpath, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("repo") != repo or entry.get("path") != path:
+            return None
+        try:
+            os.utime(fpath)  # tandai baru dipakai (LRU)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, repo: str, path: str, etag: str, body: str,
+            sha: str = "") -> None:
+        if not self.enabled or not etag:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fpath = self._file(repo, path)
+            tmp   = fpath + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"repo": repo, "path": path, "etag": etag,
+                           "sha": sha, "body": body}, f)
+            os.replace(tmp, fpath)
+            self._evict()
+        except OSError as e:
+            print(f"Warning: fetch cache tidak bisa menulis {path}: {e}")
+
+    def invalidate(self, repo: str, path: str) -> None:
+        try:
+            os.remove(self._file(repo, path))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Buang entri paling lama tidak dipakai sampai total <= max_bytes."""
+        entries = []
+        total   = 0
+        for e in os.scandir(self.directory):
+            if not e.name.endswith(".json"):
+                continue
+            st = e.stat()
+            entries.append((st.st_mtime, st.st_size, e.path))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, fpath in sorted(entries):
+            try:
+                os.remove(fpath)
+            except OSError:
+                continue
+            self.evicted += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def report(self) -> None:
+        if self.hits or self.misses:
+            print(f"[fetch_cache] hits={self.hits} misses={self.misses} "
+                  f"evicted={self.evicted}")
+
+
+cache = FetchCache(CACHE_DIR, CACHE_MAX_BYTES, CACHE_ENABLED)
+atexit.register(cache.report)
@@ -0,0 +1,652 @@
+"""
+gh_emulator.py
+Emulator lokal untuk subset GitHub REST API yang dipakai script ai-engine,
+supaya pipeline bisa dijalankan & diukur end-to-end tanpa network.
+
+Endpoint:
+  GET    /repos/{owner}/{repo}/contents/{path}[?ref=]    file (base64) / listing folder
+  PUT    /repos/{owner}/{repo}/contents/{path}           create / update (sha wajib jika ada)
+  DELETE /repos/{owner}/{repo}/contents/{path}
+  GET    /repos/{owner}/{repo}/git/trees/{ref}[?recursive=1]
+  GET    /repos/{owner}/{repo}/tarball[/{ref}]           tar.gz (git archive)
+  GET    /repos/{owner}/{repo}/branches/{branch}
+  GET    /repos/{owner}/{repo}/git/refs/heads/{branch}
+  PATCH  /repos/{owner}/{repo}/git/refs/heads/{branch}   fast-forward only kecuali force
+  POST   /repos/{owner}/{repo}/git/refs | git/blobs | git/trees | git/commits
+  GET    /rate_limit
+  GET    /__emulator/stats                               jumlah request per endpoint
+  POST   /__emulator/scrape?id=URL&scrape=true           pengganti Graph API scrape
+  GET    /__emulator/scrape                              daftar URL yang sudah di-scrape
+
+Setiap repo disimpan sebagai bare git repo di {root}/{owner}/{repo}.git, jadi
+sha blob/tree/commit identik dengan GitHub (blob_registry tetap valid) dan
+hasil run bisa diperiksa dengan git biasa.
+
+Injeksi gangguan:
+  --latency-ms N      tunda setiap response N ms
+  --rate-limit N      maksimal N request per --rate-window detik; sisanya 403
+  --conflict-rate P   probabilitas write dijawab konflik palsu
+                      (Contents PUT/DELETE → 409, PATCH ref → 422 non-fast-forward)
+
+Usage:
+  python scripts/gh_emulator.py --root /tmp/gh --port 8765 \\
+      --seed-repo akunTools/ai-brain=fixtures/brain \\
+      --seed-repo akunTools/ai-engine@output=fixtures/output
+  GITHUB_API_BASE=http://127.0.0.1:8765 python scripts/run_pipeline.py
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import base64
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BRANCH = "main"
+ZERO_SHA       = "0" * 40
+GIT_IDENTITY   = {
+    "GIT_AUTHOR_NAME":     "gh-emulator",
+    "GIT_AUTHOR_EMAIL":    "gh-emulator@localhost",
+    "GIT_COMMITTER_NAME":  "gh-emulator",
+    "GIT_COMMITTER_EMAIL": "gh-emulator@localhost",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status  = status
+        self.message = message
+
+
+# ─────────────────────────────────────────────
+# BARE GIT REPO
+# ─────────────────────────────────────────────
+
+class GitRepo:
+    """Satu repo GitHub = satu bare git repo di disk (plumbing commands saja)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()   # serialisasi write (ref update)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+            self._git("init", "-q", "--bare", f"--initial-branch={DEFAULT_BRANCH}")
+
+    def _git(self, *args, data: bytes | None = None, env: dict | None = None,
+             check: bool = True) -> str:
+        full_env = dict(os.environ, **GIT_IDENTITY, **(env or {}))
+        r = subprocess.run(["git", "--git-dir", self.path, *args], input=data,
+                           capture_output=True, env=full_env)
+        if check and r.returncode != 0:
+            raise RuntimeError(f"git {args[0]}: {r.stderr.decode(errors='replace').strip()}")
+        return r.stdout.decode("utf-8", errors="surrogateescape").strip() \
+            if r.returncode == 0 else ""
+
+    def head(self, branch: str) -> str | None:
+        return self._git("rev-parse", "--verify", "-q", f"refs/heads/{branch}",
+                         check=False) or None
+
+    def resolve(self, ref: str, kind: str = "commit") -> str | None:
+        """Branch / sha commit / sha tree → sha objek bertipe kind."""
+        for candidate in (f"refs/heads/{ref}", ref):
+            sha = self._git("rev-parse", "--verify", "-q", f"{candidate}^{{{kind}}}",
+                            check=False)
+            if sha:
+                return sha
+        return None
+
+    def ls_tree(self, treeish: str, recursive: bool = False) -> list:
+        """[(mode, type, sha, path)] isi tree (rekursif: termasuk subtree)."""
+        args = ["ls-tree", "-z"] + (["-r", "-t"] if recursive else []) + [treeish]
+        out  = self._git(*args, check=False)
+        entries = []
+        for line in filter(None, out.split("\0")):
+            meta, path = line.split("\t", 1)
+            mode, typ, sha = meta.split()
+            entries.append((mode, typ, sha, path))
+        return entries
+
+    def entry(self, commit: str, path: str):
+        """(mode, type, sha) untuk path di commit, atau None."""
+        if not path:
+            return ("040000", "tree", self.resolve(commit, "tree"))
+        out = self._git("ls-tree", "-z", commit, "--", path, check=False)
+        for line in filter(None, out.split("\0")):
+            meta, p = line.split("\t", 1)
+            if p == path:
+                mode, typ, sha = meta.split()
+                return mode, typ, sha
+        return None
+
+    def cat_blob(self, sha: str) -> bytes:
+        r = subprocess.run(["git", "--git-dir", self.path, "cat-file", "blob", sha],
+                           capture_output=True, check=True)
+        return r.stdout
+
+    def hash_blob(self, data: bytes) -> str:
+        return self._git("hash-object", "-w", "--stdin", data=data)
+
+    def build_tree(self, base_tree: str | None, changes: dict) -> str:
+        """
+        Tree baru = base_tree + changes. changes: {path: (mode, sha) | None};
+        None = hapus path.
+        """
+        fd, index = tempfile.mkstemp(prefix="gh-emu-index-")
+        os.close(fd)
+        os.remove(index)
+        env = {"GIT_INDEX_FILE": index}
+        try:
+            if base_tree:
+                self._git("read-tree", base_tree, env=env)
+            else:
+                self._git("read-tree", "--empty", env=env)
+            lines = []
+            for path, change in changes.items():
+                if change is None:
+                    lines.append(f"0 {ZERO_SHA}\t{path}")
+                else:
+                    lines.append(f"{change[0]} {change[1]}\t{path}")
+            if lines:
+                self._git("update-index", "-z", "--index-info",
+                          data="\0".join(lines).encode() + b"\0", env=env)
+            return self._git("write-tree", env=env)
+        finally:
+            if os.path.exists(index):
+                os.remove(index)
+
+    def commit_tree(self, tree: str, parents: list, message: str) -> str:
+        args = ["commit-tree", tree]
+        for p in parents:
+            args += ["-p", p]
+        return self._git(*args, data=(message or "").encode("utf-8"))
+
+    def update_ref(self, branch: str, new: str, old: str | None) -> bool:
+        """Compare-and-swap ref; old None = branch harus belum ada."""
+        self._git("update-ref", f"refs/heads/{branch}", new, old or ZERO_SHA,
+                  check=False)
+        return self.head(branch) == new
+
+    def archive(self, commit: str, prefix: str) -> bytes:
+        """tar.gz isi commit dengan prefix folder, seperti tarball GitHub."""
+        r = subprocess.run(["git", "--git-dir", self.path, "archive", "--format=tar",
+                            f"--prefix={prefix}/", commit], capture_output=True, check=True)
+        return gzip.compress(r.stdout)
+
+    def is_ancestor(self, old: str, new: str) -> bool:
+        r = subprocess.run(["git", "--git-dir", self.path, "merge-base",
+                            "--is-ancestor", old, new], capture_output=True)
+        return r.returncode == 0
+
+    def commit_changes(self, branch: str, changes: dict, message: str) -> str:
+        """Satu commit di atas head branch (dibuat jika belum ada). Return sha commit."""
+        old  = self.head(branch)
+        base = self.resolve(old, "tree") if old else None
+        tree = self.build_tree(base, changes)
+        sha  = self.commit_tree(tree, [old] if old else [], message)
+        if not self.update_ref(branch, sha, old):
+            raise ApiError(409, f"Reference refs/heads/{branch} moved, retry")
+        return sha
+
+    def seed(self, branch: str, directory: str) -> str:
+        """Import isi direktori sebagai satu commit di branch."""
+        changes = {}
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                rel  = os.path.relpath(full, directory).replace(os.sep, "/")
+                with open(full, "rb") as f:
+                    changes[rel] = ("100644", self.hash_blob(f.read()))
+        with self.lock:
+            return self.commit_changes(branch, changes, f"seed from {directory}")
+
+
+# ─────────────────────────────────────────────
+# EMULATOR STATE
+# ─────────────────────────────────────────────
+
+class Emulator:
+    def __init__(self, root: str, latency_ms: int = 0, rate_limit: int = 0,
+                 rate_window: int = 3600, conflict_rate: float = 0.0, seed: int = 0):
+        self.root          = root
+        self.latency       = latency_ms / 1000.0
+        self.rate_limit    = rate_limit
+        self.rate_window   = rate_window
+        self.conflict_rate = conflict_rate
+        self.random        = random.Random(seed)
+        self.stats         = {}
+        self.scraped       = []   # URL dari /__emulator/scrape (warm_queue.py)
+        self._repos        = {}
+        self._lock         = threading.Lock()
+        self._window_start = time.time()
+        self._window_used  = 0
+
+    def repo(self, owner: str, name: str) -> GitRepo:
+        key = f"{owner}/{name}"
+        with self._lock:
+            if key not in self._repos:
+                self._repos[key] = GitRepo(os.path.join(self.root, owner, f"{name}.git"))
+            return self._repos[key]
+
+    def count(self, endpoint: str) -> None:
+        with self._lock:
+            self.stats[endpoint] = self.stats.get(endpoint, 0) + 1
+
+    def take_quota(self) -> tuple:
+        """Return (allowed, remaining, reset_epoch)."""
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.rate_window:
+                self._window_start, self._window_used = now, 0
+            reset = int(self._window_start + self.rate_window)
+            if not self.rate_limit:
+                return True, 5000, reset
+            if self._window_used >= self.rate_limit:
+                return False, 0, reset
+            self._window_used += 1
+            return True, self.rate_limit - self._window_used, reset
+
+    def conflict(self) -> bool:
+        with self._lock:
+            return self.conflict_rate > 0 and self.random.random() < self.conflict_rate
+
+
+# ─────────────────────────────────────────────
+# HTTP HANDLER
+# ─────────────────────────────────────────────
+
+_REPO_RE = re.compile(r"^/repos/([^/]+)/([^/]+)(?:/(.*))?$")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, sama seperti api.github.com
+    emulator: Emulator = None
+
+    def log_message(self, fmt, *args):
+        if os.environ.get("GH_EMULATOR_LOG") == "1":
+            super().log_message(fmt, *args)
+
+    # ── Response helpers ──────────────────────────────────────────────────────
+
+    def _send(self, status: int, payload=None, headers: dict | None = None) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        for k, v in self._rate_headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_raw(self, status: int, data: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in self._rate_headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw    = self.rfile.read(length) if length else b""
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise ApiError(400, "Problems parsing JSON")
+
+    # ── Dispatch ──────────────────────────────────────────────────────────────
+
+    def do_GET(self):    self._dispatch("GET")
+    def do_PUT(self):    self._dispatch("PUT")
+    def do_POST(self):   self._dispatch("POST")
+    def do_PATCH(self):  self._dispatch("PATCH")
+    def do_DELETE(self): self._dispatch("DELETE")
+
+    def _dispatch(self, method: str) -> None:
+        emu   = self.emulator
+        parts = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        path  = urllib.parse.unquote(parts.path)
+        self._rate_headers = {}
+
+        if emu.latency:
+            time.sleep(emu.latency)
+
+        if path == "/__emulator/stats":
+            self._send(200, emu.stats)
+            return
+        if path == "/__emulator/scrape":
+            # WARM_FACEBOOK_ENDPOINT=http://127.0.0.1:8765/__emulator/scrape
+            if method == "POST":
+                emu.count("POST scrape")
+                with emu._lock:
+                    emu.scraped.append(query.get("id", ""))
+                self._send(200, {"id": query.get("id", ""), "scraped": True})
+            else:
+                self._send(200, {"scraped": emu.scraped})
+            return
+
+        allowed, remaining, reset = emu.take_quota()
+        self._rate_headers = {
+            "X-RateLimit-Limit":     str(emu.rate_limit or 5000),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset":     str(reset),
+            "X-RateLimit-Resource":  "core",
+        }
+        try:
+            body = self._body() if method in ("PUT", "POST", "PATCH", "DELETE") else {}
+            if not allowed:
+                emu.count("403 rate limit")
+                raise ApiError(403, "API rate limit exceeded (gh_emulator)")
+            if path == "/rate_limit":
+                emu.count("GET rate_limit")
+                self._send(200, {"resources": {"core": {
+                    "limit": emu.rate_limit or 5000, "remaining": remaining, "reset": reset
+                }}})
+                return
+
+            m = _REPO_RE.match(path)
+            if not m:
+                raise ApiError(404, "Not Found")
+            repo = emu.repo(m.group(1), m.group(2))
+            rest = m.group(3) or ""
+            self._route(emu, repo, method, rest, query, body)
+        except ApiError as e:
+            self._send(e.status, {"message": e.message,
+                                  "documentation_url": "https://docs.github.com/rest"})
+        except Exception as e:
+            self._send(500, {"message": f"gh_emulator error: {e}"})
+
+    def _route(self, emu: Emulator, repo: GitRepo, method: str, rest: str,
+               query: dict, body: dict) -> None:
+        if rest == "contents" or rest.startswith("contents/"):
+            path = rest[len("contents"):].strip("/")
+            emu.count(f"{method} contents")
+            handler = {"GET": self._contents_get, "PUT": self._contents_put,
+                       "DELETE": self._contents_delete}.get(method)
+            if handler is None:
+                raise ApiError(405, "Method Not Allowed")
+            handler(emu, repo, path, query, body)
+            return
+
+        m = re.match(r"^git/trees/(.+)$", rest)
+        if m and method == "GET":
+            emu.count("GET git/trees")
+            self._tree_get(repo, m.group(1), query.get("recursive") not in (None, "", "0"))
+            return
+        m = re.match(r"^tarball(?:/(.+))?$", rest)
+        if m and method == "GET":
+            emu.count("GET tarball")
+            self._tarball_get(repo, m.group(1) or DEFAULT_BRANCH)
+            return
+        m = re.match(r"^branches/(.+)$", rest)
+        if m and method == "GET":
+            emu.count("GET branches")
+            self._branch_get(repo, m.group(1))
+            return
+        m = re.match(r"^git/refs/heads/(.+)$", rest)
+        if m and method in ("GET", "PATCH"):
+            emu.count(f"{method} git/refs")
+            if method == "GET":
+                self._ref_get(repo, m.group(1))
+            else:
+                self._ref_patch(emu, repo, m.group(1), body)
+            return
+
+        if method == "POST" and rest in ("git/refs", "git/blobs", "git/trees", "git/commits"):
+            emu.count(f"POST {rest}")
+            {"git/refs":    self._ref_create,
+             "git/blobs":   self._blob_create,
+             "git/trees":   self._tree_create,
+             "git/commits": self._commit_create}[rest](repo, body)
+            return
+
+        raise ApiError(404, "Not Found")
+
+    # ── Contents API ──────────────────────────────────────────────────────────
+
+    def _contents_get(self, emu, repo, path, query, body):
+        commit = repo.resolve(query.get("ref") or DEFAULT_BRANCH)
+        entry  = repo.entry(commit, path) if commit else None
+        if entry is None:
+            raise ApiError(404, "Not Found")
+        mode, typ, sha = entry
+        etag = f'"{sha}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+
+        if typ == "blob":
+            data = repo.cat_blob(sha)
+            self._send(200, {
+                "type":     "file",
+                "encoding": "base64",
+                "size":     len(data),
+                "name":     path.rsplit("/", 1)[-1],
+                "path":     path,
+                "sha":      sha,
+                "content":  base64.b64encode(data).decode("ascii"),
+            }, headers={"ETag": etag})
+            return
+
+        items = []
+        for e_mode, e_type, e_sha, name in repo.ls_tree(sha):
+            items.append({
+                "type": "file" if e_type == "blob" else "dir",
+                "name": name,
+                "path": f"{path}/{name}" if path else name,
+                "sha":  e_sha,
+            })
+        self._send(200, items, headers={"ETag": etag})
+
+    def _check_conflict(self, emu: Emulator, status: int, message: str) -> None:
+        if emu.conflict():
+            emu.count(f"{status} injected conflict")
+            raise ApiError(status, message)
+
+    def _contents_put(self, emu, repo, path, query, body):
+        if not path or "content" not in body:
+            raise ApiError(422, "Invalid request.\n\n\"content\" wasn't supplied.")
+        branch = body.get("branch") or DEFAULT_BRANCH
+        self._check_conflict(emu, 409, f"{path} does not match {body.get('sha')}")
+        try:
+            data = base64.b64decode(body["content"], validate=True)
+        except ValueError:
+            raise ApiError(422, "content is not valid Base64")
+
+        blob = repo.hash_blob(data)
+        with repo.lock:
+            head     = repo.head(branch)
+            existing = repo.entry(head, path) if head else None
+            if existing and existing[1] == "blob":
+                if not body.get("sha"):
+                    raise ApiError(422, "Invalid request.\n\n\"sha\" wasn't supplied.")
+                if body["sha"] != existing[2]:
+                    raise ApiError(409, f"{path} does not match {body['sha']}")
+            commit = repo.commit_changes(branch, {path: ("100644", blob)},
+                                         body.get("message", ""))
+        self._send(200 if existing else 201, {
+            "content": {"type": "file", "name": path.rsplit("/", 1)[-1],
+                        "path": path, "sha": blob, "size": len(data)},
+            "commit":  {"sha": commit, "message": body.get("message", "")},
+        })
+
+    def _contents_delete(self, emu, repo, path, query, body):
+        branch = body.get("branch") or DEFAULT_BRANCH
+        if not body.get("sha"):
+            raise ApiError(422, "Invalid request.\n\n\"sha\" wasn't supplied.")
+        self._check_conflict(emu, 409, f"{path} does not match {body['sha']}")
+        with repo.lock:
+            head     = repo.head(branch)
+            existing = repo.entry(head, path) if head else None
+            if not existing or existing[1] != "blob":
+                raise ApiError(404, "Not Found")
+            if body["sha"] != existing[2]:
+                raise ApiError(409, f"{path} does not match {body['sha']}")
+            commit = repo.commit_changes(branch, {path: None}, body.get("message", ""))
+        self._send(200, {"content": None,
+                         "commit":  {"sha": commit, "message": body.get("message", "")}})
+
+    # ── Git Data API ──────────────────────────────────────────────────────────
+
+    def _tree_get(self, repo, ref, recursive):
+        tree = repo.resolve(ref, "tree")
+        if not tree:
+            raise ApiError(404, "Not Found")
+        items = [
+            {"path": p, "mode": mode, "type": typ, "sha": sha}
+            for mode, typ, sha, p in repo.ls_tree(tree, recursive=recursive)
+        ]
+        self._send(200, {"sha": tree, "tree": items, "truncated": False})
+
+    def _tarball_get(self, repo, ref):
+        commit = repo.resolve(ref)
+        if not commit:
+            raise ApiError(404, "Not Found")
+        owner, name = repo.path.rstrip("/").split(os.sep)[-2:]
+        prefix = f"{owner}-{name[:-len('.git')]}-{commit[:7]}"
+        self._send_raw(200, repo.archive(commit, prefix), "application/x-gzip")
+
+    def _branch_get(self, repo, branch):
+        head = repo.head(branch)
+        if not head:
+            raise ApiError(404, "Branch not found")
+        self._send(200, {"name": branch, "commit": {
+            "sha":    head,
+            "commit": {"tree": {"sha": repo.resolve(head, "tree")}},
+        }})
+
+    def _ref_get(self, repo, branch):
+        head = repo.head(branch)
+        if not head:
+            raise ApiError(404, "Not Found")
+        self._send(200, {"ref": f"refs/heads/{branch}",
+                         "object": {"sha": head, "type": "commit"}})
+
+    def _ref_create(self, repo, body):
+        ref = body.get("ref", "")
+        sha = body.get("sha", "")
+        if not ref.startswith("refs/heads/") or not repo.resolve(sha):
+            raise ApiError(422, "Reference or sha invalid")
+        with repo.lock:
+            if not repo.update_ref(ref[len("refs/heads/"):], sha, None):
+                raise ApiError(422, "Reference already exists")
+        self._send(201, {"ref": ref, "object": {"sha": sha, "type": "commit"}})
+
+    def _ref_patch(self, emu, repo, branch, body):
+        new = body.get("sha", "")
+        if not repo.resolve(new):
+            raise ApiError(422, "Object does not exist")
+        self._check_conflict(emu, 422, "Update is not a fast forward")
+        with repo.lock:
+            old = repo.head(branch)
+            if not old:
+                raise ApiError(422, "Reference does not exist")
+            if not body.get("force") and not repo.is_ancestor(old, new):
+                raise ApiError(422, "Update is not a fast forward")
+            if not repo.update_ref(branch, new, old):
+                raise ApiError(422, "Update is not a fast forward")
+        self._send(200, {"ref": f"refs/heads/{branch}",
+                         "object": {"sha": new, "type": "commit"}})
+
+    def _blob_create(self, repo, body):
+        content = body.get("content", "")
+        if body.get("encoding") == "base64":
+            data = base64.b64decode(content)
+        else:
+            data = content.encode("utf-8")
+        self._send(201, {"sha": repo.hash_blob(data)})
+
+    def _tree_create(self, repo, body):
+        base = body.get("base_tree")
+        if base and not repo.resolve(base, "tree"):
+            raise ApiError(422, "base_tree is not a valid tree")
+        changes = {}
+        for item in body.get("tree", []):
+            if "content" in item:
+                sha = repo.hash_blob(item["content"].encode("utf-8"))
+            else:
+                sha = item.get("sha")
+            changes[item["path"]] = (item.get("mode", "100644"), sha) if sha else None
+        self._send(201, {"sha": repo.build_tree(base, changes), "truncated": False})
+
+    def _commit_create(self, repo, body):
+        tree = body.get("tree", "")
+        if not repo.resolve(tree, "tree"):
+            raise ApiError(422, "Tree SHA does not exist")
+        parents = body.get("parents", [])
+        sha = repo.commit_tree(tree, parents, body.get("message", ""))
+        self._send(201, {"sha": sha, "tree": {"sha": tree},
+                         "message": body.get("message", ""),
+                         "parents": [{"sha": p} for p in parents]})
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+
+def make_server(emulator: Emulator, host: str = "127.0.0.1",
+                port: int = 0) -> ThreadingHTTPServer:
+    """Server siap pakai (port 0 = pilih port bebas, lihat server.server_port)."""
+    handler = type("EmulatorHandler", (Handler,), {"emulator": emulator})
+    server  = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulator lokal GitHub REST API")
+    parser.add_argument("--root", default=os.path.join(tempfile.gettempdir(), "gh-emulator"),
+                        help="direktori penyimpanan bare repo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="request per jendela sebelum 403 (0 = tanpa batas)")
+    parser.add_argument("--rate-window", type=int, default=3600)
+    parser.add_argument("--conflict-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0, help="seed random untuk injeksi")
+    parser.add_argument("--seed-repo", action="append", default=[],
+                        metavar="OWNER/REPO[@BRANCH]=DIR")
+    args = parser.parse_args()
+
+    emu = Emulator(args.root, args.latency_ms, args.rate_limit, args.rate_window,
+                   args.conflict_rate, args.seed)
+    for spec in args.seed_repo:
+        target, _, directory = spec.partition("=")
+        full, _, branch = target.partition("@")
+        owner, _, name = full.partition("/")
+        if not (owner and name and directory):
+            print(f"FATAL: --seed-repo tidak valid: {spec}")
+            sys.exit(1)
+        sha = emu.repo(owner, name).seed(branch or DEFAULT_BRANCH, directory)
+        print(f"Seeded {full}@{branch or DEFAULT_BRANCH} from {directory} → {sha[:7]}")
+
+    server = make_server(emu, args.host, args.port)
+    print(f"gh_emulator listening on http://{args.host}:{server.server_port} "
+          f"(root={args.root})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(emu.stats, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+github_contents.py
+Helper Contents API (GET / PUT) yang dipakai bersama semua script.
+
+Setiap GET dan PUT mencatat sha ke blob_registry. put_file memakai sha dari
+registry jika sudah diketahui, sehingga overwrite cukup 1 call (PUT) bukan
+2 call (GET sha + PUT). Jika sha dari registry ternyata basi (409/422),
+sha diambil ulang via GET lalu PUT diulang sekali.
+
+Jika sha blob isi baru sama dengan sha remote, PUT dilewati sama sekali
+(tidak ada commit kosong di history branch).
+
+put_if adalah PUT bersyarat tanpa ambil-ulang sha, untuk update
+read → mutate → write yang harus tahu jika file berubah sejak dibaca
+(lihat transact.py).
+"""
+import os
+import base64
+import urllib.error
+
+import http_client
+import rate_limit
+import blob_registry
+
+# Override ke emulator lokal (gh_emulator.py) untuk benchmark offline
+API_BASE = os.environ.get("GITHUB_API_BASE", "https://api.github.com").rstrip("/")
+
+
+def contents_url(repo: str, path: str) -> str:
+    return f"{API_BASE}/repos/{repo}/contents/{path}"
+
+
+def get_contents(repo: str, path: str, headers: dict, ref: str = "",
+                 timeout: float | None = None) -> dict:
+    """
+    GET satu file via Contents API dan catat sha-nya.
+    404 dicatat sebagai "tidak ada" lalu di-raise seperti biasa.
+    """
+    url = contents_url(repo, path) + (f"?ref={ref}" if ref else "")
+    try:
+        data = rate_limit.get_json(url, headers=headers, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            blob_registry.remember(repo, ref, path, None)
+        raise
+    if isinstance(data, dict) and data.get("sha"):
+        blob_registry.remember(repo, ref, path, data["sha"])
+    return data
+
+
+def read_text(repo: str, path: str, headers: dict, ref: str = "",
+              timeout: float | None = None) -> str:
+    """GET file lalu decode isinya sebagai teks UTF-8."""
+    data = get_contents(repo, path, headers, ref=ref, timeout=timeout)
+    return base64.b64decode(data["content"]).decode("utf-8")
+
+
+def current_sha(repo: str, path: str, headers: dict, ref: str = "",
+                timeout: float | None = None) -> str | None:
+    """sha file saat ini: dari registry jika ada, kalau tidak via GET."""
+    if blob_registry.known(repo, ref, path):
+        return blob_registry.lookup(repo, ref, path)
+    try:
+        return get_contents(repo, path, headers, ref=ref, timeout=timeout).get("sha")
+    except Exception:
+        return None
+
+
+def put_file(repo: str, path: str, content: bytes, message: str,
+             headers: dict, branch: str = "",
+             timeout: float | None = None) -> http_client.Response | None:
+    """
+    Buat atau timpa file via Contents API PUT.
+    Return None jika isi tidak berubah (PUT dilewati).
+    Raise urllib.error.HTTPError jika tetap gagal.
+    """
+    from_registry = blob_registry.known(repo, branch, path)
+    sha = current_sha(repo, path, headers, ref=branch, timeout=timeout)
+    if sha and sha == blob_registry.git_blob_sha(content):
+        print(f"Unchanged, skip write: {path}")
+        return None
+
+    payload = {
+        "message": message,
+        "content": base64.b64encode(content).decode("utf-8"),
+    }
+    if branch:
+        payload["branch"] = branch
+
+    for attempt in (1, 2):
+        if sha:
+            payload["sha"] = sha
+        else:
+            payload.pop("sha", None)
+        try:
+            r = rate_limit.send_json("PUT", contents_url(repo, path), payload,
+                                     headers=headers, timeout=timeout)
+        except urllib.error.HTTPError as e:
+            # sha dari registry basi → ambil sha terbaru lalu ulangi sekali
+            if e.code in (409, 422) and from_registry and attempt == 1:
+                blob_registry.forget(repo, branch, path)
+                sha = current_sha(repo, path, headers, ref=branch, timeout=timeout)
+                continue
+            raise
+        new_sha = (r.json().get("content") or {}).get("sha")
+        if new_sha:
+            blob_registry.remember(repo, branch, path, new_sha)
+        else:
+            blob_registry.forget(repo, branch, path)
+        return r
+
+
+def put_if(repo: str, path: str, content: bytes, message: str, sha: str | None,
+           headers: dict, branch: str = "",
+           timeout: float | None = None) -> http_client.Response | None:
+    """
+    PUT bersyarat (compare-and-swap): berhasil hanya jika sha remote masih
+    `sha` (None = file belum boleh ada). Tidak ada GET / retry otomatis —
+    409/422 di-raise supaya caller bisa membaca ulang dan mengulang mutasinya.
+    Return None jika isi tidak berubah (PUT dilewati).
+    """
+    if sha and sha == blob_registry.git_blob_sha(content):
+        print(f"Unchanged, skip write: {path}")
+        return None
+    payload = {
+        "message": message,
+        "content": base64.b64encode(content).decode("utf-8"),
+    }
+    if sha:
+        payload["sha"] = sha
+    if branch:
+        payload["branch"] = branch
+    try:
+        r = rate_limit.send_json("PUT", contents_url(repo, path), payload,
+                                 headers=headers, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code in (409, 422):
+            blob_registry.forget(repo, branch, path)
+        raise
+    new_sha = (r.json().get("content") or {}).get("sha")
+    if new_sha:
+        blob_registry.remember(repo, branch, path, new_sha)
+    else:
+        blob_registry.forget(repo, branch, path)
+    return r
@@ -0,0 +1,198 @@
+"""
+html_meta.py
+Ekstraksi metadata HTML dalam SATU kali jalan (html.parser), dipakai bersama
+oleh postprocess, run_pipeline, social_gen dan cross_post.
+
+    meta = html_meta.extract(body_html)
+    meta.h1, meta.cluster, meta.description, meta.faq, meta.word_count ...
+
+Hasil di-cache per hash isi (sha1), jadi body staging yang sama yang dibaca
+wrap_article_html lalu run_pipeline hanya di-parse sekali.
+Semua teks sudah di-decode dari entity HTML dan whitespace-nya dirapikan;
+gunakan escape_attr() sebelum menaruhnya kembali ke atribut / markup.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import NamedTuple
+
+CACHE_SIZE = 256
+
+_SKIP_TEXT = ("script", "style", "template")
+_HEADINGS  = ("h1", "h2", "h3", "h4", "h5", "h6")
+# Batas blok → spasi di teks yang ditangkap (inline seperti <b>, <em> tidak)
+_BLOCKS    = frozenset(("p", "div", "br", "li", "ul", "ol", "tr", "td", "th",
+                        "table", "section", "blockquote", "pre") + _HEADINGS)
+
+
+class HtmlMeta(NamedTuple):
+    title:       str                    # isi <title>
+    h1:          str                    # teks <h1> pertama
+    h1_span:     tuple | None           # (start, end) offset <h1>…</h1> di sumber
+    description: str                    # <meta name="description">
+    cluster:     str                    # <meta name="cluster">
+    faq:         tuple                  # ((pertanyaan, jawaban), ...)
+    has_canvas:  bool
+    word_count:  int                    # kata di luar script/style
+    headings:    tuple                  # ((level, teks), ...)
+    links:       tuple                  # href semua <a>
+    text:        str                    # teks polos, tanpa script/style
+
+
+def _clean(text: str) -> str:
+    return " ".join(text.split())
+
+
+class _Extractor(HTMLParser):
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=True)
+        self.source      = source
+        self._line_start = [0]
+        i = source.find("\n")
+        while i != -1:
+            self._line_start.append(i + 1)
+            i = source.find("\n", i + 1)
+
+        self.title       = None
+        self.description = None
+        self.cluster     = None
+        self.h1_span     = None
+        self.has_canvas  = False
+        self.headings    = []
+        self.links       = []
+        self.faq         = []
+        self.chunks      = []
+
+        self._skip       = 0      # di dalam script/style
+        self._capture    = []     # stack [(tag, [teks], start_offset)]
+        self._question   = None   # <summary> terakhir yang belum dapat jawaban
+        self._answer     = None   # [depth div, [teks]] saat di dalam .faq-answer
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self._line_start[line - 1] + col
+
+    # ── Tag ──────────────────────────────────────────────────────────────────
+
+    def _block_break(self) -> None:
+        for _, parts, _ in self._capture:
+            parts.append(" ")
+        if self._answer is not None:
+            self._answer[1].append(" ")
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in _BLOCKS:
+            self._block_break()
+        if tag in _SKIP_TEXT:
+            self._skip += 1
+        elif tag == "meta":
+            name    = (attrs.get("name") or "").lower()
+            content = (attrs.get("content") or "").strip()
+            if name == "description" and self.description is None:
+                self.description = content
+            elif name == "cluster" and self.cluster is None:
+                self.cluster = content
+        elif tag == "canvas":
+            self.has_canvas = True
+        elif tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        elif tag in _HEADINGS or tag in ("title", "summary"):
+            self._capture.append((tag, [], self._offset()))
+
+        if tag == "div":
+            if self._answer is not None:
+                self._answer[0] += 1
+            elif (self._question is not None
+                  and "faq-answer" in (attrs.get("class") or "").split()):
+                self._answer = [1, []]
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TEXT:
+            self._skip = max(self._skip - 1, 0)
+            return
+        if tag in _BLOCKS:
+            self._block_break()
+
+        if tag == "div" and self._answer is not None:
+            self._answer[0] -= 1
+            if self._answer[0] == 0:
+                answer = _clean("".join(self._answer[1]))
+                if self._question and answer:
+                    self.faq.append((self._question, answer))
+                self._question, self._answer = None, None
+
+        if not self._capture or self._capture[-1][0] != tag:
+            return
+        _, parts, start = self._capture.pop()
+        text = _clean("".join(parts))
+        if tag == "title":
+            if self.title is None:
+                self.title = text
+        elif tag == "summary":
+            self._question = text
+        else:
+            self.headings.append((int(tag[1]), text))
+            if tag == "h1" and self.h1_span is None:
+                end_tag = self.source.find(">", self._offset())
+                self.h1_span = (start, end_tag + 1 if end_tag != -1 else len(self.source))
+
+    # ── Teks ─────────────────────────────────────────────────────────────────
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self.chunks.append(data)
+        for _, parts, _ in self._capture:
+            parts.append(data)
+        if self._answer is not None:
+            self._answer[1].append(data)
+
+    def record(self) -> HtmlMeta:
+        text = _clean(" ".join(self.chunks))
+        h1   = next((t for level, t in self.headings if level == 1), "")
+        return HtmlMeta(
+            title       = self.title or "",
+            h1          = h1,
+            h1_span     = self.h1_span,
+            description = self.description or "",
+            cluster     = self.cluster or "",
+            faq         = tuple(self.faq),
+            has_canvas  = self.has_canvas,
+            word_count  = len(text.split()),
+            headings    = tuple(self.headings),
+            links       = tuple(self.links),
+            text        = text,
+        )
+
+
+_cache = OrderedDict()   # sha1 isi → HtmlMeta (LRU)
+_lock  = threading.Lock()
+
+
+def extract(html: str) -> HtmlMeta:
+    """Metadata dokumen HTML; hasil di-cache per hash isi."""
+    key = hashlib.sha1(html.encode("utf-8")).hexdigest()
+    with _lock:
+        meta = _cache.get(key)
+        if meta is not None:
+            _cache.move_to_end(key)
+            return meta
+
+    parser = _Extractor(html)
+    parser.feed(html)
+    parser.close()
+    meta = parser.record()
+
+    with _lock:
+        _cache[key] = meta
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return meta
+
+
+def escape_attr(text: str) -> str:
+    """Escape teks untuk atribut HTML ber-kutip ganda (apostrof dibiarkan)."""
+    return (text.replace("&", "&amp;").replace("<", "&lt;")
+                .replace(">", "&gt;").replace('"', "&quot;"))
@@ -0,0 +1,224 @@
+"""
+http_client.py
+Klien HTTP bersama untuk semua call GitHub, Worker, LLM dan platform sosial.
+
+Dibangun di atas http.client dengan pool koneksi keep-alive per host, jadi
+satu run tidak membayar TCP + TLS handshake berulang kali ke host yang sama.
+Setiap host dibatasi HTTP_MAX_PER_HOST request paralel.
+
+Error HTTP (status >= 400) di-raise sebagai urllib.error.HTTPError supaya
+kode lama yang menangkap `urllib.error.HTTPError` (e.code, e.read()) tetap
+berjalan tanpa perubahan. 3xx non-redirect (mis. 304) dikembalikan apa adanya.
+
+HTTP_OFFLINE=1 (replay.py) menolak semua request dengan OfflineError sebelum
+ada koneksi dibuka, jadi run replay tidak pernah menyentuh layanan luar.
+"""
+import io
+import os
+import json
+import threading
+import http.client
+import urllib.parse
+import urllib.error
+
+import tracing
+
+DEFAULT_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 60))
+MAX_PER_HOST    = int(os.environ.get("HTTP_MAX_PER_HOST", 4))
+OFFLINE         = os.environ.get("HTTP_OFFLINE", "0") == "1"
+MAX_REDIRECTS   = 5
+USER_AGENT      = "ai-engine"
+
+HTTPError = urllib.error.HTTPError
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+# Error yang muncul jika server sudah menutup koneksi keep-alive yang idle
+_STALE_ERRORS   = (http.client.RemoteDisconnected, BrokenPipeError,
+                   ConnectionResetError, http.client.CannotSendRequest)
+_IDEMPOTENT     = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+
+class OfflineError(ConnectionError):
+    """Request ditolak karena HTTP_OFFLINE=1."""
+
+
+class Response:
+    """Response yang body-nya sudah dibaca penuh."""
+
+    def __init__(self, status: int, reason: str, headers, body: bytes, url: str):
+        self.status  = status
+        self.reason  = reason
+        self.headers = headers
+        self.body    = body
+        self.url     = url
+
+    def text(self) -> str:
+        return self.body.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.body) if self.body else {}
+
+
+class _HostPool:
+    """Koneksi idle untuk satu (scheme, host, port) + batas concurrency."""
+
+    def __init__(self, scheme: str, host: str, port: int | None, limit: int):
+        self.scheme = scheme
+        self.host   = host
+        self.port   = port
+        self._idle  = []
+        self._lock  = threading.Lock()
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def _new_conn(self, timeout: float):
+        cls = (http.client.HTTPSConnection if self.scheme == "https"
+               else http.client.HTTPConnection)
+        return cls(self.host, self.port, timeout=timeout)
+
+    def acquire(self, timeout: float):
+        """Return (conn, reused)."""
+        self._slots.acquire()
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            return self._new_conn(timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def release(self, conn, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools      = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_for(parts: urllib.parse.SplitResult) -> _HostPool:
+    key = (parts.scheme, parts.hostname, parts.port)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _HostPool(parts.scheme, parts.hostname, parts.port, MAX_PER_HOST)
+            _pools[key] = pool
+        return pool
+
+
+def close_all() -> None:
+    """Tutup semua koneksi idle (opsional, dipanggil di akhir script)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+def _send_once(pool: _HostPool, method: str, target: str, body, headers: dict,
+               timeout: float):
+    """
+    Kirim satu request di koneksi dari pool. Return (status, reason, headers, body).
+    Koneksi keep-alive lama yang sudah ditutup server → diulang sekali dengan
+    koneksi baru, tapi hanya jika request belum terkirim atau method-nya
+    idempoten: POST / PATCH yang mungkin sudah sampai ke server tidak dikirim dua kali.
+    """
+    for attempt in (1, 2):
+        conn, reused = pool.acquire(timeout)
+        sent = False
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            data = resp.read()
+        except _STALE_ERRORS:
+            pool.release(conn, False)
+            if reused and attempt == 1 and (not sent or method in _IDEMPOTENT):
+                continue
+            raise
+        except BaseException:
+            pool.release(conn, False)
+            raise
+        pool.release(conn, not resp.will_close)
+        return resp.status, resp.reason, resp.headers, data
+    raise http.client.HTTPException("unreachable")
+
+
+def request(method: str, url: str, headers: dict | None = None,
+            body: bytes | str | None = None,
+            timeout: float | None = None) -> Response:
+    """
+    Kirim request HTTP lewat pool koneksi.
+    Redirect diikuti (maks MAX_REDIRECTS). Status >= 400 → raise HTTPError.
+    """
+    if OFFLINE:
+        raise OfflineError(f"HTTP_OFFLINE=1: {method} {url} tidak dikirim")
+    timeout = timeout or DEFAULT_TIMEOUT
+    hdrs    = {"User-Agent": USER_AGENT}
+    hdrs.update(headers or {})
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+
+    for _ in range(MAX_REDIRECTS + 1):
+        parts  = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        status, reason, resp_headers, data = _send_once(
+            _pool_for(parts), method, target, body, hdrs, timeout
+        )
+        tracing.record_http(len(body or b""), len(data))
+
+        location = resp_headers.get("Location")
+        if status in _REDIRECT_CODES and location:
+            url = urllib.parse.urljoin(url, location)
+            if status == 303 or (status in (301, 302) and method == "POST"):
+                method, body = "GET", None
+                hdrs.pop("Content-Type", None)
+            # Jangan bawa token GitHub ke host lain (mis. codeload / S3)
+            if urllib.parse.urlsplit(url).hostname != parts.hostname:
+                hdrs.pop("Authorization", None)
+            continue
+
+        if status >= 400:
+            raise HTTPError(url, status, reason, resp_headers, io.BytesIO(data))
+        return Response(status, reason, resp_headers, data, url)
+
+    raise HTTPError(url, status, "Too many redirects", resp_headers, io.BytesIO(data))
+
+
+# ── JSON helpers ─────────────────────────────────────────────────────────────
+
+def get_json(url: str, headers: dict | None = None,
+             timeout: float | None = None):
+    """GET lalu parse JSON."""
+    return request("GET", url, headers=headers, timeout=timeout).json()
+
+
+def send_json(method: str, url: str, payload, headers: dict | None = None,
+              timeout: float | None = None) -> Response:
+    """Kirim payload sebagai JSON body (POST/PUT/PATCH/DELETE)."""
+    hdrs = {"Content-Type": "application/json"}
+    hdrs.update(headers or {})
+    return request(method, url, headers=hdrs,
+                   body=json.dumps(payload).encode("utf-8"), timeout=timeout)
+
+
+def post_form(url: str, data: dict, headers: dict | None = None,
+              timeout: float | None = None) -> Response:
+    """POST application/x-www-form-urlencoded."""
+    hdrs = {"Content-Type": "application/x-www-form-urlencoded"}
+    hdrs.update(headers or {})
+    return request("POST", url, headers=hdrs,
+                   body=urllib.parse.urlencode(data).encode("utf-8"),
+                   timeout=timeout)
@@ -1,33 +1,36 @@
 """
 loader.py
-Ambil file dari repo ai-brain via GitHub API.
+Ambil file dari repo ai-brain.
+Default via GitHub API; STORAGE_BACKEND=local/git membaca dari disk (lihat storage.py).
+LOADER_SNAPSHOT=1 (atau daftar prefix, mis. "staging") → satu tarball per run,
+fetch_file / list_folder / fetch_json dilayani dari memori.
 """
 import os
 import json
-import base64
-import urllib.request
 import urllib.error
 
+import storage
+import transact
+
 BRAIN_PAT  = os.environ.get("BRAIN_PAT", "")
 BRAIN_REPO = os.environ.get("BRAIN_REPO", "akunTools/ai-brain")
-API_BASE   = "https://api.github.com"
+# "1" = seluruh repo, atau prefix dipisah koma (mis. "staging,memory")
+SNAPSHOT   = os.environ.get("LOADER_SNAPSHOT", "")
 
 
-def _headers():
-    return {
-        "Authorization": f"token {BRAIN_PAT}",
-        "Accept":        "application/vnd.github.v3+json",
-        "User-Agent":    "ai-engine"
-    }
+def _store():
+    if SNAPSHOT and SNAPSHOT != "0":
+        prefixes = ("",) if SNAPSHOT == "1" else tuple(SNAPSHOT.split(","))
+        return storage.snapshot(BRAIN_REPO, token=BRAIN_PAT, prefixes=prefixes)
+    return storage.get(BRAIN_REPO, token=BRAIN_PAT)
 
 
 def fetch_file(path: str) -> str:
-    """Ambil isi file teks dari ai-brain."""
-    url = f"{API_BASE}/repos/{BRAIN_REPO}/contents/{path}"
-    req = urllib.request.Request(url, headers=_headers())
-    with urllib.request.urlopen(req) as r:
-        data = json.loads(r.read())
-    return base64.b64decode(data["content"]).decode("utf-8")
+    """
+    Ambil isi file teks dari ai-brain.
+    Backend github memakai If-None-Match dari fetch_cache: 304 → isi dari cache lokal.
+    """
+    return _store().read(path)
 
 
 def fetch_json(path: str) -> dict:
@@ -36,56 +39,43 @@ def fetch_json(path: str) -> dict:
 
 
 def update_file(path: str, content: str, message: str) -> bool:
-    """Update atau buat file di ai-brain."""
-    url = f"{API_BASE}/repos/{BRAIN_REPO}/contents/{path}"
-    sha = None
-    try:
-        req = urllib.request.Request(url, headers=_headers())
-        with urllib.request.urlopen(req) as r:
-            sha = json.loads(r.read()).get("sha")
-    except Exception:
-        pass
-
-    payload = {
-        "message": message,
-        "content": base64.b64encode(content.encode("utf-8")).decode("utf-8")
-    }
-    if sha:
-        payload["sha"] = sha
-
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={**_headers(), "Content-Type": "application/json"},
-        method="PUT"
-    )
+    """
+    Update atau buat file di ai-brain.
+    sha lama diambil dari blob_registry jika sudah diketahui (tanpa GET).
+    """
     try:
-        with urllib.request.urlopen(req) as r:
-            return r.status in (200, 201)
+        return _store().write(path, content, message)
     except urllib.error.HTTPError as e:
         print(f"update_file error for {path}: {e.code} {e.read().decode()}")
         return False
 
 
-def list_folder(path: str) -> list:
+def transact_json(path: str, mutate, message: str, **kwargs) -> transact.Result:
+    """
+    Update file JSON di ai-brain dengan optimistic concurrency (transact.py):
+    mutate(doc) dijalankan ulang di atas isi terbaru jika file berubah
+    sejak dibaca. kwargs: default, encode, max_attempts.
+    """
+    try:
+        return transact.update_json(_store(), path, mutate, message, **kwargs)
+    except urllib.error.HTTPError as e:
+        print(f"transact_json error for {path}: {e.code} {e.read().decode()}")
+        return transact.Result(False, 0, None, False)
+
+
+def list_folder(path: str, include_hidden: bool = False) -> list:
     """
     Daftar semua file dalam sebuah folder di ai-brain.
     Return: [{name, path, sha}] atau [] jika folder tidak ada.
+    .gitkeep tidak ikut kecuali include_hidden=True.
     Raises exception jika terjadi error selain 404.
     """
-    url = f"{API_BASE}/repos/{BRAIN_REPO}/contents/{path}"
-    req = urllib.request.Request(url, headers=_headers())
     try:
-        with urllib.request.urlopen(req) as r:
-            items = json.loads(r.read())
-        return [
-            {"name": i["name"], "path": i["path"], "sha": i["sha"]}
-            for i in items
-            if i["type"] == "file" and i["name"] != ".gitkeep"
-        ]
+        files = _store().list_folder(path)
+        if include_hidden:
+            return files
+        return [f for f in files if f["name"] != ".gitkeep"]
     except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return []  # Folder tidak ada, anggap kosong
         # Error lain (401, 403, 500) harus di-raise agar pipeline gagal
         print(f"HTTP error {e.code} saat mengakses folder {path}: {e.reason}")
         raise
@@ -94,18 +84,14 @@ def list_folder(path: str) -> list:
         raise
 
 
+def folder_sha(path: str) -> str | None:
+    """sha tree folder di ai-brain (None jika folder tidak ada)."""
+    return _store().folder_sha(path)
+
+
 def delete_file(path: str, sha: str, message: str) -> bool:
     """Hapus file dari ai-brain (dipakai setelah konten dipublish)."""
-    url = f"{API_BASE}/repos/{BRAIN_REPO}/contents/{path}"
-    payload = {"message": message, "sha": sha}
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={**_headers(), "Content-Type": "application/json"},
-        method="DELETE"
-    )
     try:
-        with urllib.request.urlopen(req) as r:
-            return r.status == 200
+        return _store().delete(path, message, sha)
     except Exception:
         return False
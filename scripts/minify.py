@@ -0,0 +1,334 @@
+"""
+minify.py
+Minify HTML / CSS / JS / JSON-LD tanpa dependency, untuk halaman yang
+dipublish ke branch output (postprocess, sitemap_gen) dan stylesheet assets.
+
+    minify.html(page)      whitespace di luar <pre>/<textarea> dirapatkan,
+                           komentar HTML dibuang, <style> → css(),
+                           <script> → js(), JSON-LD → JSON kompak
+    minify.fragment(body)  versi murah untuk bagian dinamis halaman (body
+                           staging): hanya whitespace teks dirapatkan dan
+                           komentar dibuang; tag, <script>, <style>, <pre>,
+                           <textarea> & elemen white-space:pre apa adanya
+    minify.css(text)       komentar dibuang, whitespace di sekitar { } ; , > :
+    minify.js(text)        komentar dibuang, indentasi dibuang; baris baru
+                           dipertahankan kecuali jelas aman (ASI tidak berubah)
+
+Konservatif: whitespace di elemen dengan style white-space:pre* juga
+dipertahankan, dan script yang tidak bisa di-tokenize dengan yakin (string /
+regex tidak tertutup) dibiarkan apa adanya. Hasil deterministik — input sama
+→ output sama — jadi hash isi (blob_registry, fingerprint assets) tetap stabil.
+MINIFY=0 mematikan semuanya (output = input).
+"""
+import os
+import re
+import json
+import functools
+
+MINIFY = os.environ.get("MINIFY", "1") != "0"
+
+_TOKEN    = re.compile(
+    r"<!--.*?-->"
+    r"|<(script|style|pre|textarea)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>.*?</\1\s*>"
+    r"|</?[a-zA-Z](?:[^>\"']|\"[^\"]*\"|'[^']*')*>"
+    r"|[^<]+|<",
+    re.S | re.I,
+)
+_OPEN_TAG  = re.compile(r"<(?:[^>\"']|\"[^\"]*\"|'[^']*')*>")
+_TAG_NAME  = re.compile(r"</?([a-zA-Z][\w-]*)")
+_PRE_STYLE = re.compile(r"white-space\s*:\s*pre", re.I)
+_SCRIPT_TYPE = re.compile(r"\btype\s*=\s*[\"']?([^\"'\s>]+)", re.I)
+_JS_TYPES  = ("", "text/javascript", "application/javascript", "module")
+_VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input",
+                        "link", "meta", "source", "track", "wbr"))
+
+
+def _collapse(text: str) -> str:
+    """Whitespace berurutan → satu baris baru (jika ada) atau satu spasi."""
+    # str.split() di C jauh lebih cepat dari regex whitespace untuk teks body
+    lines = text.split("\n")
+    if len(lines) == 1:
+        core = " ".join(text.split())
+        if not core:
+            return " " if text else ""
+        return (" " if text[0].isspace() else "") + core + (" " if text[-1].isspace() else "")
+    first, last = lines[0], lines[-1]
+    head = " ".join(first.split())
+    tail = " ".join(last.split())
+    if head and first[0].isspace():
+        head = " " + head
+    if tail and last[-1].isspace():
+        tail += " "
+    out = "\n".join(filter(None, [head, *(" ".join(l.split()) for l in lines[1:-1]), tail]))
+    if not out:
+        return "\n"
+    return ("" if head else "\n") + out + ("" if tail else "\n")
+
+
+# ── HTML ─────────────────────────────────────────────────────────────────────
+
+# Tag, <script> & <style> template sama di setiap halaman → hasil di-cache
+@functools.lru_cache(maxsize=4096)
+def _minify_tag(tag: str) -> str:
+    """Whitespace di antara atribut (di luar nilai ber-kutip) dirapatkan."""
+    parts = re.split(r"(\"[^\"]*\"|'[^']*')", tag)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", parts[i])
+    # Spasi sebelum "/>" tetap dipertahankan setelah nilai atribut tanpa kutip:
+    # <input value=a /> ≠ <input value=a/> (nilainya menjadi "a/")
+    last = parts[-1]
+    if last.endswith(" />") and "=" not in last[:-3].rpartition(" ")[2]:
+        parts[-1] = last[:-3] + "/>"
+    elif last.endswith(" >"):
+        parts[-1] = last[:-2] + ">"
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=256)
+def _minify_raw(element: str, name: str) -> str:
+    """<script>/<style>: isi di-minify sesuai jenisnya; <pre>/<textarea> apa adanya."""
+    if name not in ("script", "style"):
+        return element
+    start    = _OPEN_TAG.match(element).end()
+    end      = element.lower().rfind("</")
+    open_tag = element[:start]
+    body     = element[start:end]
+
+    if name == "style":
+        body = css(body)
+    else:
+        m    = _SCRIPT_TYPE.search(open_tag)
+        kind = m.group(1).lower() if m else ""
+        if kind == "application/ld+json":
+            body = _json_ld(body)
+        elif kind in _JS_TYPES:
+            body = js(body)
+    return _minify_tag(open_tag) + body + element[end:]
+
+
+def _json_ld(text: str) -> str:
+    try:
+        return json.dumps(json.loads(text), ensure_ascii=False, separators=(",", ":"))
+    except ValueError:
+        return text.strip()
+
+
+def html(text: str) -> str:
+    """Minify dokumen / fragmen HTML."""
+    if not MINIFY:
+        return text
+    out      = []
+    text_run = []     # teks berurutan (komentar yang dibuang menyambungnya) → satu _collapse
+    preserve = None   # [nama tag, kedalaman] elemen white-space:pre yang sedang terbuka
+
+    def emit(token: str) -> None:
+        if text_run:
+            out.append(_collapse("".join(text_run)))
+            text_run.clear()
+        out.append(token)
+
+    for m in _TOKEN.finditer(text):
+        token = m.group(0)
+        if token.startswith("<!--"):
+            if token.startswith("<!--[if") or preserve:
+                emit(token)
+            continue
+        if m.group(1):
+            emit(token if preserve else _minify_raw(token, m.group(1).lower()))
+            continue
+        if token.startswith("<") and len(token) > 1:
+            name_m = _TAG_NAME.match(token)
+            name   = name_m.group(1).lower() if name_m else ""
+            closing = token.startswith("</")
+            if preserve:
+                if name == preserve[0] and not token.endswith("/>"):
+                    preserve[1] += -1 if closing else 1
+                    if preserve[1] == 0:
+                        preserve = None
+                emit(token)
+                continue
+            if (not closing and name not in _VOID_TAGS
+                    and _PRE_STYLE.search(token) and not token.endswith("/>")):
+                preserve = [name, 1]
+            emit(_minify_tag(token))
+            continue
+        if preserve:
+            emit(token)
+        else:
+            text_run.append(token)
+    emit("")
+
+    result = "".join(out)
+    return result.strip() + "\n" if result.endswith("\n") else result.strip()
+
+
+# fragment(): hanya token yang tidak boleh dirapatkan yang dicari; sisanya teks
+_KEEP = re.compile(
+    r"<!--.*?-->"
+    r"|<(script|style|pre|textarea)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>.*?</\1\s*>"
+    r"|<([a-zA-Z][\w-]*)\b[^>]*white-space\s*:\s*pre[^>]*>",
+    re.S | re.I,
+)
+
+
+def _element_end(text: str, name: str, pos: int) -> int:
+    """Offset setelah tag penutup elemen {name} yang tag pembukanya berakhir di pos."""
+    depth = 1
+    tags  = re.compile(rf"<(/?){name}\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>", re.I)
+    for m in tags.finditer(text, pos):
+        if m.group(0).endswith("/>"):
+            continue
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            return m.end()
+    return len(text)
+
+
+def fragment(text: str) -> str:
+    """
+    Minify murah untuk HTML dinamis yang disisipkan ke template yang sudah
+    di-minify (Template(minify=html)): satu pass regex, tanpa tokenizer.
+    """
+    if not MINIFY:
+        return text
+    out, run, pos = [], [], 0     # run = potongan teks yang disambung komentar terbuang
+    for m in _KEEP.finditer(text):
+        if m.start() < pos:
+            continue                 # di dalam elemen white-space:pre yang sudah disalin
+        run.append(text[pos:m.start()])
+        token, name = m.group(0), m.group(2)
+        pos = m.end()
+        if token.startswith("<!--") and not token.startswith("<!--[if"):
+            continue
+        out.append(_collapse("".join(run)))
+        run = []
+        if token.startswith("<!--"):
+            out.append(token)
+        elif name and name.lower() not in _VOID_TAGS and not token.endswith("/>"):
+            pos = _element_end(text, name, pos)
+            out.append(text[m.start():pos])
+        else:
+            out.append(token)
+    run.append(text[pos:])
+    out.append(_collapse("".join(run)))
+    return "".join(out)
+
+
+# ── CSS ──────────────────────────────────────────────────────────────────────
+
+_CSS_TOKEN = re.compile(r"/\*.*?\*/|\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|[^/\"']+|.", re.S)
+
+
+def _css_chunk(chunk: str) -> str:
+    chunk = re.sub(r"\s+", " ", chunk)
+    chunk = re.sub(r"\s*([{};,>])\s*", r"\1", chunk)
+    # Spasi SEBELUM ':' bisa bermakna di selector (".a :hover"), sesudahnya tidak
+    return re.sub(r":\s+", ":", chunk).replace(";}", "}")
+
+
+def css(text: str) -> str:
+    if not MINIFY:
+        return text
+    out, chunk = [], []     # chunk = potongan di luar string, komentar → spasi
+    for m in _CSS_TOKEN.finditer(text):
+        token = m.group(0)
+        if token[0] in "\"'":
+            out.append(_css_chunk("".join(chunk)))
+            out.append(token)
+            chunk = []
+        else:
+            chunk.append(" " if token.startswith("/*") else token)
+    out.append(_css_chunk("".join(chunk)))
+    return "".join(out).strip()
+
+
+# ── JS ───────────────────────────────────────────────────────────────────────
+
+_JS_TOKEN = re.compile(
+    r"//[^\n]*|/\*.*?\*/"
+    r"|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`"
+    r"|\s+|[\w$]+|.",
+    re.S,
+)
+_REGEX_AFTER   = set("(,=:[!&|?{};+-*%~^<>")
+_REGEX_KEYWORD = frozenset(("return", "typeof", "case", "do", "else", "in", "of",
+                            "new", "delete", "void", "throw", "instanceof"))
+_WORD = re.compile(r"[\w$]")
+# Baris baru di antara token ini tidak pernah memicu ASI: statement belum
+# selesai setelah operator / pembuka, atau token berikutnya tidak bisa memulai
+# statement baru. "+" / "-" tidak termasuk (a++ / --b), "/" juga (akhir regex).
+_NL_AFTER  = set("{;,([=&|?:<>*%!~^")
+_NL_BEFORE = set("}]).,?:;")
+
+
+def _regex_end(text: str, start: int) -> int:
+    """Offset setelah literal regex yang dimulai di start, atau -1."""
+    i, in_class = start + 1, False
+    while i < len(text):
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "\n":
+            return -1
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < len(text) and _WORD.match(text[i]):
+                i += 1
+            return i
+        i += 1
+    return -1
+
+
+def js(text: str) -> str:
+    if not MINIFY:
+        return text
+    if "`" in text and "${" in text:
+        return text      # template literal bisa bersarang, tokenizer ini tidak menanganinya
+    out, last, pos = [], "", 0     # last = token signifikan terakhir
+    pending_ws = ""
+    while pos < len(text):
+        m = _JS_TOKEN.match(text, pos)
+        token = m.group(0)
+        if token == "/" and (not last or last[-1] in _REGEX_AFTER or last in _REGEX_KEYWORD):
+            end = _regex_end(text, pos)
+            if end == -1:
+                return text          # tidak yakin → jangan diubah
+            token = text[pos:end]
+            pos   = end
+        else:
+            pos = m.end()
+            if token[0] in "\"'`" and (len(token) < 2 or token[-1] != token[0]):
+                return text
+            if token.startswith("//") or token.startswith("/*"):
+                if token.startswith("/*") and not token.endswith("*/"):
+                    return text
+                pending_ws += "\n" if token.startswith("//") else " "
+                continue
+            if token.isspace():
+                pending_ws += token
+                continue
+
+        if pending_ws and out:
+            prev, nxt = last[-1], token[0]
+            if "\n" in pending_ws:
+                # Baris baru aman dibuang jika statement jelas belum / sudah selesai
+                if not (prev in _NL_AFTER or nxt in _NL_BEFORE):
+                    out.append("\n")
+            elif (_WORD.match(prev) and _WORD.match(nxt)) or (prev in "+-" and nxt in "+-"):
+                out.append(" ")
+        pending_ws = ""
+        out.append(token)
+        last = token
+    return "".join(out)
+
+
+def saved(before: str, after: str) -> dict:
+    """Atribut span: ukuran sebelum / sesudah minify (bytes UTF-8)."""
+    a, b = len(before.encode("utf-8")), len(after.encode("utf-8"))
+    return {"html_bytes": a, "min_bytes": b, "saved_bytes": a - b,
+            "saved_pct": round(100 * (a - b) / a, 1) if a else 0.0}
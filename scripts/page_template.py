@@ -0,0 +1,122 @@
+"""
+page_template.py
+Template halaman yang dikompilasi sekali saat import: bagian statis (CSS,
+nav, footer, script) digabung menjadi beberapa string besar, dan render satu
+halaman hanya "".join di atas slot dinamis (judul, URL, body, ...).
+
+    PAGE = Template(
+        "<title>{{title}}</title><style>{{css}}</style>{{body}}",
+        name="page", css=_BASE_CSS,
+    )
+    PAGE.render(title="...", body="...")
+
+Slot ditulis {{nama}}. Slot yang diisi saat kompilasi (keyword argumen
+Template) disisipkan ke sumber sebelum slot dinamis dicari, jadi tidak ada
+biaya per render — dan nilai statis boleh berupa potongan template lain
+(mis. hasil json_ld()) yang membawa slot dinamisnya sendiri.
+
+JSON-LD: json_ld(doc) menghasilkan sumber template dari dict yang nilainya
+boleh berupa slot(nama). Kerangka di-serialize SEKALI (indent=2, sama
+dengan json.dumps biasa); saat render hanya nilai slot yang di-encode dan
+disisipkan dengan indentasi baris tempatnya, jadi hasilnya byte-identik
+dengan json.dumps(doc_lengkap, indent=2) tanpa menelusuri ulang seluruh dict.
+
+minify: Template(..., minify=minify.html) me-minify sumber SEKALI setelah
+slot statis dilebur (slot dinamis {{...}} ikut terbawa sebagai teks / nilai
+atribut / string JSON). Nilai slot JSON lalu di-encode ringkas, sama dengan
+JSON-LD hasil minify; nilai slot lain disisipkan apa adanya, jadi HTML
+dinamis yang besar (body) di-minify pemanggilnya dengan minify.fragment.
+
+digest = sha1 sumber template setelah slot statis dilebur (dan di-minify);
+berubah setiap kali markup / CSS yang dibakukan berubah.
+"""
+import re
+import json
+import hashlib
+from json.encoder import encode_basestring as _encode_str
+
+_SLOT      = re.compile(r'"\{\{(\w+)\|json\}\}"|\{\{(\w+)\}\}')
+_LD_OPEN   = '<script type="application/ld+json">'
+_LD_CLOSE  = '</script>'
+
+
+def slot(name: str) -> str:
+    """Placeholder nilai JSON di dokumen json_ld()."""
+    return "{{" + name + "|json}}"
+
+
+def json_ld(doc: dict, indent: str = "  ") -> str:
+    """
+    Sumber template <script type="application/ld+json"> untuk doc, dengan
+    format yang sama seperti:
+        '\\n  <script ...>\\n  ' + json.dumps(doc, indent=2).replace('\\n', '\\n  ') + ...
+    """
+    body = json.dumps(doc, ensure_ascii=False, indent=2).replace("\n", "\n" + indent)
+    return f"\n{indent}{_LD_OPEN}\n{indent}{body}\n{indent}{_LD_CLOSE}"
+
+
+def _encode_json(value, indent: str) -> str:
+    if isinstance(value, str):
+        return _encode_str(value)   # == json.dumps(value, ensure_ascii=False)
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace("\n", "\n" + indent) if "\n" in text else text
+
+
+def _encode_compact(value, indent: str) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class Template:
+    """Template terkompilasi: segmen statis + daftar slot dinamis."""
+
+    def __init__(self, source: str, name: str = "", minify=None, **static):
+        self.name   = name
+        self.source = _SLOT.sub(lambda m: _fill(source, m, static), source)
+        if minify is not None:
+            self.source = minify(self.source)
+        self._json  = _encode_json if minify is None else _encode_compact
+
+        statics, slots, pos = [], [], 0
+        for m in _SLOT.finditer(self.source):
+            statics.append(self.source[pos:m.start()])
+            json_name, raw_name = m.groups()
+            indent = _line_indent(self.source, m.start()) if json_name else None
+            slots.append((json_name or raw_name, indent))
+            pos = m.end()
+        statics.append(self.source[pos:])
+
+        self._head  = statics[0]
+        self._slots = tuple(zip(slots, statics[1:]))   # ((nama, indent), segmen setelahnya)
+        self.slots  = tuple(dict.fromkeys(key for key, _ in slots))
+        self.digest = hashlib.sha1(self.source.encode("utf-8")).hexdigest()
+
+    def render(self, **values) -> str:
+        out = [self._head]
+        try:
+            for (key, indent), tail in self._slots:
+                value = values[key]
+                out.append(value if indent is None else self._json(value, indent))
+                out.append(tail)
+        except KeyError as e:
+            raise KeyError(f"template {self.name or '?'}: slot {e} tidak diisi") from None
+        return "".join(out)
+
+
+def _fill(source: str, m, static: dict) -> str:
+    """Isi slot statis; slot dinamis dibiarkan apa adanya."""
+    json_name, raw_name = m.groups()
+    key = json_name or raw_name
+    if key not in static:
+        return m.group(0)
+    if json_name:
+        return _encode_json(static[key], _line_indent(source, m.start()))
+    return static[key]
+
+
+def _line_indent(source: str, offset: int) -> str:
+    """Whitespace di awal baris tempat offset berada."""
+    start = source.rfind("\n", 0, offset) + 1
+    end   = start
+    while end < offset and source[end] in " \t":
+        end += 1
+    return source[start:end]
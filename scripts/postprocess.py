@@ -5,9 +5,17 @@ Artikel di-convert dari Markdown ke HTML lengkap sebelum dipublish.
 """
 import os
 import re
-import json as _json
+import hashlib
 from datetime import datetime
 
+import clock
+import assets
+import minify
+import related
+import tracing
+import html_meta
+from page_template import Template, json_ld, slot
+
 _SUBSCRIBE_URL = (
     os.environ.get("WORKER_URL", "").rstrip("/") + "/subscribe"
     if os.environ.get("WORKER_URL") else ""
@@ -18,6 +26,25 @@ def _reading_time(text: str) -> int:
     return max(1, round(len(text.split()) / 200))
 
 
+def minify_page(page: str, slug: str) -> str:
+    """Pass terakhir sebelum publish; penghematan byte dicatat di trace."""
+    with tracing.span("minify", slug=slug) as sp:
+        out = minify.html(page)
+        sp.set(**minify.saved(page, out))
+    return out
+
+
+def minify_body(body_html: str, slug: str) -> str:
+    """
+    Body halaman artikel / tool: kerangka template sudah di-minify saat
+    kompilasi, jadi per halaman hanya whitespace body yang dirapatkan.
+    """
+    with tracing.span("minify", slug=slug) as sp:
+        out = minify.fragment(body_html)
+        sp.set(**minify.saved(body_html, out))
+    return out
+
+
 # ─────────────────────────────────────────────
 # SHARED DESIGN SYSTEM
 # ─────────────────────────────────────────────
@@ -366,7 +393,8 @@ _EMAIL_CAPTURE_TMPL = """<section class="email-capture">
   </script>
 </section>"""
 
-_ARTICLE_CSS = """
+# ── CSS kritis artikel: kerangka + header (above the fold) ──────────────────
+_ARTICLE_HEADER_CSS = """
   .article-wrap {
     max-width: 680px;
     margin: 0 auto;
@@ -411,6 +439,13 @@ _ARTICLE_CSS = """
     padding: 4px 8px;
     border-radius: 4px;
   }
+  @media (max-width: 640px) {
+    .article-wrap { padding: 0 16px; }
+    .article-header { padding: 40px 0 32px; }
+  }
+"""
+
+_ARTICLE_CSS = """
   .article-body {
     font-size: 1.0625rem;
     line-height: 1.72;
@@ -620,8 +655,6 @@ _ARTICLE_CSS = """
   }
   
   @media (max-width: 640px) {
-    .article-wrap { padding: 0 16px; }
-    .article-header { padding: 40px 0 32px; }
     .article-body { font-size: 1rem; }
     .article-body pre {
       margin: 32px -16px;
@@ -639,129 +672,465 @@ _ARTICLE_CSS = """
   }
 """
 
-_TOOL_CSS = ""  # CSS disediakan oleh wrap_tool_html — tidak dipakai standalone
+# ── CSS kalkulator — khusus tool page ───────────────────────────────────────
+# Kritis: layout + judul (above the fold)
+_TOOL_HEADER_CSS = """
+    /* ── LAYOUT ── */
+    .container { max-width: 680px; margin: 0 auto; padding: 48px 24px 80px; }
 
-# ── CSS untuk Chart & Decision Tree — di-inject ke tool page ─────────────────
-_CHART_CSS = """
-    /* ── CHART CONTAINER ── */
-    .chart-container {
-      background: var(--surface);
-      border: 1px solid var(--border);
-      border-radius: var(--r);
-      padding: 24px;
-      margin-bottom: 24px;
-      position: relative;
-      width: 100%;
+    /* ── TYPOGRAPHY ── */
+    h1 {
+      font-size: clamp(1.75rem, 4vw, 2.25rem);
+      font-weight: 700;
+      letter-spacing: -.03em;
+      color: var(--text);
+      margin-bottom: 8px;
     }
-    .chart-container canvas {
-      width: 100% !important;
-      max-height: 400px;
+    .subtitle {
+      color: var(--muted);
+      font-size: 1.0625rem;
+      margin-bottom: 40px;
+      line-height: 1.6;
+    }
+    @media (max-width: 640px) {
+      .container { padding: 32px 16px 64px; }
     }
 """
 
-_DECISION_TREE_CSS = """
-    /* ── DECISION TREE ── */
-    .decision-tree {
-      display: flex;
-      flex-direction: column;
-      gap: 0;
-      margin-bottom: 24px;
-    }
-    .decision-node {
+_TOOL_CSS = """
+    /* ── CARD ── */
+    .card {
       background: var(--surface);
       border: 1px solid var(--border);
       border-radius: var(--r);
-      padding: 20px 24px;
-      position: relative;
+      padding: 32px;
+      margin-bottom: 24px;
     }
-    .decision-node.active {
-      border-color: var(--accent);
-      border-width: 2px;
-      background: var(--accent-light);
+    .card h2 {
+      font-size: .875rem;
+      font-weight: 600;
+      color: var(--text);
+      text-transform: uppercase;
+      letter-spacing: .05em;
+      margin-bottom: 24px;
+      border-bottom: 2px solid var(--text);
+      padding-bottom: 8px;
     }
-    .decision-node.completed {
-      border-color: var(--success);
-      background: var(--success-bg);
+
+    /* ── CARD HR separator ── */
+    .card hr {
+      border: none;
+      border-top: 1px solid var(--border);
+      margin: 24px 0;
     }
-    .decision-node h3 {
-      font-size: 1rem;
+
+    /* ── INPUTS (UTILITARIAN BRUTALISM) ── */
+    .input-group { margin-bottom: 20px; }
+    .input-group:last-child { margin-bottom: 0; }
+    label {
+      display: block;
+      font-size: .875rem;
       font-weight: 600;
       color: var(--text);
-      margin: 0 0 8px;
+      margin-bottom: 8px;
     }
-    .decision-node p {
-      font-size: 0.9375rem;
+    .input-wrapper { position: relative; }
+    .input-prefix {
+      position: absolute;
+      left: 14px;
+      top: 50%;
+      transform: translateY(-50%);
       color: var(--muted);
-      margin: 0 0 16px;
-    }
-    .decision-options {
-      display: flex;
-      flex-wrap: wrap;
-      gap: 8px;
+      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
+      font-size: 1rem;
+      pointer-events: none;
+      font-weight: 500;
     }
-    .decision-option {
-      display: inline-flex;
-      align-items: center;
-      padding: 8px 16px;
+    input[type="number"] {
+      width: 100%;
+      padding: 12px 14px 12px 32px;
       border: 1px solid var(--border);
       border-radius: var(--r);
-      background: var(--bg);
+      font-size: 16px !important; /* CRITICAL: Mencegah iOS Auto-Zoom */
+      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
       color: var(--text);
-      font-size: 0.875rem;
-      font-weight: 500;
-      cursor: pointer;
-      transition: all 0.15s ease;
-      min-height: 44px;
-      text-decoration: none;
+      background: var(--bg);
+      transition: border-color .15s, outline .15s;
+      -moz-appearance: textfield;
     }
-    .decision-option:hover {
-      border-color: var(--text);
+    input[type="number"]::-webkit-outer-spin-button,
+    input[type="number"]::-webkit-inner-spin-button { -webkit-appearance: none; }
+    input[type="number"]:focus {
+      outline: 2px solid var(--accent);
+      outline-offset: -1px;
+      border-color: var(--accent);
       background: var(--surface);
     }
-    .decision-option.selected {
+    input[type="number"].error-input { border-color: var(--danger); }
+    .error-msg {
+      color: var(--danger);
+      font-size: .8125rem;
+      margin-top: 6px;
+      display: none;
+    }
+
+    /* ── SELECT, CHECKBOX, RADIO, RANGE ── */
+    select {
+      width: 100%;
+      padding: 12px 14px;
+      border: 1px solid var(--border);
+      border-radius: var(--r);
+      font-size: 16px;
+      font-family: 'DM Sans', -apple-system, BlinkMacSystemFont, sans-serif;
+      color: var(--text);
+      background: var(--bg);
+      cursor: pointer;
+      transition: border-color .15s, outline .15s;
+    }
+    select:focus {
+      outline: 2px solid var(--accent);
+      outline-offset: -1px;
       border-color: var(--accent);
-      background: var(--accent-light);
-      color: var(--accent);
+      background-color: var(--surface);
     }
-    .decision-branch {
+    select.error-input { border-color: var(--danger); }
+    .checkbox-group {
       display: flex;
-      justify-content: center;
-      padding: 4px 0;
+      align-items: center;
+      gap: 12px;
+      padding: 10px 0;
+      min-height: 44px;
+      cursor: pointer;
+    }
+    .checkbox-group label {
+      font-size: .9375rem;
+      font-weight: 400;
+      color: var(--text);
+      margin-bottom: 0;
+      cursor: pointer;
+    }
+    input[type="checkbox"],
+    input[type="radio"] {
+      width: 20px;
+      height: 20px;
+      flex-shrink: 0;
+      accent-color: var(--accent);
+      cursor: pointer;
+    }
+    input[type="range"] {
+      width: 100%;
+      accent-color: var(--accent);
+      height: 6px;
+      cursor: pointer;
+      padding: 0;
+    }
+
+    /* ── RESULT (HIGH CONTRAST) ── */
+    .result-card {
+      background: var(--surface);
+      border: 2px solid var(--text);
+      border-radius: var(--r);
+      padding: 32px;
+      margin-bottom: 24px;
+    }
+    .result-label {
+      font-size: .8125rem;
+      font-weight: 600;
       color: var(--muted);
+      text-transform: uppercase;
+      letter-spacing: .06em;
+      margin-bottom: 8px;
+    }
+    .result-number {
       font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-      font-size: 1.2rem;
+      font-size: clamp(1.75rem, 6vw, 4rem);
+      font-weight: 700;
+      color: var(--text);
+      line-height: 1;
+      letter-spacing: -.05em;
+      margin-bottom: 8px;
+      overflow-wrap: break-word;
+      word-break: break-all;
     }
-    @media (max-width: 640px) {
-      .chart-container { padding: 16px; }
-      .decision-node { padding: 16px; }
-      .decision-options { flex-direction: column; }
-      .decision-option { width: 100%; }
+    .result-unit {
+      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
+      font-size: 1rem;
+      color: var(--muted);
+      margin-bottom: 24px;
+    }
+    .interpretation {
+      background: var(--bg);
+      border: 1px solid var(--border);
+      border-left: 4px solid var(--text);
+      border-radius: 0 var(--r) var(--r) 0;
+      padding: 16px 20px;
+      font-size: 0.9375rem;
+      color: var(--text);
+      line-height: 1.6;
+    }
+    .interpretation.danger { border-color: var(--danger); background: var(--danger-bg); }
+    .interpretation.warning { border-color: var(--warning); background: var(--warning-bg); }
+    .interpretation.healthy { border-color: var(--success); background: var(--success-bg); }
+    .secondary-result {
+      margin-top: 16px;
+      font-size: .875rem;
+      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
+      color: var(--muted);
     }
-"""
 
-_RELATED_CSS = """
-  .related-content { margin-bottom: 32px; }
-  .related-heading {
-    font-size: .75rem; font-weight: 600; color: var(--muted);
-    text-transform: uppercase; letter-spacing: .05em;
-    margin-bottom: 12px; margin-top: 24px;
-  }
-  .related-heading:first-child { margin-top: 0; }
-  .related-list {
-    list-style: none; margin: 0; padding: 0;
-    display: flex; flex-direction: column; gap: 8px;
-  }
-  .related-list li a {
-    font-size: .9rem; color: var(--text); text-decoration: none;
-    display: block; padding: 12px 16px; background: var(--surface);
-    border: 1px solid var(--border); border-radius: var(--r);
-    transition: border-color .15s, background .15s;
-  }
-  .related-list li a:hover { border-color: var(--text); background: var(--bg); }
-"""
+    /* ── RESULT ROW (multi-result separator) ── */
+    .result-row {
+      padding-bottom: 20px;
+      margin-bottom: 20px;
+      border-bottom: 1px solid var(--border);
+    }
+    .result-row:last-child {
+      padding-bottom: 0;
+      margin-bottom: 0;
+      border-bottom: none;
+    }
 
-_RELATED_JS = """<script>
-(function() {
+    /* ── FORMULA BOX ── */
+    .formula-box {
+      background: var(--bg);
+      border: 1px solid var(--border);
+      border-radius: var(--r);
+      padding: 24px;
+      margin-bottom: 24px;
+    }
+    .formula-box h3 {
+      font-size: .75rem;
+      font-weight: 600;
+      color: var(--text);
+      text-transform: uppercase;
+      letter-spacing: .06em;
+      margin-bottom: 12px;
+    }
+    .formula-box p {
+      font-size: 0.875rem;
+      color: var(--text);
+      line-height: 1.7;
+      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
+    }
+    .formula-box ul, .formula-box ol {
+      margin: 10px 0;
+      padding-left: 20px;
+    }
+    .formula-box li {
+      margin-bottom: 8px;
+      font-size: 0.875rem;
+      color: var(--text);
+      line-height: 1.6;
+      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
+    }
+    .formula-box li code {
+      background: #f4f4f5;
+      border: 1px solid var(--border);
+      color: var(--text);
+      padding: 0.15em 0.4em;
+      border-radius: 3px;
+      font-size: 0.85em;
+    }
+
+    /* ── AFFILIATE BOX ── */
+    .affiliate-box {
+      background: var(--surface);
+      border: 1px solid var(--border);
+      border-left: 4px solid var(--success);
+      border-radius: 0 var(--r) var(--r) 0;
+      padding: 20px 24px;
+      margin-bottom: 24px;
+      font-size: 0.9375rem;
+      color: var(--text);
+      line-height: 1.6;
+    }
+    .affiliate-box a {
+      color: var(--success);
+      font-weight: 600;
+      text-decoration: underline;
+      text-decoration-color: rgba(16,185,129,.4);
+    }
+    .affiliate-box a:hover { color: #059669; text-decoration-color: #059669; }
+
+    /* ── RELATED LINK ── */
+    .related-link { font-size: .9375rem; color: var(--muted); padding: 16px 0; }
+    .related-link a { color: var(--accent); text-decoration: underline; font-weight: 500; }
+    .related-link a:hover { color: var(--accent-h); }
+
+    /* ── FAQ ── */
+    .faq { margin-top: 48px; }
+    .faq h3 {
+      font-size: 1.25rem; font-weight: 700; color: var(--text);
+      letter-spacing: -.02em; margin-bottom: 20px;
+      border-bottom: 2px solid var(--text); padding-bottom: 8px;
+    }
+    .faq details {
+      border: 1px solid var(--border);
+      border-radius: var(--r);
+      margin-bottom: 12px;
+      background: var(--surface);
+    }
+    .faq summary {
+      padding: 16px 20px; font-size: 1rem; font-weight: 600; color: var(--text);
+      cursor: pointer; list-style: none; display: flex;
+      justify-content: space-between; align-items: center;
+      min-height: 44px;
+    }
+    .faq summary::-webkit-details-marker { display: none; }
+    .faq summary::after {
+      content: '+'; font-size: 1.2rem; color: var(--muted);
+      font-weight: 300; flex-shrink: 0; margin-left: 16px; font-family: monospace;
+    }
+    .faq details[open] > summary::after { content: '−'; }
+    .faq details[open] > summary { border-bottom: 1px solid var(--border); background: var(--bg); }
+    .faq .faq-answer {
+      padding: 20px; font-size: 0.9375rem; color: var(--muted);
+      line-height: 1.7; background: var(--surface);
+    }
+
+    /* ── ARTICLE BODY di dalam tool: top spacing & separator ── */
+    .container > .article-body {
+      margin-top: 48px;
+      padding-top: 48px;
+      border-top: 1px solid var(--border);
+    }
+
+    /* ── Override article-body h2 untuk tool: lebih compact ── */
+    .container .article-body h2 {
+      margin: 40px 0 20px;
+    }
+"""
+
+_TOOL_MOBILE_CSS = """
+    @media (max-width: 640px) {
+      .card, .result-card, .formula-box, .affiliate-box { padding: 20px; }
+    }
+"""
+
+# ── CSS untuk Chart & Decision Tree — di-inject ke tool page ─────────────────
+_CHART_CSS = """
+    /* ── CHART CONTAINER ── */
+    .chart-container {
+      background: var(--surface);
+      border: 1px solid var(--border);
+      border-radius: var(--r);
+      padding: 24px;
+      margin-bottom: 24px;
+      position: relative;
+      width: 100%;
+    }
+    .chart-container canvas {
+      width: 100% !important;
+      max-height: 400px;
+    }
+"""
+
+_DECISION_TREE_CSS = """
+    /* ── DECISION TREE ── */
+    .decision-tree {
+      display: flex;
+      flex-direction: column;
+      gap: 0;
+      margin-bottom: 24px;
+    }
+    .decision-node {
+      background: var(--surface);
+      border: 1px solid var(--border);
+      border-radius: var(--r);
+      padding: 20px 24px;
+      position: relative;
+    }
+    .decision-node.active {
+      border-color: var(--accent);
+      border-width: 2px;
+      background: var(--accent-light);
+    }
+    .decision-node.completed {
+      border-color: var(--success);
+      background: var(--success-bg);
+    }
+    .decision-node h3 {
+      font-size: 1rem;
+      font-weight: 600;
+      color: var(--text);
+      margin: 0 0 8px;
+    }
+    .decision-node p {
+      font-size: 0.9375rem;
+      color: var(--muted);
+      margin: 0 0 16px;
+    }
+    .decision-options {
+      display: flex;
+      flex-wrap: wrap;
+      gap: 8px;
+    }
+    .decision-option {
+      display: inline-flex;
+      align-items: center;
+      padding: 8px 16px;
+      border: 1px solid var(--border);
+      border-radius: var(--r);
+      background: var(--bg);
+      color: var(--text);
+      font-size: 0.875rem;
+      font-weight: 500;
+      cursor: pointer;
+      transition: all 0.15s ease;
+      min-height: 44px;
+      text-decoration: none;
+    }
+    .decision-option:hover {
+      border-color: var(--text);
+      background: var(--surface);
+    }
+    .decision-option.selected {
+      border-color: var(--accent);
+      background: var(--accent-light);
+      color: var(--accent);
+    }
+    .decision-branch {
+      display: flex;
+      justify-content: center;
+      padding: 4px 0;
+      color: var(--muted);
+      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
+      font-size: 1.2rem;
+    }
+    @media (max-width: 640px) {
+      .chart-container { padding: 16px; }
+      .decision-node { padding: 16px; }
+      .decision-options { flex-direction: column; }
+      .decision-option { width: 100%; }
+    }
+"""
+
+_RELATED_CSS = """
+  .related-content { margin-bottom: 32px; }
+  .related-heading {
+    font-size: .75rem; font-weight: 600; color: var(--muted);
+    text-transform: uppercase; letter-spacing: .05em;
+    margin-bottom: 12px; margin-top: 24px;
+  }
+  .related-heading:first-child { margin-top: 0; }
+  .related-list {
+    list-style: none; margin: 0; padding: 0;
+    display: flex; flex-direction: column; gap: 8px;
+  }
+  .related-list li a {
+    font-size: .9rem; color: var(--text); text-decoration: none;
+    display: block; padding: 12px 16px; background: var(--surface);
+    border: 1px solid var(--border); border-radius: var(--r);
+    transition: border-color .15s, background .15s;
+  }
+  .related-list li a:hover { border-color: var(--text); background: var(--bg); }
+"""
+
+_RELATED_JS = """<script>
+(function() {
+  // Fallback: blok related sudah dirender saat build (related.py) → tidak fetch
+  var el      = document.getElementById('related-content');
+  if (!el || el.hasAttribute('data-built')) return;
   var meta    = document.querySelector('meta[name="cluster"]');
   var cluster = meta ? meta.getAttribute('content') : '';
   if (!cluster) return;
@@ -793,10 +1162,7 @@ _RELATED_JS = """<script>
         });
         html += '</ul>';
       }
-      if (html) {
-        var el = document.getElementById('related-content');
-        if (el) el.innerHTML = html;
-      }
+      if (html) el.innerHTML = html;
     })
     .catch(function() {});
 })();
@@ -804,6 +1170,8 @@ _RELATED_JS = """<script>
 
 _FUTURE_LINK_JS = """<script>
 (function() {
+  // Fallback: future link yang targetnya sudah live di-resolve saat build
+  if (!document.querySelector('strong[data-future-link]')) return;
   fetch('/content-index.json')
     .then(function(r) { return r.json(); })
     .then(function(idx) {
@@ -829,98 +1197,137 @@ _FUTURE_LINK_JS = """<script>
 # ARTICLE TEMPLATE
 # ─────────────────────────────────────────────
 
-def _build_article_html(fm: dict, body_html: str,
-                        slug: str, date_str: str,
-                        cluster_id: str = "") -> str:
-    """
-    Bungkus article body HTML ke dalam full HTML page.
-    """
-    site_url    = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
-    title       = fm.get("title", slug.replace("-", " ").title())
-    keyword     = fm.get("primary_keyword", "")
-    article_url = f"{site_url}/articles/{slug}"
-    read_time   = _reading_time(body_html)
-
-    try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d")
-        display_date = dt.strftime("%B %-d, %Y")
-    except Exception:
-        display_date = date_str
-
-    kw_meta      = f'<meta name="keywords" content="{keyword}">' if keyword else ""
-    cluster_meta = f'<meta name="cluster" content="{cluster_id}">' if cluster_id else ""
-    meta_desc    = fm.get("meta_desc", title)
+# ── Stylesheet bersama — /assets/{nama}.{hash}.css (assets.py) ──────────────
+# Urutan di dalam bundle = urutan cascade lama di <style> inline.
+SITE_CSS = assets.stylesheet("site", "\n".join((_BASE_CSS, _NAV_CSS, _FOOTER_CSS)))
 
-    kw_badge = (
-        f'<span class="article-header__meta-sep">·</span>'
-        f'<span class="kw-badge">{keyword}</span>'
-    ) if keyword else ""
+ARTICLE_CSS = assets.stylesheet("article", "\n".join((
+    _ARTICLE_HEADER_CSS, _ARTICLE_CSS, _RELATED_CSS,
+    """
+    /* ── FOOTER: override global margin-top for article page ── */
+    footer { margin-top: 0; }
+""",
+    _EMAIL_CAPTURE_CSS,
+)))
+
+TOOL_CSS = assets.stylesheet("tool", "\n".join((
+    _ARTICLE_HEADER_CSS, _ARTICLE_CSS, _TOOL_HEADER_CSS, _TOOL_CSS, _CHART_CSS, _DECISION_TREE_CSS, _RELATED_CSS, _TOOL_MOBILE_CSS,
+)))
+
+# CSS kritis (base, nav, header / judul) di-inline di <head> supaya tampilan
+# pertama tidak menunggu stylesheet; bundle lengkap di atas (yang juga memuat
+# aturan ini, jadi cascade-nya sama) dimuat tanpa memblokir render.
+ARTICLE_CRITICAL_CSS = assets.inline_style(_BASE_CSS, _NAV_CSS, _ARTICLE_HEADER_CSS)
+TOOL_CRITICAL_CSS    = assets.inline_style(_BASE_CSS, _NAV_CSS, _TOOL_HEADER_CSS)
+
+# Kerangka halaman dikompilasi sekali saat import (page_template.py): link
+# stylesheet, nav, footer & script dilebur ke segmen statis, JSON-LD
+# di-serialize sebagai kerangka, lalu seluruh kerangka di-minify sekali
+# (minify=minify.html). Render per halaman hanya mengisi slot {{...}}.
+_EMAIL_CAPTURE = (
+    _EMAIL_CAPTURE_TMPL.replace("__SUBSCRIBE_URL__", _SUBSCRIBE_URL)
+    if _SUBSCRIBE_URL else ""
+)
 
-    email_capture = (
-        _EMAIL_CAPTURE_TMPL.replace("__SUBSCRIBE_URL__", _SUBSCRIBE_URL)
-        if _SUBSCRIBE_URL else ""
-    )
+_STATIC_PARTS = {
+    "font":                 _FONT,
+    "rss_link":             _RSS_LINK,
+    "analytics":            _ANALYTICS,
+    "site_css":             SITE_CSS.preload(),
+    "article_css":          ARTICLE_CSS.preload(),
+    "tool_css":             TOOL_CSS.preload(),
+    "article_critical_css": ARTICLE_CRITICAL_CSS,
+    "tool_critical_css":    TOOL_CRITICAL_CSS,
+    "email_capture":        _EMAIL_CAPTURE,
+    "footer_html":          _FOOTER_HTML,
+    "related_js":           _RELATED_JS,
+    "future_link_js":       _FUTURE_LINK_JS,
+    "affiliate_tracker_js": _AFFILIATE_TRACKER_JS,
+}
+
+_ARTICLE_SCHEMA = json_ld({
+    "@context": "https://schema.org",
+    "@type": "Article",
+    "headline": slot("title"),
+    "description": slot("meta_desc"),
+    "datePublished": slot("date"),
+    "dateModified": slot("date"),
+    "url": slot("article_url"),
+    "image": {
+        "@type": "ImageObject",
+        "url": slot("og_image"),
+        "width": 1200,
+        "height": 630
+    },
+    "author": {
+        "@type": "Organization",
+        "name": "SaaSTools",
+        "url": slot("site_url")
+    },
+    "publisher": {
+        "@type": "Organization",
+        "name": "SaaSTools",
+        "url": slot("site_url"),
+        "logo": {
+            "@type": "ImageObject",
+            "url": slot("logo_url"),
+            "width": 96,
+            "height": 96
+        }
+    },
+    "mainEntityOfPage": {
+        "@type": "WebPage",
+        "@id": slot("article_url")
+    }
+})
+
+_TOOL_SCHEMA = json_ld({
+    "@context": "https://schema.org",
+    "@type": ["SoftwareApplication", "WebApplication"],
+    "name": slot("title"),
+    "description": slot("meta_desc"),
+    "url": slot("tool_url"),
+    "applicationCategory": "BusinessApplication",
+    "operatingSystem": "Any",
+    "offers": {
+        "@type": "Offer",
+        "price": "0",
+        "priceCurrency": "USD"
+    },
+    "provider": {
+        "@type": "Organization",
+        "name": "SaaSTools",
+        "url": slot("site_url")
+    }
+})
 
-    article_schema = (
-        '\n  <script type="application/ld+json">\n  '
-        + _json.dumps({
-            "@context": "https://schema.org",
-            "@type": "Article",
-            "headline": title,
-            "description": meta_desc,
-            "datePublished": date_str,
-            "dateModified": date_str,
-            "url": article_url,
-            "image": {
-                "@type": "ImageObject",
-                "url": f"{site_url}/og/{slug}.png",
-                "width": 1200,
-                "height": 630
-            },
-            "author": {
-                "@type": "Organization",
-                "name": "SaaSTools",
-                "url": site_url
-            },
-            "publisher": {
-                "@type": "Organization",
-                "name": "SaaSTools",
-                "url": site_url,
-                "logo": {
-                    "@type": "ImageObject",
-                    "url": f"{site_url}/favicon/favicon-96x96.png",
-                    "width": 96,
-                    "height": 96
-                }
-            },
-            "mainEntityOfPage": {
-                "@type": "WebPage",
-                "@id": article_url
-            }
-        }, ensure_ascii=False, indent=2).replace('\n', '\n  ')
-        + '\n  </script>'
-    )
+_FAQ_SCHEMA = Template(json_ld({
+    "@context": "https://schema.org",
+    "@type": "FAQPage",
+    "mainEntity": slot("faq")
+}), name="faq_schema", minify=minify.html)
 
-    return f"""<!DOCTYPE html>
+_ARTICLE_PAGE = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{title} — SaaS Tools for Bootstrapped Founders</title>
-  <meta name="description" content="{meta_desc}">
-  {kw_meta}
-  {cluster_meta}
-  <meta property="og:title" content="{title}">
-  <meta property="og:url" content="{article_url}">
+  <meta name="template-version" content="{{version}}">
+  <title>{{title}} — SaaS Tools for Bootstrapped Founders</title>
+  <meta name="description" content="{{meta_desc}}">
+  {{kw_meta}}
+  {{cluster_meta}}
+  <meta property="og:title" content="{{title}}">
+  <meta property="og:url" content="{{article_url}}">
   <meta property="og:type" content="article">
-  <meta property="og:image" content="{site_url}/og/{slug}.png">
+  <meta property="og:image" content="{{site_url}}/og/{{slug}}.png">
   <meta property="og:image:width" content="1200">
   <meta property="og:image:height" content="630">
   <meta property="og:site_name" content="SaaS Tools for Bootstrapped Founders">
   <meta name="twitter:card" content="summary_large_image">
-  <meta name="twitter:title" content="{title}">
-  <meta name="twitter:image" content="{site_url}/og/{slug}.png">
-  <link rel="canonical" href="{article_url}">
+  <meta name="twitter:title" content="{{title}}">
+  <meta name="twitter:image" content="{{site_url}}/og/{{slug}}.png">
+  <link rel="canonical" href="{{article_url}}">
   
   <link rel="icon" type="image/png" href="/favicon/favicon-96x96.png" sizes="96x96" />
   <link rel="icon" type="image/svg+xml" href="/favicon/favicon.svg" />
@@ -928,22 +1335,12 @@ def _build_article_html(fm: dict, body_html: str,
   <link rel="apple-touch-icon" sizes="180x180" href="/favicon/apple-touch-icon.png" />
   <link rel="manifest" href="/favicon/site.webmanifest" />
 
-  {_FONT}
-  {_RSS_LINK}
-  <style>
-{_BASE_CSS}
-{_NAV_CSS}
-{_ARTICLE_CSS}
-{_RELATED_CSS}
-{_FOOTER_CSS}
-
-    /* ── FOOTER: override global margin-top for article page ── */
-    footer {{ margin-top: 0; }}
-  </style>
-  <style>
-{_EMAIL_CAPTURE_CSS}
-  </style>
-  {_ANALYTICS}{article_schema}
+  {{font}}
+  {{rss_link}}
+  {{article_critical_css}}
+  {{site_css}}
+  {{article_css}}
+  {{analytics}}{{article_schema}}
 </head>
 <body>
 
@@ -959,7 +1356,7 @@ def _build_article_html(fm: dict, body_html: str,
 <main class="article-wrap">
 
   <header class="article-header">
-    <h1 class="article-header__title">{title}</h1>
+    <h1 class="article-header__title">{{title}}</h1>
     <div class="article-header__meta">
       <span>
         <svg width="13" height="13" viewBox="0 0 24 24" fill="none"
@@ -970,7 +1367,7 @@ def _build_article_html(fm: dict, body_html: str,
           <line x1="8" y1="2" x2="8" y2="6"/>
           <line x1="3" y1="10" x2="21" y2="10"/>
         </svg>
-        {display_date}
+        {{display_date}}
       </span>
       <span class="article-header__meta-sep">·</span>
       <span>
@@ -980,17 +1377,17 @@ def _build_article_html(fm: dict, body_html: str,
           <circle cx="12" cy="12" r="10"/>
           <polyline points="12 6 12 12 16 14"/>
         </svg>
-        {read_time} min read
+        {{read_time}} min read
       </span>
-      {kw_badge}
+      {{kw_badge}}
     </div>
   </header>
 
   <article class="article-body">
-    {body_html}
+    {{body_html}}
   </article>
 
-  {email_capture}
+  {{email_capture}}
 
   <div id="related-content" class="related-content"></div>
 
@@ -998,12 +1395,12 @@ def _build_article_html(fm: dict, body_html: str,
     <div class="share-label">Share this article</div>
     <div class="share-buttons">
       <a class="share-btn x-btn"
-         href="https://twitter.com/intent/tweet?text={title.replace(' ', '%20')}&url={article_url}"
+         href="https://twitter.com/intent/tweet?text={{share_title}}&url={{article_url}}"
          target="_blank" rel="noopener">
         𝕏 Post on X
       </a>
       <a class="share-btn li-btn"
-         href="https://www.linkedin.com/sharing/share-offsite/?url={article_url}"
+         href="https://www.linkedin.com/sharing/share-offsite/?url={{article_url}}"
          target="_blank" rel="noopener">
         in Share
       </a>
@@ -1039,67 +1436,107 @@ def _build_article_html(fm: dict, body_html: str,
 
 </main>
 
-{_FOOTER_HTML}
+{{footer_html}}
 
 <script>
-  function copyLink() {{
-    navigator.clipboard.writeText("{article_url}").then(function() {{
+  function copyLink() {
+    navigator.clipboard.writeText("{{article_url}}").then(function() {
       var btn = document.getElementById("copy-btn");
       btn.textContent = "✓ Copied!";
       btn.classList.add("copied");
-      setTimeout(function() {{
+      setTimeout(function() {
         btn.textContent = "🔗 Copy link";
         btn.classList.remove("copied");
-      }}, 2000);
-    }});
-  }}
+      }, 2000);
+    });
+  }
 </script>
 
-{_RELATED_JS}
-{_FUTURE_LINK_JS}
-{_AFFILIATE_TRACKER_JS}
+{{related_js}}
+{{future_link_js}}
+{{affiliate_tracker_js}}
 
 </body>
-</html>"""
-
+</html>""",
+    name="article", minify=minify.html, article_schema=_ARTICLE_SCHEMA, **_STATIC_PARTS)
 
-# ─────────────────────────────────────────────
-# MANUAL CONTENT WRAPPING
-# ─────────────────────────────────────────────
 
-def wrap_article_html(body_html: str, slug: str) -> str:
-    """
-    Bungkus body artikel ke full HTML page.
+def _build_article_html(fm: dict, body_html: str,
+                        slug: str, date_str: str,
+                        cluster_id: str = "") -> str:
     """
-    # Ekstrak cluster_id (BULLETPROOF REGEX)
-    cluster_match = re.search(
-        r'<meta\s+name=["\']cluster["\']\s+content=(["\'])(.*?)\1',
-        body_html, re.IGNORECASE | re.DOTALL
-    )
-    cluster_id = cluster_match.group(2).strip() if cluster_match else ""
-    # Strip meta cluster dengan aman
-    body_html = re.sub(r'<meta[^>]*name=["\']cluster["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
+    Bungkus article body HTML ke dalam full HTML page.
+    """
+    site_url    = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
+    title       = fm.get("title", slug.replace("-", " ").title())
+    keyword     = fm.get("primary_keyword", "")
+    article_url = f"{site_url}/articles/{slug}"
+    read_time   = _reading_time(body_html)
+
+    try:
+        dt = datetime.strptime(date_str, "%Y-%m-%d")
+        display_date = dt.strftime("%B %-d, %Y")
+    except Exception:
+        display_date = date_str
 
-    # Ekstrak meta description
-    desc_match = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=(["\'])(.*?)\1',
-        body_html, re.IGNORECASE | re.DOTALL
+    kw_meta      = f'<meta name="keywords" content="{keyword}">' if keyword else ""
+    cluster_meta = f'<meta name="cluster" content="{cluster_id}">' if cluster_id else ""
+    meta_desc    = fm.get("meta_desc", title)
+
+    kw_badge = (
+        f'<span class="article-header__meta-sep">·</span>'
+        f'<span class="kw-badge">{keyword}</span>'
+    ) if keyword else ""
+
+    return _ARTICLE_PAGE.render(
+        title        = title,
+        meta_desc    = meta_desc,
+        kw_meta      = kw_meta,
+        cluster_meta = cluster_meta,
+        article_url  = article_url,
+        site_url     = site_url,
+        slug         = slug,
+        date         = date_str,
+        display_date = display_date,
+        og_image     = f"{site_url}/og/{slug}.png",
+        logo_url     = f"{site_url}/favicon/favicon-96x96.png",
+        read_time    = str(read_time),
+        kw_badge     = kw_badge,
+        share_title  = title.replace(" ", "%20"),
+        body_html    = minify_body(body_html, slug),
+        version      = TEMPLATE_VERSION["articles"],
     )
-    meta_desc = desc_match.group(2).strip() if desc_match else ""
-    body_html = re.sub(r'<meta[^>]*name=["\']description["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
 
-    date_str = datetime.utcnow().strftime("%Y-%m-%d")
 
-    h1_match = re.search(r'<h1[^>]*>(.*?)</h1>',
-                         body_html, re.IGNORECASE | re.DOTALL)
-    title = (h1_match.group(1).strip()
-             if h1_match
-             else slug.replace("-", " ").title())
+# ─────────────────────────────────────────────
+# MANUAL CONTENT WRAPPING
+# ─────────────────────────────────────────────
 
-    # Strip h1 dari body — judul sudah dirender di page header
-    if h1_match:
-        body_html = (body_html[:h1_match.start()]
-                     + body_html[h1_match.end():]).lstrip("\n")
+def wrap_article_html(body_html: str, slug: str, index: dict | None = None,
+                      date: str | None = None) -> str:
+    """
+    Bungkus body artikel ke full HTML page.
+    index (content index) → related content & future link di-resolve saat build.
+    date (YYYY-MM-DD): tanggal publish asli saat re-render (default: hari ini).
+    """
+    # Satu kali parse: cluster, description, h1, jumlah kata (html_meta)
+    meta       = html_meta.extract(body_html)
+    cluster_id = meta.cluster
+    meta_desc  = html_meta.escape_attr(meta.description)
+
+    # Strip h1 dari body — judul sudah dirender di page header.
+    # Offset h1_span berlaku untuk body asli, jadi dipotong sebelum strip meta.
+    if meta.h1_span:
+        start, end = meta.h1_span
+        body_html  = body_html[:start] + body_html[end:]
+
+    # Strip meta cluster & description dengan aman
+    body_html = re.sub(r'<meta[^>]*name=["\']cluster["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
+    body_html = re.sub(r'<meta[^>]*name=["\']description["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
+    if meta.h1_span:
+        body_html = body_html.lstrip("\n")
+
+    date_str = date or clock.utcnow().strftime("%Y-%m-%d")
 
     # Postprocess: patch formula highlight div
     body_html = re.sub(
@@ -1111,8 +1548,8 @@ def wrap_article_html(body_html: str, slug: str) -> str:
         body_html
     )
 
-    title_clean = re.sub(r'<[^>]+>', '', title).strip()
-    word_count  = len(re.sub(r'<[^>]+>', '', body_html).split())
+    title_clean = html_meta.escape_attr(meta.h1 or slug.replace("-", " ").title())
+    word_count  = meta.word_count - len(meta.h1.split())
 
     if not meta_desc:
         meta_desc = title_clean
@@ -1127,118 +1564,28 @@ def wrap_article_html(body_html: str, slug: str) -> str:
         "word_count":      word_count
     }
 
-    return _build_article_html(fm, body_html, slug, date_str, cluster_id)
-
+    page = _build_article_html(fm, body_html, slug, date_str, cluster_id)
+    return related.link(page, index, slug) if index is not None else page
 
-def wrap_tool_html(body_html: str, slug: str) -> str:
-    """
-    Bungkus body tool/kalkulator ke full HTML page.
-    """
-    _has_chart = '<canvas' in body_html
-    
-    cluster_match = re.search(
-        r'<meta\s+name=["\']cluster["\']\s+content=(["\'])(.*?)\1',
-        body_html, re.IGNORECASE | re.DOTALL
-    )
-    cluster_id = cluster_match.group(2).strip() if cluster_match else ""
-    body_html = re.sub(r'<meta[^>]*name=["\']cluster["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
-
-    desc_match = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=(["\'])(.*?)\1',
-        body_html, re.IGNORECASE | re.DOTALL
-    )
-    meta_desc = desc_match.group(2).strip() if desc_match else ""
-    body_html = re.sub(r'<meta[^>]*name=["\']description["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
-
-    site_url     = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
-    tool_url     = f"{site_url}/tools/{slug}"
-    cluster_meta = f'<meta name="cluster" content="{cluster_id}">' if cluster_id else ""
-
-    h1_match = re.search(r'<h1[^>]*>(.*?)</h1>',
-                         body_html, re.IGNORECASE | re.DOTALL)
-    title = (h1_match.group(1).strip()
-             if h1_match
-             else slug.replace("-", " ").title())
-    title_clean = re.sub(r'<[^>]+>', '', title).strip()
-
-    if not meta_desc:
-        meta_desc = f"{title_clean}. Free calculator for bootstrapped SaaS founders."
-
-    chartjs_script = _CHARTJS_CDN if _has_chart else ""
-
-    # ── JSON-LD Schemas ───────────────────────────────────────────────────────
-    # 1. SoftwareApplication — selalu di-inject untuk semua tool
-    tool_schema = (
-        '\n  <script type="application/ld+json">\n  '
-        + _json.dumps({
-            "@context": "https://schema.org",
-            "@type": ["SoftwareApplication", "WebApplication"],
-            "name": title_clean,
-            "description": meta_desc,
-            "url": tool_url,
-            "applicationCategory": "BusinessApplication",
-            "operatingSystem": "Any",
-            "offers": {
-                "@type": "Offer",
-                "price": "0",
-                "priceCurrency": "USD"
-            },
-            "provider": {
-                "@type": "Organization",
-                "name": "SaaSTools",
-                "url": site_url
-            }
-        }, ensure_ascii=False, indent=2).replace('\n', '\n  ')
-        + '\n  </script>'
-    )
 
-    # 2. FAQPage — hanya jika tool punya FAQ section
-    faq_schema = ""
-    faq_pairs = re.findall(
-        r'<summary[^>]*>(.*?)</summary>.*?<div[^>]*class=["\']faq-answer["\'][^>]*>(.*?)</div>',
-        body_html, re.IGNORECASE | re.DOTALL
-    )
-    if faq_pairs:
-        qa_list = []
-        for q, a in faq_pairs:
-            q_clean = re.sub(r'<[^>]+>', '', q).strip()
-            a_clean = re.sub(r'<[^>]+>', '', a).strip()
-            a_clean = re.sub(r'\s+', ' ', a_clean)
-            if q_clean and a_clean:
-                qa_list.append({
-                    "@type": "Question",
-                    "name": q_clean,
-                    "acceptedAnswer": {"@type": "Answer", "text": a_clean}
-                })
-        if qa_list:
-            faq_schema = (
-                '\n  <script type="application/ld+json">\n  '
-                + _json.dumps({
-                    "@context": "https://schema.org",
-                    "@type": "FAQPage",
-                    "mainEntity": qa_list
-                }, ensure_ascii=False, indent=2).replace('\n', '\n  ')
-                + '\n  </script>'
-            )
-
-    all_schemas = tool_schema + faq_schema
-    return f"""<!DOCTYPE html>
+_TOOL_PAGE = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{title_clean} — SaaS Tools for Bootstrapped Founders</title>
-  <meta name="description" content="{meta_desc}">
-  {cluster_meta}
-  <meta property="og:title" content="{title_clean}">
-  <meta property="og:url" content="{tool_url}">
+  <meta name="template-version" content="{{version}}">
+  <title>{{title}} — SaaS Tools for Bootstrapped Founders</title>
+  <meta name="description" content="{{meta_desc}}">
+  {{cluster_meta}}
+  <meta property="og:title" content="{{title}}">
+  <meta property="og:url" content="{{tool_url}}">
   <meta property="og:type" content="website">
-  <meta property="og:description" content="{meta_desc}">
+  <meta property="og:description" content="{{meta_desc}}">
   <meta property="og:site_name" content="SaaS Tools for Bootstrapped Founders">
   <meta name="twitter:card" content="summary">
-  <meta name="twitter:title" content="{title_clean}">
-  <meta name="twitter:description" content="{meta_desc}">
-  <link rel="canonical" href="{tool_url}">
+  <meta name="twitter:title" content="{{title}}">
+  <meta name="twitter:description" content="{{meta_desc}}">
+  <link rel="canonical" href="{{tool_url}}">
   
   <link rel="icon" type="image/png" href="/favicon/favicon-96x96.png" sizes="96x96" />
   <link rel="icon" type="image/svg+xml" href="/favicon/favicon.svg" />
@@ -1246,345 +1593,13 @@ def wrap_tool_html(body_html: str, slug: str) -> str:
   <link rel="apple-touch-icon" sizes="180x180" href="/favicon/apple-touch-icon.png" />
   <link rel="manifest" href="/favicon/site.webmanifest" />
 
-  {_FONT}
-  {chartjs_script}
-  {_RSS_LINK}
-  <style>
-{_BASE_CSS}
-{_NAV_CSS}
-{_ARTICLE_CSS}
-
-    /* ── LAYOUT ── */
-    .container {{ max-width: 680px; margin: 0 auto; padding: 48px 24px 80px; }}
-
-    /* ── TYPOGRAPHY ── */
-    h1 {{
-      font-size: clamp(1.75rem, 4vw, 2.25rem);
-      font-weight: 700;
-      letter-spacing: -.03em;
-      color: var(--text);
-      margin-bottom: 8px;
-    }}
-    .subtitle {{
-      color: var(--muted);
-      font-size: 1.0625rem;
-      margin-bottom: 40px;
-      line-height: 1.6;
-    }}
-
-    /* ── CARD ── */
-    .card {{
-      background: var(--surface);
-      border: 1px solid var(--border);
-      border-radius: var(--r);
-      padding: 32px;
-      margin-bottom: 24px;
-    }}
-    .card h2 {{
-      font-size: .875rem;
-      font-weight: 600;
-      color: var(--text);
-      text-transform: uppercase;
-      letter-spacing: .05em;
-      margin-bottom: 24px;
-      border-bottom: 2px solid var(--text);
-      padding-bottom: 8px;
-    }}
-
-    /* ── CARD HR separator ── */
-    .card hr {{
-      border: none;
-      border-top: 1px solid var(--border);
-      margin: 24px 0;
-    }}
-
-    /* ── INPUTS (UTILITARIAN BRUTALISM) ── */
-    .input-group {{ margin-bottom: 20px; }}
-    .input-group:last-child {{ margin-bottom: 0; }}
-    label {{
-      display: block;
-      font-size: .875rem;
-      font-weight: 600;
-      color: var(--text);
-      margin-bottom: 8px;
-    }}
-    .input-wrapper {{ position: relative; }}
-    .input-prefix {{
-      position: absolute;
-      left: 14px;
-      top: 50%;
-      transform: translateY(-50%);
-      color: var(--muted);
-      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-      font-size: 1rem;
-      pointer-events: none;
-      font-weight: 500;
-    }}
-    input[type="number"] {{
-      width: 100%;
-      padding: 12px 14px 12px 32px;
-      border: 1px solid var(--border);
-      border-radius: var(--r);
-      font-size: 16px !important; /* CRITICAL: Mencegah iOS Auto-Zoom */
-      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-      color: var(--text);
-      background: var(--bg);
-      transition: border-color .15s, outline .15s;
-      -moz-appearance: textfield;
-    }}
-    input[type="number"]::-webkit-outer-spin-button,
-    input[type="number"]::-webkit-inner-spin-button {{ -webkit-appearance: none; }}
-    input[type="number"]:focus {{
-      outline: 2px solid var(--accent);
-      outline-offset: -1px;
-      border-color: var(--accent);
-      background: var(--surface);
-    }}
-    input[type="number"].error-input {{ border-color: var(--danger); }}
-    .error-msg {{
-      color: var(--danger);
-      font-size: .8125rem;
-      margin-top: 6px;
-      display: none;
-    }}
-
-    /* ── SELECT, CHECKBOX, RADIO, RANGE ── */
-    select {{
-      width: 100%;
-      padding: 12px 14px;
-      border: 1px solid var(--border);
-      border-radius: var(--r);
-      font-size: 16px;
-      font-family: 'DM Sans', -apple-system, BlinkMacSystemFont, sans-serif;
-      color: var(--text);
-      background: var(--bg);
-      cursor: pointer;
-      transition: border-color .15s, outline .15s;
-    }}
-    select:focus {{
-      outline: 2px solid var(--accent);
-      outline-offset: -1px;
-      border-color: var(--accent);
-      background-color: var(--surface);
-    }}
-    select.error-input {{ border-color: var(--danger); }}
-    .checkbox-group {{
-      display: flex;
-      align-items: center;
-      gap: 12px;
-      padding: 10px 0;
-      min-height: 44px;
-      cursor: pointer;
-    }}
-    .checkbox-group label {{
-      font-size: .9375rem;
-      font-weight: 400;
-      color: var(--text);
-      margin-bottom: 0;
-      cursor: pointer;
-    }}
-    input[type="checkbox"],
-    input[type="radio"] {{
-      width: 20px;
-      height: 20px;
-      flex-shrink: 0;
-      accent-color: var(--accent);
-      cursor: pointer;
-    }}
-    input[type="range"] {{
-      width: 100%;
-      accent-color: var(--accent);
-      height: 6px;
-      cursor: pointer;
-      padding: 0;
-    }}
-
-    /* ── RESULT (HIGH CONTRAST) ── */
-    .result-card {{
-      background: var(--surface);
-      border: 2px solid var(--text);
-      border-radius: var(--r);
-      padding: 32px;
-      margin-bottom: 24px;
-    }}
-    .result-label {{
-      font-size: .8125rem;
-      font-weight: 600;
-      color: var(--muted);
-      text-transform: uppercase;
-      letter-spacing: .06em;
-      margin-bottom: 8px;
-    }}
-    .result-number {{
-      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-      font-size: clamp(1.75rem, 6vw, 4rem);
-      font-weight: 700;
-      color: var(--text);
-      line-height: 1;
-      letter-spacing: -.05em;
-      margin-bottom: 8px;
-      overflow-wrap: break-word;
-      word-break: break-all;
-    }}
-    .result-unit {{
-      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-      font-size: 1rem;
-      color: var(--muted);
-      margin-bottom: 24px;
-    }}
-    .interpretation {{
-      background: var(--bg);
-      border: 1px solid var(--border);
-      border-left: 4px solid var(--text);
-      border-radius: 0 var(--r) var(--r) 0;
-      padding: 16px 20px;
-      font-size: 0.9375rem;
-      color: var(--text);
-      line-height: 1.6;
-    }}
-    .interpretation.danger {{ border-color: var(--danger); background: var(--danger-bg); }}
-    .interpretation.warning {{ border-color: var(--warning); background: var(--warning-bg); }}
-    .interpretation.healthy {{ border-color: var(--success); background: var(--success-bg); }}
-    .secondary-result {{
-      margin-top: 16px;
-      font-size: .875rem;
-      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-      color: var(--muted);
-    }}
-
-    /* ── RESULT ROW (multi-result separator) ── */
-    .result-row {{
-      padding-bottom: 20px;
-      margin-bottom: 20px;
-      border-bottom: 1px solid var(--border);
-    }}
-    .result-row:last-child {{
-      padding-bottom: 0;
-      margin-bottom: 0;
-      border-bottom: none;
-    }}
-
-    /* ── FORMULA BOX ── */
-    .formula-box {{
-      background: var(--bg);
-      border: 1px solid var(--border);
-      border-radius: var(--r);
-      padding: 24px;
-      margin-bottom: 24px;
-    }}
-    .formula-box h3 {{
-      font-size: .75rem;
-      font-weight: 600;
-      color: var(--text);
-      text-transform: uppercase;
-      letter-spacing: .06em;
-      margin-bottom: 12px;
-    }}
-    .formula-box p {{
-      font-size: 0.875rem;
-      color: var(--text);
-      line-height: 1.7;
-      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-    }}
-    .formula-box ul, .formula-box ol {{
-      margin: 10px 0;
-      padding-left: 20px;
-    }}
-    .formula-box li {{
-      margin-bottom: 8px;
-      font-size: 0.875rem;
-      color: var(--text);
-      line-height: 1.6;
-      font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-    }}
-    .formula-box li code {{
-      background: #f4f4f5;
-      border: 1px solid var(--border);
-      color: var(--text);
-      padding: 0.15em 0.4em;
-      border-radius: 3px;
-      font-size: 0.85em;
-    }}
-
-    /* ── AFFILIATE BOX ── */
-    .affiliate-box {{
-      background: var(--surface);
-      border: 1px solid var(--border);
-      border-left: 4px solid var(--success);
-      border-radius: 0 var(--r) var(--r) 0;
-      padding: 20px 24px;
-      margin-bottom: 24px;
-      font-size: 0.9375rem;
-      color: var(--text);
-      line-height: 1.6;
-    }}
-    .affiliate-box a {{
-      color: var(--success);
-      font-weight: 600;
-      text-decoration: underline;
-      text-decoration-color: rgba(16,185,129,.4);
-    }}
-    .affiliate-box a:hover {{ color: #059669; text-decoration-color: #059669; }}
-
-    /* ── RELATED LINK ── */
-    .related-link {{ font-size: .9375rem; color: var(--muted); padding: 16px 0; }}
-    .related-link a {{ color: var(--accent); text-decoration: underline; font-weight: 500; }}
-    .related-link a:hover {{ color: var(--accent-h); }}
-
-    /* ── FAQ ── */
-    .faq {{ margin-top: 48px; }}
-    .faq h3 {{
-      font-size: 1.25rem; font-weight: 700; color: var(--text);
-      letter-spacing: -.02em; margin-bottom: 20px;
-      border-bottom: 2px solid var(--text); padding-bottom: 8px;
-    }}
-    .faq details {{
-      border: 1px solid var(--border);
-      border-radius: var(--r);
-      margin-bottom: 12px;
-      background: var(--surface);
-    }}
-    .faq summary {{
-      padding: 16px 20px; font-size: 1rem; font-weight: 600; color: var(--text);
-      cursor: pointer; list-style: none; display: flex;
-      justify-content: space-between; align-items: center;
-      min-height: 44px;
-    }}
-    .faq summary::-webkit-details-marker {{ display: none; }}
-    .faq summary::after {{
-      content: '+'; font-size: 1.2rem; color: var(--muted);
-      font-weight: 300; flex-shrink: 0; margin-left: 16px; font-family: monospace;
-    }}
-    .faq details[open] > summary::after {{ content: '−'; }}
-    .faq details[open] > summary {{ border-bottom: 1px solid var(--border); background: var(--bg); }}
-    .faq .faq-answer {{
-      padding: 20px; font-size: 0.9375rem; color: var(--muted);
-      line-height: 1.7; background: var(--surface);
-    }}
-
-    /* ── ARTICLE BODY di dalam tool: top spacing & separator ── */
-    .container > .article-body {{
-      margin-top: 48px;
-      padding-top: 48px;
-      border-top: 1px solid var(--border);
-    }}
-
-    /* ── Override article-body h2 untuk tool: lebih compact ── */
-    .container .article-body h2 {{
-      margin: 40px 0 20px;
-    }}
-
-{_CHART_CSS}
-{_DECISION_TREE_CSS}
-{_RELATED_CSS}
-{_FOOTER_CSS}
-
-    @media (max-width: 640px) {{
-      .container {{ padding: 32px 16px 64px; }}
-      .card, .result-card, .formula-box, .affiliate-box {{ padding: 20px; }}
-    }}
-  </style>
-  {_ANALYTICS}{all_schemas}
+  {{font}}
+  {{chartjs_script}}
+  {{rss_link}}
+  {{tool_critical_css}}
+  {{site_css}}
+  {{tool_css}}
+  {{analytics}}{{tool_schema}}{{faq_schema}}
 </head>
 <body>
 
@@ -1599,14 +1614,84 @@ def wrap_tool_html(body_html: str, slug: str) -> str:
 </nav>
 
 <div class="container">
-{body_html}
+{{body_html}}
 <div id="related-content" class="related-content"></div>
 </div>
 
-{_FOOTER_HTML}
-{_RELATED_JS}
-{_FUTURE_LINK_JS}
-{_AFFILIATE_TRACKER_JS}
+{{footer_html}}
+{{related_js}}
+{{future_link_js}}
+{{affiliate_tracker_js}}
 
 </body>
-</html>"""
+</html>""",
+    name="tool", minify=minify.html, tool_schema=_TOOL_SCHEMA, **_STATIC_PARTS)
+
+
+# ── Versi template ───────────────────────────────────────────────────────────
+# Dicatat di <meta name="template-version"> setiap halaman; rerender.py
+# me-render ulang halaman yang versinya berbeda. digest template sudah
+# mencakup markup, CSS (href asset ber-hash) dan script statis; naikkan
+# RENDER_REVISION jika logika wrap_*_html / minify berubah tanpa mengubah
+# sumber template.
+RENDER_REVISION = 2
+
+
+def _version(*templates: Template) -> str:
+    parts = [str(RENDER_REVISION), "min" if minify.MINIFY else "raw"]
+    parts.extend(t.digest for t in templates)
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+TEMPLATE_VERSION = {
+    "articles": _version(_ARTICLE_PAGE),
+    "tools":    _version(_TOOL_PAGE, _FAQ_SCHEMA),
+}
+
+
+def wrap_tool_html(body_html: str, slug: str, index: dict | None = None) -> str:
+    """
+    Bungkus body tool/kalkulator ke full HTML page.
+    index (content index) → related content & future link di-resolve saat build.
+    """
+    meta       = html_meta.extract(body_html)
+    _has_chart = meta.has_canvas
+
+    cluster_id = meta.cluster
+    meta_desc  = html_meta.escape_attr(meta.description)
+    body_html  = re.sub(r'<meta[^>]*name=["\']cluster["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
+    body_html  = re.sub(r'<meta[^>]*name=["\']description["\'][^>]*>\n?', '', body_html, flags=re.IGNORECASE)
+
+    site_url     = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
+    tool_url     = f"{site_url}/tools/{slug}"
+    cluster_meta = f'<meta name="cluster" content="{cluster_id}">' if cluster_id else ""
+
+    title_clean = html_meta.escape_attr(meta.h1 or slug.replace("-", " ").title())
+
+    if not meta_desc:
+        meta_desc = f"{title_clean}. Free calculator for bootstrapped SaaS founders."
+
+    chartjs_script = _CHARTJS_CDN if _has_chart else ""
+
+    # FAQPage JSON-LD — hanya jika tool punya FAQ section
+    faq_schema = _FAQ_SCHEMA.render(faq=[
+        {
+            "@type": "Question",
+            "name": q,
+            "acceptedAnswer": {"@type": "Answer", "text": a}
+        }
+        for q, a in meta.faq
+    ]) if meta.faq else ""
+
+    page = _TOOL_PAGE.render(
+        title          = title_clean,
+        meta_desc      = meta_desc,
+        cluster_meta   = cluster_meta,
+        tool_url       = tool_url,
+        site_url       = site_url,
+        chartjs_script = chartjs_script,
+        faq_schema     = faq_schema,
+        body_html      = minify_body(body_html, slug),
+        version        = TEMPLATE_VERSION["tools"],
+    )
+    return related.link(page, index, slug) if index is not None else page
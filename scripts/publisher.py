@@ -1,24 +1,25 @@
 """
 publisher.py
 Publish file HTML ke branch output di repo ai-engine.
+
+publish_html / publish_binary menulis satu file per commit.
+PublishBatch mengumpulkan banyak file lalu memindahkan branch output dengan
+SATU commit (backend github: Git Data API tree + commit + update ref), sehingga
+publish bersifat atomik: semua file masuk, atau tidak ada sama sekali.
+Backend penyimpanan dipilih lewat STORAGE_BACKEND (lihat storage.py).
 """
 import os
-import json
-import base64
-import urllib.request
+
+import storage
 
 ENGINE_REPO   = os.environ.get("ENGINE_REPO", "")
 GITHUB_TOKEN  = os.environ.get("GITHUB_TOKEN", "")
 OUTPUT_BRANCH = "output"
-API_BASE      = "https://api.github.com"
 
 
-def _headers():
-    return {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept":        "application/vnd.github.v3+json",
-        "User-Agent":    "ai-engine"
-    }
+def output_store(repo: str = "", branch: str = OUTPUT_BRANCH):
+    """Backend storage untuk branch output."""
+    return storage.get(repo or ENGINE_REPO, branch, token=GITHUB_TOKEN)
 
 
 def publish_html(folder: str, filename: str, html: str) -> bool:
@@ -26,35 +27,7 @@ def publish_html(folder: str, filename: str, html: str) -> bool:
     Publish file HTML ke folder articles/ atau tools/ di branch output.
     Return True jika berhasil.
     """
-    path = f"{folder}/{filename}"
-    url  = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}"
-    sha  = None
-
-    try:
-        req = urllib.request.Request(
-            f"{url}?ref={OUTPUT_BRANCH}", headers=_headers()
-        )
-        with urllib.request.urlopen(req) as r:
-            sha = json.loads(r.read()).get("sha")
-    except Exception:
-        pass
-
-    payload = {
-        "message": f"[pipeline] Publish {folder}/{filename}",
-        "content": base64.b64encode(html.encode("utf-8")).decode("utf-8"),
-        "branch":  OUTPUT_BRANCH
-    }
-    if sha:
-        payload["sha"] = sha
-
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={**_headers(), "Content-Type": "application/json"},
-        method="PUT"
-    )
-    with urllib.request.urlopen(req) as r:
-        return r.status in (200, 201)
+    return publish_binary(folder, filename, html.encode("utf-8"))
 
 
 def publish_binary(folder: str, filename: str, data: bytes) -> bool:
@@ -63,32 +36,56 @@ def publish_binary(folder: str, filename: str, data: bytes) -> bool:
     Sama dengan publish_html tapi menerima bytes, bukan string.
     Return True jika berhasil.
     """
-    path = f"{folder}/{filename}"
-    url  = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}"
-    sha  = None
-
-    try:
-        req = urllib.request.Request(
-            f"{url}?ref={OUTPUT_BRANCH}", headers=_headers()
-        )
-        with urllib.request.urlopen(req) as r:
-            sha = json.loads(r.read()).get("sha")
-    except Exception:
-        pass
-
-    payload = {
-        "message": f"[pipeline] Publish {folder}/{filename}",
-        "content": base64.b64encode(data).decode("utf-8"),
-        "branch":  OUTPUT_BRANCH
-    }
-    if sha:
-        payload["sha"] = sha
-
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={**_headers(), "Content-Type": "application/json"},
-        method="PUT"
+    return output_store().write(
+        f"{folder}/{filename}", data, f"[pipeline] Publish {folder}/{filename}"
     )
-    with urllib.request.urlopen(req) as r:
-        return r.status in (200, 201)
+
+
+# ─────────────────────────────────────────────
+# ATOMIC MULTI-FILE PUBLISH
+# ─────────────────────────────────────────────
+
+class PublishBatch:
+    """
+    Kumpulkan file untuk branch output, lalu commit sekali.
+    Detail commit (retry saat ref bergeser, skip file yang tidak berubah)
+    ada di backend storage masing-masing.
+    """
+
+    def __init__(self, message: str, repo: str = "", branch: str = OUTPUT_BRANCH):
+        self.message  = message
+        self.repo     = repo or ENGINE_REPO
+        self.branch   = branch
+        self._files   = {}   # path → str (teks) atau bytes (binary)
+
+    def add(self, path: str, content) -> None:
+        """Tambah/timpa satu file di batch. content: str atau bytes."""
+        self._files[path] = content
+
+    def remove(self, path: str) -> None:
+        """Hapus file dari branch output di commit yang sama."""
+        self._files[path] = None
+
+    def add_html(self, folder: str, filename: str, html: str) -> None:
+        self.add(f"{folder}/{filename}", html)
+
+    def add_binary(self, folder: str, filename: str, data: bytes) -> None:
+        self.add(f"{folder}/{filename}", data)
+
+    @property
+    def paths(self) -> list:
+        return sorted(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def commit(self) -> str | None:
+        """
+        Commit semua file di batch sebagai satu commit.
+        Return sha commit baru (atau sha head jika tidak ada yang berubah),
+        atau None jika gagal / batch kosong.
+        """
+        if not self._files:
+            print("PublishBatch: tidak ada file, skip commit.")
+            return None
+        return output_store(self.repo, self.branch).commit(self._files, self.message)
@@ -0,0 +1,179 @@
+"""
+rate_limit.py
+Scheduler untuk semua call GitHub API (dipakai github_contents & storage).
+
+- Membaca X-RateLimit-Remaining / X-RateLimit-Reset dari setiap response.
+- Jika sisa kuota < GITHUB_RATE_LOW_WATER, request diberi jeda merata
+  sampai waktu reset (pacing) supaya kuota tidak habis di tengah batch.
+- 403/429 karena rate limit (primary atau secondary) di-retry: tunggu
+  Retry-After, atau sampai X-RateLimit-Reset, atau backoff eksponensial
+  dengan jitter. Error lain di-raise apa adanya.
+- GITHUB_CALL_BUDGET membatasi jumlah call per run (0 = tanpa batas);
+  melewati budget → BudgetExceeded. budget_left() bisa dipakai batch besar
+  untuk berhenti dengan rapi sebelum budget habis.
+"""
+import io
+import os
+import json
+import time
+import atexit
+import random
+import threading
+import urllib.error
+
+import http_client
+
+CALL_BUDGET = int(os.environ.get("GITHUB_CALL_BUDGET", 0))
+LOW_WATER   = int(os.environ.get("GITHUB_RATE_LOW_WATER", 50))
+MAX_WAIT    = float(os.environ.get("GITHUB_RATE_MAX_WAIT", 900))
+MAX_RETRIES = int(os.environ.get("GITHUB_RATE_RETRIES", 5))
+BASE_DELAY  = 1.0
+
+
+class BudgetExceeded(RuntimeError):
+    """Budget call GitHub per run sudah habis."""
+
+
+class RateLimiter:
+    def __init__(self, budget: int = 0, low_water: int = LOW_WATER,
+                 max_wait: float = MAX_WAIT, max_retries: int = MAX_RETRIES):
+        self.budget      = budget
+        self.low_water   = low_water
+        self.max_wait    = max_wait
+        self.max_retries = max_retries
+        self.remaining   = None   # dari header terakhir
+        self.reset_at    = None   # epoch detik
+        self.calls       = 0
+        self.retries     = 0
+        self.waited      = 0.0
+        self._lock       = threading.Lock()
+
+    # ── State ─────────────────────────────────────────────────────────────────
+
+    def budget_left(self) -> int | None:
+        """Sisa call dalam budget run ini (None = tanpa batas)."""
+        if not self.budget:
+            return None
+        with self._lock:
+            return max(self.budget - self.calls, 0)
+
+    def _observe(self, headers) -> None:
+        if headers is None:
+            return
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset     = headers.get("X-RateLimit-Reset")
+        with self._lock:
+            if remaining is not None and remaining.isdigit():
+                self.remaining = int(remaining)
+            if reset is not None and reset.isdigit():
+                self.reset_at = int(reset)
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.waited += seconds
+        time.sleep(seconds)
+
+    # ── Scheduling ────────────────────────────────────────────────────────────
+
+    def _pace_delay(self) -> float:
+        """Jeda sebelum request berikutnya berdasarkan sisa kuota."""
+        with self._lock:
+            remaining, reset_at = self.remaining, self.reset_at
+        if remaining is None or reset_at is None or remaining >= self.low_water:
+            return 0.0
+        until_reset = max(reset_at - time.time(), 0)
+        if remaining <= 0:
+            return until_reset + 1
+        return until_reset / (remaining + 1)
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.budget and self.calls >= self.budget:
+                raise BudgetExceeded(f"GitHub call budget habis ({self.budget} call)")
+            self.calls += 1
+        delay = self._pace_delay()
+        if delay > self.max_wait:
+            raise BudgetExceeded(f"rate limit GitHub baru reset dalam {delay:.0f}s "
+                                 f"(> GITHUB_RATE_MAX_WAIT={self.max_wait:.0f}s)")
+        if delay >= 1:
+            print(f"[rate_limit] sisa kuota {self.remaining}, jeda {delay:.1f}s")
+        self._sleep(delay)
+
+    def _limited_wait(self, e: urllib.error.HTTPError, body: bytes,
+                      attempt: int) -> float | None:
+        """Detik tunggu jika error ini rate limit, None jika bukan."""
+        if e.code not in (403, 429):
+            return None
+        headers     = e.headers or {}
+        retry_after = headers.get("Retry-After")
+        remaining   = headers.get("X-RateLimit-Remaining")
+        secondary   = b"secondary rate limit" in body.lower()
+        if not (e.code == 429 or retry_after or remaining == "0" or secondary
+                or b"rate limit" in body.lower()):
+            return None   # 403 biasa (token / permission) → bukan urusan scheduler
+
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        if remaining == "0" and self.reset_at:
+            return max(self.reset_at - time.time(), 0) + 1
+        # Secondary limit tanpa petunjuk: backoff eksponensial + jitter
+        return BASE_DELAY * (2 ** (attempt - 1)) * (1 + random.random())
+
+    def request(self, method: str, url: str, **kwargs) -> http_client.Response:
+        """Sama seperti http_client.request, tapi lewat scheduler."""
+        for attempt in range(1, self.max_retries + 2):
+            self._acquire()
+            try:
+                r = http_client.request(method, url, **kwargs)
+            except urllib.error.HTTPError as e:
+                self._observe(e.headers)
+                body = e.read()
+                wait = self._limited_wait(e, body, attempt)
+                if wait is None or attempt > self.max_retries or wait > self.max_wait:
+                    # body sudah dibaca → buat ulang supaya caller masih bisa e.read()
+                    raise urllib.error.HTTPError(e.url, e.code, e.msg, e.headers,
+                                                 io.BytesIO(body)) from None
+                with self._lock:
+                    self.retries += 1
+                print(f"[rate_limit] HTTP {e.code} rate limited, retry "
+                      f"{attempt}/{self.max_retries} dalam {wait:.1f}s")
+                self._sleep(wait)
+                continue
+            self._observe(r.headers)
+            return r
+        raise RuntimeError("unreachable")
+
+    def report(self) -> None:
+        if self.calls:
+            print(f"[rate_limit] calls={self.calls} retries={self.retries} "
+                  f"waited={self.waited:.1f}s remaining={self.remaining}")
+
+
+limiter = RateLimiter(CALL_BUDGET)
+atexit.register(limiter.report)
+
+
+# ── Helper setara http_client ────────────────────────────────────────────────
+
+def request(method: str, url: str, headers: dict | None = None,
+            body: bytes | str | None = None,
+            timeout: float | None = None) -> http_client.Response:
+    return limiter.request(method, url, headers=headers, body=body, timeout=timeout)
+
+
+def get_json(url: str, headers: dict | None = None, timeout: float | None = None):
+    return request("GET", url, headers=headers, timeout=timeout).json()
+
+
+def send_json(method: str, url: str, payload, headers: dict | None = None,
+              timeout: float | None = None) -> http_client.Response:
+    hdrs = {"Content-Type": "application/json"}
+    hdrs.update(headers or {})
+    return request(method, url, headers=hdrs,
+                   body=json.dumps(payload).encode("utf-8"), timeout=timeout)
+
+
+def budget_left() -> int | None:
+    return limiter.budget_left()
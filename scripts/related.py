@@ -0,0 +1,113 @@
+"""
+related.py
+Related content dan future link di-resolve saat build dari content index
+in-memory, menggantikan fetch('/content-index.json') di setiap page view.
+
+    page = related.link(page, index, slug)
+
+- <div id="related-content" class="related-content"> diisi markup statis
+  (artikel / tool satu cluster, urutan content index — sama persis dengan
+  hasil _RELATED_JS) dan diberi penanda data-built.
+- <strong data-future-link="/articles/x">teks</strong> yang targetnya
+  sudah ada di index menjadi <a href="/articles/x">teks</a>.
+
+link() idempoten dan bekerja di halaman hasil render maupun halaman yang
+sudah dipublish, jadi halaman lama bisa di-patch tanpa body sumbernya.
+Saat konten baru masuk, affected() menentukan halaman lama mana yang
+markup-nya berubah (cluster yang sama, atau future link ke slug baru).
+Script di browser hanya fetch jika penanda data-built tidak ada / masih ada
+future link yang belum live.
+"""
+import re
+
+MAX_ARTICLES = 3
+MAX_TOOLS    = 2
+URL_PREFIX   = {"articles": "/articles/", "tools": "/tools/"}
+
+_BLOCK   = re.compile(
+    r'<div id="related-content" class="related-content"(?: data-built)?>(.*?)</div>', re.S
+)
+_FUTURE  = re.compile(
+    r'<strong\b[^>]*?\bdata-future-link=(["\'])(.*?)\1[^>]*>(.*?)</strong>', re.S | re.I
+)
+_CLUSTER = re.compile(r'<meta name="cluster" content="([^"]*)"')
+_TAGS    = re.compile(r"<[^>]+>")
+
+
+def href(kind: str, slug: str) -> str:
+    return URL_PREFIX[kind] + slug
+
+
+def live_hrefs(index: dict) -> set:
+    return {href(kind, e["slug"]) for kind in URL_PREFIX for e in index.get(kind, [])}
+
+
+def related_for(index: dict, cluster: str, slug: str) -> tuple:
+    """(artikel, tool) satu cluster selain slug ini, dipotong MAX_*."""
+    if not cluster:
+        return (), ()
+
+    def pick(kind: str, limit: int) -> tuple:
+        return tuple(e for e in index.get(kind, [])
+                     if e.get("cluster") == cluster and e["slug"] != slug)[:limit]
+
+    return pick("articles", MAX_ARTICLES), pick("tools", MAX_TOOLS)
+
+
+def block(index: dict, cluster: str, slug: str) -> str:
+    """Isi #related-content. title di index sudah ter-escape (lihat run_pipeline)."""
+    articles, tools = related_for(index, cluster, slug)
+    out = []
+    for label, kind, entries in (("Articles", "articles", articles), ("Tools", "tools", tools)):
+        if entries:
+            out.append(f'<h3 class="related-heading">Related {label}</h3><ul class="related-list">')
+            out.extend(f'<li><a href="{href(kind, e["slug"])}">{e.get("title", "")}</a></li>'
+                       for e in entries)
+            out.append("</ul>")
+    return "".join(out)
+
+
+def pending(page: str) -> list:
+    """href future link yang belum live (masih <strong>), urut, tanpa duplikat."""
+    return sorted({m.group(2) for m in _FUTURE.finditer(page)})
+
+
+def link(page: str, index: dict, slug: str) -> str:
+    """Isi blok related + resolve future link dari index. Idempoten."""
+    m = _CLUSTER.search(page)
+    if m:
+        inner = block(index, m.group(1), slug)
+        page  = _BLOCK.sub(
+            lambda _: f'<div id="related-content" class="related-content" data-built>{inner}</div>',
+            page, count=1,
+        )
+
+    live = live_hrefs(index)
+    return _FUTURE.sub(
+        lambda f: (f'<a href="{f.group(2)}">{_TAGS.sub("", f.group(3))}</a>'
+                   if f.group(2) in live else f.group(0)),
+        page,
+    )
+
+
+def affected(before: dict, after: dict, new_slugs: set) -> list:
+    """
+    [(kind, slug)] halaman lama yang markup-nya berubah karena entri baru:
+    blok related di cluster yang sama, atau future link ke slug baru.
+    """
+    new_hrefs = live_hrefs(after) - live_hrefs(before)
+    clusters  = {e.get("cluster") for kind in URL_PREFIX for e in after.get(kind, [])
+                 if e["slug"] in new_slugs and e.get("cluster")}
+    pages = []
+    for kind in URL_PREFIX:
+        for e in after.get(kind, []):
+            slug = e["slug"]
+            if slug in new_slugs:
+                continue
+            cluster = e.get("cluster", "")
+            if (cluster in clusters
+                    and related_for(before, cluster, slug) != related_for(after, cluster, slug)):
+                pages.append((kind, slug))
+            elif new_hrefs & set(e.get("future_links", ())):
+                pages.append((kind, slug))
+    return pages
@@ -0,0 +1,233 @@
+"""
+replay.py
+Jalankan ulang run_pipeline + sitemap_gen secara deterministik di atas
+snapshot hasil capture: tanpa network, tanpa write ke GitHub, waktu dibekukan.
+Dipakai sebagai baseline performa dan untuk mengukur efek perubahan template /
+regex pada korpus nyata.
+
+    # Ambil snapshot ai-brain + branch output (read-only, butuh token)
+    python scripts/replay.py capture
+
+    # Render ulang; output dibandingkan dengan render sebelumnya
+    python scripts/replay.py run --date 2025-01-15 --task article --task calculator_tool
+
+Layout (default --dir .replay):
+  fixture/ai-brain/           snapshot repo ai-brain (staging, manifest, memory, ...)
+  fixture/ai-engine@output/   snapshot branch output (HTML, content index, ...)
+  fixture/replay.json         repo asal + waktu capture
+  work/                       salinan fixture untuk satu run (dibuat ulang setiap run)
+  render/                     branch output hasil render terakhir
+  render.diff                 unified diff render ini vs render sebelumnya
+  traces/                     trace span per script (tracing.py)
+
+Run memakai STORAGE_BACKEND=local di atas work/, FROZEN_NOW (clock.py) dan
+HTTP_OFFLINE=1 (http_client.py): call Worker / Facebook gagal cepat sebagai
+warning non-fatal, dan tidak ada request yang keluar. Fixture yang sama +
+tanggal yang sama → output byte-identik, jadi render.diff hanya berisi efek
+perubahan kode.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import difflib
+import argparse
+import subprocess
+from datetime import datetime
+
+import storage
+from loader    import BRAIN_REPO, BRAIN_PAT
+from publisher import ENGINE_REPO, GITHUB_TOKEN, OUTPUT_BRANCH
+
+REPLAY_DIR   = os.environ.get("REPLAY_DIR", ".replay")
+SCRIPTS_DIR  = os.path.dirname(os.path.abspath(__file__))
+DIFF_CONTEXT = 3
+
+
+def _fixture_name(repo: str, branch: str = "") -> str:
+    """Nama direktori repo/branch, sama dengan storage.local_dir."""
+    return os.path.basename(storage.local_dir(repo, branch))
+
+
+# ─────────────────────────────────────────────
+# CAPTURE
+# ─────────────────────────────────────────────
+
+def capture(replay_dir: str) -> None:
+    if storage.STORAGE_BACKEND != "github":
+        print("FATAL: capture membaca dari GitHub, jalankan dengan STORAGE_BACKEND=github")
+        sys.exit(1)
+    if not ENGINE_REPO:
+        print("FATAL: ENGINE_REPO tidak di-set")
+        sys.exit(1)
+
+    fixture = os.path.join(replay_dir, "fixture")
+    if os.path.isdir(fixture):
+        shutil.rmtree(fixture)
+
+    sources = [(BRAIN_REPO, "", BRAIN_PAT), (ENGINE_REPO, OUTPUT_BRANCH, GITHUB_TOKEN)]
+    for repo, branch, token in sources:
+        files = storage.snapshot(repo, branch, token=token).files()
+        root  = os.path.join(fixture, _fixture_name(repo, branch))
+        for path, data in files.items():
+            full = os.path.join(root, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "wb") as f:
+                f.write(data)
+        print(f"Captured {repo}{'@' + branch if branch else ''}: {len(files)} file → {root}")
+
+    with open(os.path.join(fixture, "replay.json"), "w") as f:
+        json.dump({
+            "brain_repo":  BRAIN_REPO,
+            "engine_repo": ENGINE_REPO,
+            "captured_at": datetime.utcnow().isoformat(),
+        }, f, indent=2)
+
+
+# ─────────────────────────────────────────────
+# RUN
+# ─────────────────────────────────────────────
+
+def _env(work: str, meta: dict, date: str, task_type: str = "") -> dict:
+    env = dict(os.environ)
+    for key in ("GITHUB_OUTPUT", "LOADER_SNAPSHOT", "WORKER_URL", "BRIEF_TOKEN"):
+        env.pop(key, None)
+    env.update({
+        "STORAGE_BACKEND": "local",
+        "STORAGE_ROOT":    work,
+        "BRAIN_REPO":      meta["brain_repo"],
+        "ENGINE_REPO":     meta["engine_repo"],
+        "FROZEN_NOW":      date,
+        "HTTP_OFFLINE":    "1",
+        "TIME_BUDGET":     "0",
+        "TRACE_DIR":       os.path.join(os.path.dirname(work), "traces"),
+    })
+    if task_type:
+        env["TASK_TYPE"] = task_type
+    return env
+
+
+def _run_script(label: str, argv: list, env: dict, ok_codes: tuple = (0,)) -> float:
+    started = time.monotonic()
+    r = subprocess.run([sys.executable, *argv], env=env)
+    elapsed = time.monotonic() - started
+    if r.returncode not in ok_codes:
+        print(f"FATAL: {label} gagal (exit {r.returncode})")
+        sys.exit(1)
+    print(f"[replay] {label}: {elapsed:.2f}s (exit {r.returncode})")
+    return elapsed
+
+
+def _read_tree(root: str) -> dict:
+    """{path relatif: bytes} semua file di bawah root."""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            full = os.path.join(dirpath, name)
+            with open(full, "rb") as f:
+                files[os.path.relpath(full, root).replace(os.sep, "/")] = f.read()
+    return files
+
+
+def diff_trees(old: dict, new: dict) -> tuple:
+    """(ringkasan {added, removed, changed, same}, teks unified diff)."""
+    summary = {"added": [], "removed": [], "changed": [], "same": 0}
+    chunks  = []
+    for path in sorted(set(old) | set(new)):
+        a, b = old.get(path), new.get(path)
+        if a == b:
+            summary["same"] += 1
+            continue
+        summary["added" if a is None else "removed" if b is None else "changed"].append(path)
+        try:
+            a_lines = (a or b"").decode("utf-8").splitlines(keepends=True)
+            b_lines = (b or b"").decode("utf-8").splitlines(keepends=True)
+        except UnicodeDecodeError:
+            chunks.append(f"Binary files a/{path} and b/{path} differ\n")
+            continue
+        chunks.extend(difflib.unified_diff(
+            a_lines, b_lines,
+            "/dev/null" if a is None else f"a/{path}",
+            "/dev/null" if b is None else f"b/{path}",
+            n=DIFF_CONTEXT,
+        ))
+    return summary, "".join(chunks)
+
+
+def run(replay_dir: str, date: str, tasks: list, max_items: int) -> dict:
+    fixture = os.path.join(replay_dir, "fixture")
+    try:
+        with open(os.path.join(fixture, "replay.json")) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        print(f"FATAL: fixture tidak ditemukan di {fixture}, jalankan 'replay.py capture' dulu")
+        sys.exit(1)
+
+    work = os.path.abspath(os.path.join(replay_dir, "work"))
+    if os.path.isdir(work):
+        shutil.rmtree(work)
+    shutil.copytree(fixture, work)
+
+    timings = {}
+    for task_type in tasks:
+        # exit 2 = STAGING_EMPTY, bukan error
+        timings[f"run_pipeline:{task_type}"] = _run_script(
+            f"run_pipeline {task_type}",
+            [os.path.join(SCRIPTS_DIR, "run_pipeline.py"), "--max-items", str(max_items)],
+            _env(work, meta, date, task_type), ok_codes=(0, 2),
+        )
+    timings["sitemap_gen"] = _run_script(
+        "sitemap_gen", [os.path.join(SCRIPTS_DIR, "sitemap_gen.py")], _env(work, meta, date)
+    )
+
+    output = os.path.join(work, _fixture_name(meta["engine_repo"], OUTPUT_BRANCH))
+    render = os.path.join(replay_dir, "render")
+    new    = _read_tree(output)
+    old    = _read_tree(render) if os.path.isdir(render) else None
+
+    if old is None:
+        print(f"[replay] render pertama: {len(new)} file, belum ada pembanding")
+    else:
+        summary, text = diff_trees(old, new)
+        diff_path = os.path.join(replay_dir, "render.diff")
+        with open(diff_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"[replay] vs render sebelumnya: {len(summary['added'])} ditambah, "
+              f"{len(summary['removed'])} dihapus, {len(summary['changed'])} berubah, "
+              f"{summary['same']} sama → {diff_path}")
+        for key in ("added", "removed", "changed"):
+            for path in summary[key][:20]:
+                print(f"  {key:<8} {path}")
+
+    if os.path.isdir(render):
+        shutil.rmtree(render)
+    shutil.copytree(output, render)
+    print(f"[replay] total {sum(timings.values()):.2f}s, trace di "
+          f"{os.path.join(replay_dir, 'traces')}")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay pipeline offline dari fixture")
+    parser.add_argument("--dir", default=REPLAY_DIR, help="direktori replay (default .replay)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("capture", help="snapshot ai-brain + branch output ke {dir}/fixture")
+    p_run = sub.add_parser("run", help="render ulang fixture, diff dengan render sebelumnya")
+    p_run.add_argument("--date", default="2025-01-01",
+                       help="waktu beku (ISO) untuk semua tanggal di output")
+    p_run.add_argument("--task", action="append", dest="tasks",
+                       help="TASK_TYPE run_pipeline, bisa diulang (default: article)")
+    p_run.add_argument("--max-items", type=int, default=1000,
+                       help="item manifest maksimal per task (default: semua)")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        capture(args.dir)
+    else:
+        run(args.dir, args.date, args.tasks or ["article"], args.max_items)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,12 @@ reporter.py
 Buat laporan harian tentang status staging dan publish log.
 """
 import os
-import json
 import smtplib
-import urllib.request
 from email.mime.text import MIMEText
 from datetime import datetime
 
+from loader import list_folder
+
 BRAIN_PAT     = os.environ.get("BRAIN_PAT", "")
 BRAIN_REPO    = os.environ.get("BRAIN_REPO", "")
 ENGINE_REPO   = os.environ.get("ENGINE_REPO", "")
@@ -19,27 +19,16 @@ SMTP_USER     = os.environ.get("BREVO_USERNAME", "")
 SMTP_PASS     = os.environ.get("BREVO_PASSWORD", "")
 FROM_EMAIL    = os.environ.get("BREVO_FROM_EMAIL", "")
 NOTIFY_EMAIL  = os.environ.get("NOTIFY_EMAIL", "")
-API_BASE      = "https://api.github.com"
-
-
-def _headers(token):
-    return {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-        "User-Agent": "ai-engine"
-    }
 
 
 def count_staging(folder: str) -> dict:
-    """Hitung file di staging ready dan drafts."""
+    """
+    Hitung file di staging ready dan drafts.
+    Dengan LOADER_SNAPSHOT semua folder dihitung dari satu tarball.
+    """
     def _count(path):
-        url = f"{API_BASE}/repos/{BRAIN_REPO}/contents/{path}"
-        req = urllib.request.Request(url, headers=_headers(BRAIN_PAT))
         try:
-            with urllib.request.urlopen(req) as r:
-                items = json.loads(r.read())
-            return len([i for i in items
-                        if i["type"] == "file" and i["name"] != ".gitkeep"])
+            return len(list_folder(path))
         except Exception:
             return 0
 
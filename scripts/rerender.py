@@ -0,0 +1,212 @@
+"""
+rerender.py
+Re-render halaman artikel / tool yang sudah dipublish setelah template
+postprocess berubah (CSS, footer, kerangka halaman, script), hanya halaman
+yang basi, dalam SATU commit ke branch output.
+
+    # Berapa halaman berubah + total delta bytes, tanpa commit
+    python scripts/rerender.py --dry-run
+
+    # Render ulang + commit
+    python scripts/rerender.py
+    python scripts/rerender.py --kind tools --workers 4
+    python scripts/rerender.py --force      # abaikan versi, render ulang semua
+
+Setiap halaman membawa <meta name="template-version"> (TEMPLATE_VERSION di
+postprocess.py) dan run_pipeline menyimpan body sumbernya di
+source/{kind}/{slug}.txt pada commit publish yang sama (bukan .html, dan
+/source/* dikirim dengan X-Robots-Tag: noindex — lihat assets.py, jadi
+tidak terindeks sebagai konten duplikat). Halaman basi = versinya berbeda
+dari versi sekarang; body sumbernya di-render ulang dengan wrap_*_html di
+worker process (parse + template + minify murni CPU), dengan tanggal
+publish asli dan related content dari content index terkini. Hasil yang
+identik dengan halaman lama tidak ikut commit.
+
+Dilaporkan dan dilewati:
+- halaman tanpa snapshot sumber (dipublish sebelum snapshot ada) — untuk
+  halaman itu perubahan teks massal masih lewat migrate-domain.yml
+- artikel yang tanggal publish aslinya tidak diketahui (tanpa datePublished
+  dan tanpa tanggal di content index), supaya tidak ter-tanggal ulang
+
+Push dengan GITHUB_TOKEN tidak memicu workflow lain, jadi rerender.yml
+menjalankan sitemap_gen.py sendiri setelah commit supaya halaman index ikut
+memakai template baru.
+"""
+import os
+import re
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import assets
+import storage
+import tracing
+import content_index
+
+from postprocess import TEMPLATE_VERSION, wrap_article_html, wrap_tool_html
+from publisher   import PublishBatch, OUTPUT_BRANCH
+
+ENGINE_REPO  = os.environ.get("ENGINE_REPO", "")
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
+SOURCE_DIR   = "source"
+WORKERS      = int(os.environ.get("RERENDER_WORKERS", 0)) or os.cpu_count() or 1
+
+_VERSION   = re.compile(r'<meta name="template-version" content="([^"]*)"')
+_PUBLISHED = re.compile(r'"datePublished":\s*"(\d{4}-\d{2}-\d{2})')
+
+
+def source_path(kind: str, slug: str) -> str:
+    """Snapshot body staging (sebelum wrap) untuk halaman {kind}/{slug}.html."""
+    return f"{SOURCE_DIR}/{kind}/{slug}.txt"
+
+
+def page_version(page: str) -> str:
+    m = _VERSION.search(page)
+    return m.group(1) if m else ""
+
+
+# ── Cari halaman basi ────────────────────────────────────────────────────────
+
+@tracing.traced()
+def find_stale(store, kinds: tuple, index: dict, force: bool = False) -> tuple:
+    """
+    Return (jobs, pages, counts):
+    jobs   = [(kind, slug, body, date)] halaman basi yang punya snapshot sumber
+    pages  = {path: html lama} untuk jobs
+    counts = {kind: {"total", "stale", "no_source", "no_date"}}
+    Tanggal artikel: datePublished halaman lama, lalu tanggal content index.
+    """
+    dates = {e["slug"]: e.get("date") for e in index.get("articles", [])}
+    jobs, pages, counts = [], {}, {}
+    for kind in kinds:
+        c = counts[kind] = {"total": 0, "stale": 0, "no_source": 0, "no_date": 0}
+        for f in store.list_folder(kind):
+            name = f["name"]
+            if not name.endswith(".html") or name == "index.html":
+                continue
+            c["total"] += 1
+            path = f["path"]
+            page = store.read(path)
+            if not force and page_version(page) == TEMPLATE_VERSION[kind]:
+                continue
+            c["stale"] += 1
+
+            slug = name[:-len(".html")]
+            try:
+                body = store.read(source_path(kind, slug))
+            except FileNotFoundError:
+                c["no_source"] += 1
+                continue
+            date = None
+            if kind == "articles":
+                m    = _PUBLISHED.search(page)
+                date = m.group(1) if m else dates.get(slug)
+                if not date:
+                    c["no_date"] += 1
+                    continue
+            jobs.append((kind, slug, body, date))
+            pages[path] = page
+    return jobs, pages, counts
+
+
+# ── Render (worker process) ──────────────────────────────────────────────────
+
+_index = None   # content index, di-set sekali per worker
+
+
+def _init_worker(index: dict) -> None:
+    global _index
+    _index = index
+    tracing.tracer.enabled = False   # span per halaman di worker tidak dikumpulkan
+
+
+def _render(job: tuple) -> tuple:
+    kind, slug, body, date = job
+    if kind == "articles":
+        page = wrap_article_html(body, slug, _index, date=date)
+    else:
+        page = wrap_tool_html(body, slug, _index)
+    return f"{kind}/{slug}.html", page
+
+
+@tracing.traced()
+def render_all(jobs: list, index: dict, workers: int = WORKERS) -> dict:
+    """{path: html baru} untuk semua jobs."""
+    global _index
+    if workers <= 1 or len(jobs) <= 1:
+        _index = index
+        return dict(map(_render, jobs))
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(index,)) as pool:
+        return dict(pool.map(_render, jobs, chunksize=chunksize))
+
+
+def _size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-render halaman yang template-nya basi")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="hanya laporkan jumlah halaman berubah + delta bytes")
+    parser.add_argument("--kind", choices=content_index.KINDS, action="append",
+                        help="articles / tools (default: keduanya)")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help=f"jumlah worker process (default: {WORKERS})")
+    parser.add_argument("--force", action="store_true",
+                        help="render ulang semua halaman walau versinya sama")
+    args  = parser.parse_args()
+    kinds = tuple(args.kind or content_index.KINDS)
+
+    store = storage.snapshot(ENGINE_REPO, OUTPUT_BRANCH, token=GITHUB_TOKEN,
+                             prefixes=kinds + tuple(f"{SOURCE_DIR}/{k}" for k in kinds)
+                             + (content_index.INDEX_PATH, content_index.LOG_DIR))
+
+    print("Template: " + ", ".join(f"{k}={TEMPLATE_VERSION[k]}" for k in kinds))
+    index = content_index.current(store)
+    jobs, old_pages, counts = find_stale(store, kinds, index, force=args.force)
+    for kind, c in counts.items():
+        print(f"  {kind:<8} {c['total']:>5} halaman, {c['stale']:>5} basi, dilewati: "
+              f"{c['no_source']} tanpa snapshot sumber, {c['no_date']} tanpa tanggal publish")
+    if not jobs:
+        print("Tidak ada halaman yang perlu di-render ulang.")
+        return
+
+    print(f"Re-render {len(jobs)} halaman dengan {min(args.workers, len(jobs))} worker...")
+    new_pages = render_all(jobs, index, args.workers)
+
+    changed = {path: page for path, page in new_pages.items() if page != old_pages[path]}
+    delta   = sum(_size(page) - _size(old_pages[path]) for path, page in changed.items())
+    print(f"Berubah: {len(changed)} halaman, delta {delta:+,} bytes "
+          f"({len(new_pages) - len(changed)} identik)")
+
+    if args.dry_run:
+        for path in sorted(changed):
+            print(f"  {path}: {_size(old_pages[path]):,} → {_size(changed[path]):,} bytes")
+        print("--dry-run: tidak ada yang di-commit.")
+        return
+    if not changed:
+        return
+
+    batch = PublishBatch(f"[rerender] Re-render {len(changed)} halaman "
+                         f"(template {', '.join(TEMPLATE_VERSION[k] for k in kinds)})")
+    for path in sorted(changed):
+        batch.add(path, changed[path])
+    # Stylesheet baru yang dirujuk halaman ikut di commit yang sama
+    assets.add_to(batch, store)
+
+    with tracing.span("publish_commit", files=len(batch)):
+        committed = batch.commit()
+    if not committed:
+        print(f"PUBLISH_FAILED: commit re-render {len(changed)} halaman gagal")
+        sys.exit(1)
+    print(f"Re-render selesai: {len(changed)} halaman → {OUTPUT_BRANCH}")
+
+
+if __name__ == "__main__":
+    main()
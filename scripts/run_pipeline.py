@@ -2,20 +2,40 @@
 run_pipeline.py
 Pipeline utama: ambil konten dari staging, wrap template,
 publish ke output branch, update tracking files.
+
+Mode batch: --max-items N (atau env MAX_ITEMS) mempublish sampai N entri
+manifest dalam satu proses dan satu commit output; --time-budget detik
+(TIME_BUDGET) berhenti mengambil item baru setelah waktunya habis.
 """
 import os
 import re
 import sys
-import json
-import base64
-import urllib.request
+import copy
+import time
+import argparse
 import urllib.parse
-from datetime import datetime
 
-from loader    import fetch_file, fetch_json, update_file, list_folder, delete_file
+import clock
+import http_client
+import rate_limit
+import tracing
+import html_meta
+import assets
+import blob_registry
+import content_index
+import editorial_memory
+import warm_queue
+import related
+import rerender
+
+from loader    import (fetch_file, fetch_json, transact_json, list_folder,
+                       delete_file, folder_sha)
 from postprocess import wrap_article_html, wrap_tool_html
-from publisher  import publish_html, publish_binary
+from publisher  import PublishBatch, output_store
 from og_gen     import generate_og_image
+from step_runner import StepRunner
+from checkpoint import Journal, journal_path
+from editorial_memory import EditorialMemory
 
 ENGINE_REPO   = os.environ.get("ENGINE_REPO", "")
 GITHUB_TOKEN  = os.environ.get("GITHUB_TOKEN", "")
@@ -23,59 +43,131 @@ TASK_TYPE     = os.environ.get("TASK_TYPE", "article")
 WORKER_URL    = os.environ.get("WORKER_URL", "").rstrip("/") + "/"
 BRIEF_TOKEN   = os.environ.get("BRIEF_TOKEN", "")
 SITE_BASE_URL = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
+MAX_ITEMS     = int(os.environ.get("MAX_ITEMS", 1))
+TIME_BUDGET   = float(os.environ.get("TIME_BUDGET", 0))
+
+# Perkiraan call GitHub per item (fetch, delete, + bagian commit) untuk cek budget
+CALLS_PER_ITEM = 4
 
 
-def notify_keyword_done(slug: str) -> None:
+def notify_keyword_done(slug: str) -> bool:
     """
     Set status keyword ke DONE di keyword_stock.json via Worker.
     Non-fatal: jika gagal, sync_check akan jadi fallback.
+    Return False jika gagal (journal mencoba lagi di run berikutnya).
     """
     if not WORKER_URL or not BRIEF_TOKEN:
         print("Warning: WORKER_URL atau BRIEF_TOKEN tidak di-set, skip update status keyword.")
-        return
+        return True   # tidak ada yang bisa diulang; sync_check yang menangani
     try:
         params = urllib.parse.urlencode({"slug": slug, "status": "DONE"})
         url = f"{WORKER_URL}update_keyword?{params}"
-        req = urllib.request.Request(
-            url,
+        r = http_client.request(
+            "GET", url,
             headers={"X-Brief-Token": BRIEF_TOKEN, "User-Agent": "ai-engine"},
-            method="GET"
+            timeout=15
         )
-        with urllib.request.urlopen(req, timeout=15) as r:
-            resp = r.read().decode()
-            print(f"Keyword status → DONE: {slug} (HTTP {r.status}, response: {resp})")
+        print(f"Keyword status → DONE: {slug} (HTTP {r.status}, response: {r.text()})")
+        return True
     except Exception as e:
         print(f"Warning: Gagal update status keyword (non-fatal, sync_check sebagai fallback): {e}")
+        return False
 
 
-def sync_manifest(staging_ready_path: str, manifest_path: str) -> tuple:
+@tracing.traced()
+def manifest_tree(queue: list, untracked: list) -> str:
+    """sha tree git folder staging yang sesuai dengan isi manifest."""
+    return blob_registry.git_tree_sha(
+        [{"name": e["filename"], "sha": e["sha"]} for e in queue] + untracked
+    )
+
+
+def write_manifest(manifest_path: str, queue: list, untracked: list,
+                   message: str, dequeued: set = frozenset()) -> bool:
+    """
+    Tulis manifest beserta source_tree: sha tree staging yang DIHARAPKAN
+    jika isinya persis queue + untracked. File yang masuk staging di luar
+    pipeline membuat sha asli berbeda, jadi sync berikutnya tetap list ulang.
+
+    Ditulis lewat transact_json: jika manifest diubah run lain sejak dibaca,
+    entri yang hanya ada di versi remote (file yang masuk setelah listing
+    kita) dipertahankan di akhir antrian, kecuali yang ada di `dequeued`
+    (sudah dipublish run ini).
+    """
+    def mutate(remote: dict) -> dict | None:
+        ours   = {e["filename"] for e in queue}
+        merged = list(queue) + [
+            e for e in remote.get("queue", [])
+            if e.get("filename") not in ours and e.get("filename") not in dequeued
+        ]
+        manifest = {
+            "queue":       merged,
+            "untracked":   untracked,
+            "source_tree": manifest_tree(merged, untracked),
+        }
+        return None if manifest == remote else manifest
+
+    result = transact_json(manifest_path, mutate, message)
+    if not result.ok:
+        print(f"Warning: manifest {manifest_path} gagal ditulis")
+    return result.ok
+
+
+@tracing.traced()
+def sync_manifest(staging_ready_path: str, manifest_path: str,
+                  save: bool = True) -> tuple:
     """
     Sinkronisasi manifest dengan file aktual di staging.
     - File baru (tidak di manifest) → tambah ke akhir antrian
     - File yang sudah dihapus → hapus dari manifest
-    - File yang dimodifikasi → posisi tidak berubah
+    - File yang dimodifikasi → posisi tidak berubah, sha diperbarui
+
+    Jika sha tree folder staging sama dengan source_tree di manifest, tidak
+    ada yang berubah: listing, diff dan write dilewati. Manifest hanya
+    ditulis jika entri benar-benar bertambah / berkurang / berubah.
+    save=False: caller yang menulis manifest (run_pipeline menulis sekali di akhir).
 
-    Return: (queue list, actual_files dict {filename: sha})
+    Return: (queue list, actual_files dict {filename: sha},
+             untracked [{name, sha}] (.gitkeep), changed bool)
     """
+    # sha tree staging — 1 request, dan memberi tahu sha manifest.json
+    try:
+        tree = folder_sha(staging_ready_path)
+    except Exception as e:
+        print(f"Warning: sha tree {staging_ready_path} tidak bisa dibaca, sync penuh: {e}")
+        tree = None
+
+    # Ambil manifest
+    try:
+        manifest  = fetch_json(manifest_path)
+        queue     = manifest.get("queue", [])
+        untracked = manifest.get("untracked", [])
+    except Exception:
+        manifest, queue, untracked = {}, [], []
+
+    if (tree and manifest.get("source_tree") == tree
+            and all(e.get("sha") for e in queue)):
+        print(f"Manifest up to date (staging tree {tree[:7]}), skip list & diff")
+        return queue, {e["filename"]: e["sha"] for e in queue}, untracked, False
+
     # Ambil file aktual
     try:
-        actual_files_list = list_folder(staging_ready_path)
+        actual_files_list = list_folder(staging_ready_path, include_hidden=True)
     except Exception as e:
         # Jangan hapus antrian jika folder staging tidak bisa diakses
         print(f"ERROR: Cannot list staging folder {staging_ready_path}: {e}")
         raise  # Biarkan pipeline gagal, jangan lanjut dengan antrian kosong
 
-    actual_files = {f["name"]: f["sha"] for f in actual_files_list}
-
-    # Ambil manifest
-    try:
-        manifest = fetch_json(manifest_path)
-        queue = manifest.get("queue", [])
-    except Exception:
-        queue = []
+    untracked    = [{"name": f["name"], "sha": f["sha"]}
+                    for f in actual_files_list if f["name"] == ".gitkeep"]
+    actual_files = {f["name"]: f["sha"] for f in actual_files_list
+                    if f["name"] != ".gitkeep"}
+    before       = [(e["filename"], e.get("sha")) for e in queue]
 
     # Hapus entri untuk file yang sudah tidak ada
     queue = [e for e in queue if e["filename"] in actual_files]
+    for e in queue:
+        e["sha"] = actual_files[e["filename"]]
 
     # Tambah file baru ke akhir antrian
     queued_names = {e["filename"] for e in queue}
@@ -83,17 +175,19 @@ def sync_manifest(staging_ready_path: str, manifest_path: str) -> tuple:
     for filename in new_files:
         queue.append({
             "filename": filename,
-            "added_at": datetime.utcnow().isoformat()
+            "added_at": clock.utcnow().isoformat(),
+            "sha":      actual_files[filename],
         })
 
+    changed = [(e["filename"], e["sha"]) for e in queue] != before
+    if not changed and manifest.get("source_tree") != manifest_tree(queue, untracked):
+        changed = True   # manifest lama tanpa source_tree / .gitkeep berubah
+
     # Simpan manifest yang sudah disinkron
-    update_file(
-        manifest_path,
-        json.dumps({"queue": queue}, indent=2),
-        "[pipeline] Sync manifest"
-    )
+    if save and changed:
+        write_manifest(manifest_path, queue, untracked, "[pipeline] Sync manifest")
 
-    return queue, actual_files
+    return queue, actual_files, untracked, changed
 
 
 def slug_from_filename(filename: str) -> str:
@@ -104,151 +198,191 @@ def slug_from_filename(filename: str) -> str:
     return slug
 
 
-def update_editorial_memory(slug: str, body_html: str,
-                             content_type: str) -> None:
-    """Update editorial_memory.json setelah konten dipublish."""
-    try:
-        memory = fetch_json("editorial_memory.json")
-    except Exception:
-        memory = {
-            "last_updated": "",
-            "published_articles": [],
-            "published_tools": []
-        }
-
-    date_str = datetime.utcnow().strftime("%Y-%m-%d")
-
-    h1_match = re.search(r'<h1[^>]*>(.*?)</h1>',
-                         body_html, re.IGNORECASE | re.DOTALL)
-    title = (re.sub(r'<[^>]+>', '', h1_match.group(1)).strip()
-             if h1_match else slug.replace("-", " ").title())
+@tracing.traced()
+def update_editorial_memory(published: list, content_type: str) -> bool:
+    """
+    Update editorial memory setelah konten dipublish.
+    published: [{slug, title}] — semua item run ini. Hanya shard yang memuat
+    slug-slug ini yang dibaca dan ditulis (lihat editorial_memory.py).
+    """
+    date_str = clock.utcnow().strftime("%Y-%m-%d")
+    entries  = [
+        {"slug": item["slug"], "title": item["title"], "published_date": date_str}
+        for item in published
+    ]
+
+    slugs   = ", ".join(item["slug"] for item in published)
+    success = EditorialMemory().upsert(
+        editorial_memory.kind_for(content_type), entries,
+        f"[pipeline] Update editorial memory: {slugs}"
+    )
+    if success:
+        print(f"Editorial memory updated: {slugs}")
+    else:
+        print(f"Warning: Failed to update editorial memory for {slugs}")
+    return success
 
-    entry = {
-        "slug":           slug,
-        "title":          title,
-        "published_date": date_str
-    }
 
-    if content_type == "article":
-        key = "published_articles"
-        idx = next((i for i, a in enumerate(memory.get(key, [])) if a["slug"] == slug), -1)
-        if idx == -1:
-            memory.setdefault(key, []).append(entry)
-        else:
-            memory[key][idx] = entry
+def remove_staged(path: str, sha: str) -> bool:
+    """Hapus file staging yang sudah dipublish."""
+    removed = delete_file(path, sha, f"[pipeline] Remove published: {path.rsplit('/', 1)[-1]}")
+    if removed:
+        print(f"Removed from staging: {path}")
     else:
-        key = "published_tools"
-        idx = next((i for i, t in enumerate(memory.get(key, [])) if t["slug"] == slug), -1)
-        if idx == -1:
-            memory.setdefault(key, []).append(entry)
-        else:
-            memory[key][idx] = entry
+        print(f"Warning: gagal menghapus {path} dari staging")
+    return removed
 
-    memory["last_updated"] = date_str
 
-    success = update_file(
-        "editorial_memory.json",
-        json.dumps(memory, indent=2),
-        f"[pipeline] Update editorial memory: {slug}"
-    )
-    if success:
-        print(f"Editorial memory updated: {slug}")
-    else:
-        print(f"Warning: Failed to update editorial memory for {slug}")
+def warmup_jobs(slugs: list) -> list:
+    """Job warm-up scraper sosial (warm_queue.py) untuk artikel dengan OG image."""
+    return [warm_queue.job(f"{SITE_BASE_URL}/articles/{slug}") for slug in slugs]
 
 
-def extract_cluster(body_html: str) -> str:
-    """Ekstrak cluster_id dari meta tag di body HTML staging."""
-    match = re.search(
-        r'<meta\s+name=["\']cluster["\']\s+content=["\']([^"\']*)["\'][^>]*/?>',
-        body_html, re.IGNORECASE
-    )
-    return match.group(1).strip() if match else ""
+def enqueue_warmup(slugs: list) -> bool:
+    """
+    Antrekan warm-up di commit output tersendiri. Hanya untuk slug yang
+    dilanjutkan dari journal; publish normal mengantre di commit publish.
+    """
+    batch = PublishBatch(f"[pipeline] Warm queue: {', '.join(slugs)}")
+    warm_queue.enqueue(batch, warmup_jobs(slugs))
+    return batch.commit() is not None
 
 
-def warm_facebook_cache(url: str) -> None:
+@tracing.traced()
+def update_content_index(batch: PublishBatch, content_type: str,
+                         entries: list, extra_events: list = ()) -> None:
     """
-    Paksa Facebook crawl ulang OG meta tag untuk URL yang baru dipublish.
-    Non-fatal: jika gagal, pipeline tetap lanjut.
+    Tambahkan event "add" content index ke batch publish (content_index.py).
+    File event ikut ter-commit bersama HTML, jadi index tidak pernah setengah
+    jadi; content-index.json sendiri baru dikompaksi oleh sitemap_gen.
+    entries: [{slug, title, cluster, date, excerpt[, future_links]}]; slug
+    yang sudah ada di index dilewati saat kompaksi.
+    extra_events: event lain untuk file log yang sama (mis. "update"
+    future_links halaman lama dari link_related).
     """
-    try:
-        encoded = urllib.parse.quote(url, safe="")
-        api_url = f"https://graph.facebook.com/?id={encoded}&scrape=true"
-        req = urllib.request.Request(
-            api_url,
-            data=b"",
-            method="POST",
-            headers={"User-Agent": "ai-engine"}
-        )
-        with urllib.request.urlopen(req, timeout=10) as r:
-            print(f"Facebook cache warmed: {url} (HTTP {r.status})")
-    except Exception as e:
-        print(f"Warning: Facebook cache warm failed (non-fatal): {e}")
+    kind = content_index.kind_for(content_type)
+    path = content_index.append(batch, [
+        content_index.event("add", kind, entry["slug"], entry) for entry in entries
+    ] + list(extra_events))
+    if path:
+        print(f"Content index queued: {', '.join(e['slug'] for e in entries)} → {path}")
 
 
-def update_content_index(slug: str, title: str, cluster_id: str,
-                          content_type: str, date_str: str,
-                          excerpt: str = "") -> None:
+@tracing.traced()
+def link_related(batch: PublishBatch, task_type: str, items: list) -> list:
     """
-    Update content-index.json di branch output ENGINE_REPO.
+    Related content & future link di-resolve saat build (related.py).
+    - HTML item baru di batch di-link ke index terkini + item batch ini
+      (item satu batch saling melihat).
+    - Halaman lama yang markup-nya berubah karena item baru (cluster sama,
+      atau future link ke slug baru) dibaca dari branch output, di-patch,
+      dan ikut di commit yang sama.
+    Mengisi item["future_links"]; return event "update" future_links untuk
+    halaman lama yang di-patch.
     """
-    path    = "content-index.json"
-    api_url = f"https://api.github.com/repos/{ENGINE_REPO}/contents/{path}"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept":        "application/vnd.github.v3+json",
-        "User-Agent":    "ai-engine"
-    }
+    store  = output_store()
+    kind   = content_index.kind_for(task_type)
+    before = content_index.current(store)
+    after  = copy.deepcopy(before)
+    content_index.apply(after, [
+        content_index.event("add", kind, item["slug"],
+                            {k: item[k] for k in ("title", "cluster", "date", "excerpt")})
+        for item in items
+    ])
+
+    for item in items:
+        page = related.link(item["html"], after, item["slug"])
+        batch.add_html(kind, f"{item['slug']}.html", page)
+        item["future_links"] = related.pending(page)
+
+    events = []
+    for page_kind, slug in related.affected(before, after, {item["slug"] for item in items}):
+        path = f"{page_kind}/{slug}.html"
+        try:
+            page = store.read(path)
+        except FileNotFoundError:
+            continue
+        patched = related.link(page, after, slug)
+        if patched == page:
+            continue
+        batch.add(path, patched)
+        events.append(content_index.event(
+            "update", page_kind, slug, {"future_links": related.pending(patched)}
+        ))
+    if events:
+        print(f"Related content: {len(events)} halaman lama di-patch "
+              f"({', '.join(ev['slug'] for ev in events)})")
+    return events
+
+
+def prepare_item(batch: PublishBatch, staging_ready: str, filename: str,
+                 task_type: str) -> dict:
+    """
+    Wrap satu file staging dan tambahkan HTML (+ OG image) ke batch.
+    Return metadata item untuk content index, editorial memory, dll.
+    """
+    is_article = (task_type == "article")
+    output_dir = "articles" if is_article else "tools"
+    slug       = slug_from_filename(filename)
 
-    sha   = None
-    index = {"articles": [], "tools": []}
-    try:
-        req = urllib.request.Request(
-            f"{api_url}?ref=output", headers=headers
-        )
-        with urllib.request.urlopen(req) as r:
-            data    = json.loads(r.read())
-            sha     = data.get("sha")
-            raw     = base64.b64decode(data["content"]).decode("utf-8")
-            index   = json.loads(raw)
-    except Exception:
-        pass
-
-    key = "articles" if content_type == "article" else "tools"
-    existing_slugs = {e["slug"] for e in index.get(key, [])}
-    if slug not in existing_slugs:
-        index.setdefault(key, []).append({
-            "slug":    slug,
-            "title":   title,
-            "cluster": cluster_id,
-            "date":    date_str,
-            "excerpt": excerpt
-        })
+    print(f"Publishing: {filename} → slug: {slug}")
+
+    with tracing.span("fetch_staging", slug=slug) as sp:
+        body_html = fetch_file(f"{staging_ready}/{filename}")
+        sp.set(chars=len(body_html))
+
+    with tracing.span("wrap_html", slug=slug):
+        if is_article:
+            full_html = wrap_article_html(body_html, slug)
+        else:
+            full_html = wrap_tool_html(body_html, slug)
+
+    # Sudah di-parse oleh wrap_*_html → diambil dari cache html_meta
+    # title/excerpt disimpan ter-escape (seperti isi HTML asli) karena
+    # sitemap_gen menyisipkannya langsung ke markup; OG image memakai teks polos
+    meta       = html_meta.extract(body_html)
+    title_text = meta.h1 or slug.replace("-", " ").title()
+    page_title = html_meta.escape_attr(title_text)
+
+    batch.add_html(output_dir, f"{slug}.html", full_html)
+    # Body sumber disimpan supaya halaman bisa di-render ulang saat template berubah
+    batch.add(rerender.source_path(output_dir, slug), body_html)
+
+    og_queued = False
+    if is_article:
+        try:
+            with tracing.span("og_image", slug=slug) as sp:
+                og_path = generate_og_image(title_text, slug, "/tmp/og")
+                with open(og_path, "rb") as f:
+                    png = f.read()
+                sp.set(bytes=len(png))
+            batch.add_binary("og", f"{slug}.png", png)
+            og_queued = True
+        except Exception as e:
+            print(f"Warning: OG image generation failed (non-fatal): {e}")
 
-    payload = {
-        "message": f"[pipeline] Update content index: {slug}",
-        "content": base64.b64encode(
-            json.dumps(index, indent=2).encode("utf-8")
-        ).decode("utf-8"),
-        "branch":  "output"
+    return {
+        "filename":  filename,
+        "slug":      slug,
+        "title":     page_title,
+        "cluster":   meta.cluster,
+        "date":      clock.utcnow().strftime("%Y-%m-%d"),
+        "excerpt":   html_meta.escape_attr(meta.description),
+        "og_queued": og_queued,
+        "html":      full_html,
     }
-    if sha:
-        payload["sha"] = sha
-
-    req = urllib.request.Request(
-        api_url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={**headers, "Content-Type": "application/json"},
-        method="PUT"
-    )
-    try:
-        with urllib.request.urlopen(req) as r:
-            print(f"Content index updated: {slug} (HTTP {r.status})")
-    except Exception as e:
-        print(f"Warning: Could not update content index: {e}")
 
 
-def run_pipeline(task_type: str) -> None:
+def run_pipeline(task_type: str, max_items: int = 1, time_budget: float = 0) -> None:
+    """
+    Publish sampai max_items entri teratas manifest dalam satu proses.
+    time_budget (detik, 0 = tanpa batas): berhenti mengambil item baru jika
+    terlewati. Semua item masuk SATU commit ke branch output; manifest,
+    content index dan editorial memory masing-masing ditulis sekali.
+    Slug yang di run sebelumnya sudah dipublish tapi belum tuntas (lihat
+    checkpoint.py) hanya dilanjutkan langkah yang belum selesai.
+    """
+    started     = time.monotonic()
     is_article  = (task_type == "article")
     folder_type = "articles" if is_article else "tools"
     output_dir  = folder_type
@@ -260,100 +394,209 @@ def run_pipeline(task_type: str) -> None:
     print("Syncing manifest...")
 
     try:
-        queue, actual_files = sync_manifest(staging_ready, manifest_path)
+        queue, actual_files, untracked, changed = sync_manifest(
+            staging_ready, manifest_path, save=False
+        )
     except Exception as e:
         print(f"FATAL: Sync manifest gagal: {e}")
         sys.exit(1)
 
-    if not queue:
+    # Lanjutkan slug dari run yang mati setelah commit output
+    journal = Journal(journal_path(folder_type)).load()
+    resumed = []
+    for slug, entry in journal.incomplete():
+        filename = entry["filename"]
+        if filename in actual_files and actual_files[filename] != entry.get("sha"):
+            # File staging diganti setelah publish → konten baru, publish ulang
+            print(f"Journal: {filename} berubah sejak dipublish, publish ulang")
+            journal.drop(slug)
+            continue
+        print(f"Journal: lanjutkan {slug} (belum: {', '.join(journal.missing(slug))})")
+        resumed.append({
+            "filename":  filename,
+            "slug":      slug,
+            "title":     entry.get("title", slug),
+            "og_queued": bool(entry.get("og")),
+        })
+    resumed_files = {item["filename"] for item in resumed}
+    to_publish    = [e for e in queue if e["filename"] not in resumed_files]
+
+    if not to_publish and not resumed:
+        if changed:
+            write_manifest(manifest_path, [], untracked, "[pipeline] Sync manifest")
         print(f"STAGING_EMPTY: No {folder_type} in staging/ready.")
         open("/tmp/staging_empty", "w").close()
         sys.exit(2)
 
-    next_item = queue[0]
-    filename  = next_item["filename"]
-    file_sha  = actual_files[filename]
-    slug      = slug_from_filename(filename)
-
-    print(f"Publishing: {filename} → slug: {slug}")
-
-    body_html = fetch_file(f"{staging_ready}/{filename}")
-
-    if is_article:
-        full_html = wrap_article_html(body_html, slug)
-    else:
-        full_html = wrap_tool_html(body_html, slug)
+    # Semua file output (HTML, content index, OG image, stylesheet) masuk SATU commit
+    batch = PublishBatch(f"[pipeline] Publish {output_dir}")
+    items = []
+    for entry in to_publish[:max(max_items, 1)]:
+        if items and time_budget and time.monotonic() - started > time_budget:
+            print(f"Time budget {time_budget:.0f}s habis, berhenti di {len(items)} item")
+            break
+        left = rate_limit.budget_left()
+        if items and left is not None and left < CALLS_PER_ITEM:
+            print(f"GitHub call budget hampir habis ({left}), berhenti di {len(items)} item")
+            break
+        try:
+            with tracing.span("prepare_item", filename=entry["filename"]):
+                items.append(prepare_item(batch, staging_ready, entry["filename"], task_type))
+        except Exception as e:
+            if max_items <= 1 and not resumed:
+                raise
+            print(f"Warning: skip {entry['filename']}: {e}")
 
-    success = publish_html(output_dir, f"{slug}.html", full_html)
-    if not success:
-        print(f"PUBLISH_FAILED: Could not publish {slug}.html")
+    if not items and not resumed:
+        print("PUBLISH_FAILED: tidak ada item yang berhasil disiapkan")
         sys.exit(1)
 
-    print(f"Published successfully: {output_dir}/{slug}.html")
-
-    # 🔥 KODE BARU: Export slug & folder ke GITHUB_OUTPUT agar bisa dibaca workflow selanjutnya
-    gh_output = os.environ.get("GITHUB_OUTPUT")
-    if gh_output:
-        with open(gh_output, "a") as f:
-            f.write(f"published_folder={folder_type}\n")
-            f.write(f"published_slug={slug}\n")
-        print(f"Exported to GITHUB_OUTPUT: folder={folder_type}, slug={slug}")
-    else:
-        print("Warning: GITHUB_OUTPUT not set, skipping export.")
-
-    # Hapus dari staging
-    delete_file(
-        f"{staging_ready}/{filename}",
-        file_sha,
-        f"[pipeline] Remove published: {filename}"
-    )
-    print(f"Removed from staging: {filename}")
-
-    # Update tracking files (non-fatal jika gagal)
-    try:
-        notify_keyword_done(slug)
-    except Exception as e:
-        print(f"Warning: notify_keyword_done gagal: {e}")
-
-    try:
-        update_editorial_memory(slug, body_html, task_type)
-    except Exception as e:
-        print(f"Warning: update_editorial_memory gagal: {e}")
-
-    h1_match   = re.search(r'<h1[^>]*>(.*?)</h1>', body_html,
-                            re.IGNORECASE | re.DOTALL)
-    page_title = (re.sub(r'<[^>]+>', '', h1_match.group(1)).strip()
-                  if h1_match else slug.replace("-", " ").title())
-    cluster_id = extract_cluster(body_html)
-    date_str   = datetime.utcnow().strftime("%Y-%m-%d")
-
-    desc_match = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=["\']([^"\']*)["\'][^>]*/?>',
-        body_html, re.IGNORECASE
-    )
-    excerpt = desc_match.group(1).strip() if desc_match else ""
-
-    try:
-        update_content_index(slug, page_title, cluster_id, task_type, date_str, excerpt)
-    except Exception as e:
-        print(f"Warning: update_content_index gagal: {e}")
+    slugs = [item["slug"] for item in items]
+    if items:
+        if len(items) == 1:
+            batch.message = f"[pipeline] Publish {output_dir}/{slugs[0]}.html"
+        else:
+            batch.message = f"[pipeline] Publish {len(items)} {output_dir}: {', '.join(slugs)}"
 
-    if is_article:
+        # Non-fatal: tanpa blok statis, script related / future link di
+        # halaman tetap mengisi dari content-index.json
+        related_events = []
         try:
-            og_path = generate_og_image(page_title, slug, "/tmp/og")
-            with open(og_path, "rb") as f:
-                og_data = f.read()
-            og_ok = publish_binary("og", f"{slug}.png", og_data)
-            if og_ok:
-                print(f"OG image published: og/{slug}.png")
-                warm_facebook_cache(f"{SITE_BASE_URL}/articles/{slug}")
-            else:
-                print(f"Warning: OG image publish failed (non-fatal)")
+            related_events = link_related(batch, task_type, items)
         except Exception as e:
-            print(f"Warning: OG image generation failed (non-fatal): {e}")
+            print(f"Warning: related content saat build gagal (fallback JS): {e}")
 
-    print("Pipeline completed successfully.")
+        try:
+            update_content_index(batch, task_type, [
+                {k: item[k] for k in ("slug", "title", "cluster", "date", "excerpt")}
+                | ({"future_links": item["future_links"]} if item.get("future_links") else {})
+                for item in items
+            ], related_events)
+        except Exception as e:
+            # Jangan publish tanpa entri index — konten tetap di staging, diulang run berikutnya
+            print(f"PUBLISH_FAILED: update_content_index gagal: {e}")
+            sys.exit(1)
+        # Warm-up cache Facebook diantrekan di commit yang sama; dikuras
+        # warm_queue.py drain di step workflow terpisah
+        warm_queue.enqueue(batch, warmup_jobs(
+            [item["slug"] for item in items if item["og_queued"]]
+        ))
+        # Stylesheet yang dirujuk halaman (/assets/*.css) ikut di commit yang sama
+        assets.add_to(batch, output_store())
+
+        with tracing.span("publish_commit", files=len(batch)):
+            committed = batch.commit()
+        if not committed:
+            print(f"PUBLISH_FAILED: Could not publish {', '.join(slugs)}")
+            sys.exit(1)
+
+        for item in items:
+            print(f"Published successfully: {output_dir}/{item['slug']}.html")
+            if item["og_queued"]:
+                print(f"OG image published: og/{item['slug']}.png")
+            journal.record(item["slug"], item["filename"], actual_files[item["filename"]],
+                           item["title"], item["og_queued"])
+        # Checkpoint sebelum efek samping: jika proses mati setelah ini,
+        # run berikutnya tidak merender / mempublish ulang
+        journal.save(f"[pipeline] Journal: published {', '.join(slugs)}")
+
+        # Export slug & folder ke GITHUB_OUTPUT agar bisa dibaca workflow selanjutnya
+        gh_output = os.environ.get("GITHUB_OUTPUT")
+        if gh_output:
+            with open(gh_output, "a") as f:
+                f.write(f"published_folder={folder_type}\n")
+                f.write(f"published_slug={slugs[0]}\n")
+                f.write(f"published_slugs={','.join(slugs)}\n")
+                f.write(f"published_count={len(slugs)}\n")
+            print(f"Exported to GITHUB_OUTPUT: folder={folder_type}, slugs={','.join(slugs)}")
+        else:
+            print("Warning: GITHUB_OUTPUT not set, skipping export.")
+
+    # Efek samping setelah publish berjalan paralel (StepRunner).
+    # Semua tulisan ke ai-brain dirantai satu per satu: commit Contents API
+    # ke branch yang sama secara bersamaan saling bentrok (409).
+    # Call Worker tidak bergantung pada tulisan ai-brain. Warm-up Facebook
+    # sudah ikut commit batch di atas (warm_queue.py), kecuali slug lama dari
+    # journal yang belum diantrekan.
+    # Langkah yang sudah tercatat di journal dilewati.
+    todo  = items + resumed
+    steps = StepRunner()
+    marks = {}   # nama step → (slug, langkah journal)
+    brain = ()
+    for item in todo:
+        slug = item["slug"]
+        if journal.is_done(slug, "staged_removed"):
+            continue
+        if item["filename"] not in actual_files:
+            journal.mark(slug, "staged_removed")   # sudah tidak ada di staging
+            continue
+        brain = (steps.add(
+            f"delete:{item['filename']}", remove_staged,
+            f"{staging_ready}/{item['filename']}", actual_files[item["filename"]],
+            after=brain
+        ),)
+        marks[brain[0]] = ([slug], "staged_removed")
+
+    done  = {item["filename"] for item in todo}
+    remaining = [e for e in queue if e["filename"] not in done]
+    if changed or len(remaining) != len(queue):
+        brain = (steps.add(
+            "manifest", write_manifest, manifest_path, remaining, untracked,
+            f"[pipeline] Sync manifest, dequeue {len(todo)} published", done,
+            after=brain
+        ),)
+
+    memory_items = [item for item in todo if not journal.is_done(item["slug"], "memory_updated")]
+    if memory_items:
+        name = steps.add("editorial_memory", update_editorial_memory,
+                         memory_items, task_type, after=brain)
+        marks[name] = ([item["slug"] for item in memory_items], "memory_updated")
+
+    for item in todo:
+        slug = item["slug"]
+        if not journal.is_done(slug, "keyword_notified"):
+            name = steps.add(f"keyword_done:{slug}", notify_keyword_done, slug)
+            marks[name] = ([slug], "keyword_notified")
+
+    warm_slugs = [item["slug"] for item in resumed
+                  if item["og_queued"] and not journal.is_done(item["slug"], "warm_queued")]
+    if warm_slugs:
+        name = steps.add("warm_queue", enqueue_warmup, warm_slugs)
+        marks[name] = (warm_slugs, "warm_queued")
+
+    # Non-fatal: konten sudah live, kegagalan di sini cukup dilaporkan
+    # dan diulang run berikutnya lewat journal
+    with tracing.span("post_publish", steps=len(steps)):
+        results = steps.run()
+    steps.summary("post-publish")
+    for r in steps.failed:
+        print(f"Warning: {r.name} gagal: {r.error}")
+
+    for name, (step_slugs, step) in marks.items():
+        r = results[name]
+        if r.ok and r.value is not False:
+            for slug in step_slugs:
+                journal.mark(slug, step)
+
+    pending = [slug for slug, _ in journal.incomplete()]
+    journal.save(f"[pipeline] Journal: {len(todo)} selesai diproses")
+    if pending:
+        print(f"Journal: belum tuntas, dilanjutkan run berikutnya: {', '.join(pending)}")
+
+    print(f"Pipeline completed successfully: {len(items)} dipublish, "
+          f"{len(resumed)} dilanjutkan dalam {time.monotonic() - started:.1f}s")
+
+
+def parse_args(argv: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Publish konten dari staging ai-brain")
+    parser.add_argument("--max-items", type=int, default=MAX_ITEMS,
+                        help="jumlah maksimal item manifest yang dipublish (default 1)")
+    parser.add_argument("--time-budget", type=float, default=TIME_BUDGET,
+                        help="detik; berhenti mengambil item baru setelahnya (0 = tanpa batas)")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    run_pipeline(TASK_TYPE)
\ No newline at end of file
+    args = parse_args(sys.argv[1:])
+    with tracing.span("run_pipeline", task_type=TASK_TYPE, max_items=args.max_items):
+        run_pipeline(TASK_TYPE, args.max_items, args.time_budget)
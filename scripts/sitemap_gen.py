@@ -5,70 +5,48 @@ Dipanggil setiap konten baru dipublish dan oleh generate-sitemap workflow.
 """
 import os
 import re
-import json
-import base64
-import urllib.request
-import urllib.error
 from datetime import datetime
 
+import clock
+import storage
+import tracing
+import assets
+import content_index
+from publisher import PublishBatch
+from postprocess import SITE_CSS, minify_page
+
 ENGINE_REPO   = os.environ.get("ENGINE_REPO", "akunTools/ai-engine")
 ENGINE_TOKEN  = os.environ.get("GITHUB_TOKEN")
 SITE_URL      = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
 OUTPUT_BRANCH = "output"
-API_BASE      = "https://api.github.com"
 
 # ── URL affiliate — gunakan konstanta ini di semua tempat ─────────────────────
 CLOUDWAYS_URL = "https://www.cloudways.com/en/?id=2085949"
 
 
-def _headers():
-    return {
-        "Authorization": f"token {ENGINE_TOKEN}",
-        "Accept": "application/vnd.github.v3+json",
-        "User-Agent": "ai-engine"
-    }
+def _store():
+    return storage.get(ENGINE_REPO, OUTPUT_BRANCH, token=ENGINE_TOKEN or "")
 
 
+@tracing.traced()
 def get_output_files() -> list:
-    """Ambil daftar semua file di branch output menggunakan Git Trees API untuk menghindari limit 1000 file."""
+    """Ambil daftar semua file di branch output (backend github: Git Trees API, tanpa limit 1000 file)."""
     files = []
-    url = f"{API_BASE}/repos/{ENGINE_REPO}/git/trees/{OUTPUT_BRANCH}?recursive=1"
-    req = urllib.request.Request(url, headers=_headers())
     try:
-        with urllib.request.urlopen(req) as r:
-            tree = json.loads(r.read()).get("tree", [])
-            for item in tree:
-                if item["type"] == "blob" and item["path"].endswith(".html"):
-                    parts = item["path"].split("/")
-                    if len(parts) == 2 and parts[0] in ["articles", "tools"] and parts[1] != "index.html":
-                        files.append({
-                            "path": item["path"],
-                            "folder": parts[0],
-                            "name": parts[1]
-                        })
+        for item in _store().list_tree():
+            if item["path"].endswith(".html"):
+                parts = item["path"].split("/")
+                if len(parts) == 2 and parts[0] in ["articles", "tools"] and parts[1] != "index.html":
+                    files.append({
+                        "path": item["path"],
+                        "folder": parts[0],
+                        "name": parts[1]
+                    })
     except Exception as e:
         print(f"Could not list tree: {e}")
     return files
 
 
-def get_content_index() -> dict:
-    """
-    Baca content-index.json dari branch output.
-    Return dict {"articles": [...], "tools": [...]}.
-    Setiap entri artikel berisi: slug, title, cluster, date, excerpt.
-    """
-    path    = "content-index.json"
-    api_url = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}?ref={OUTPUT_BRANCH}"
-    try:
-        req = urllib.request.Request(api_url, headers=_headers())
-        with urllib.request.urlopen(req) as r:
-            data = json.loads(r.read())
-            raw  = base64.b64decode(data["content"]).decode("utf-8")
-            return json.loads(raw)
-    except Exception:
-        return {"articles": [], "tools": []}
-
-
 def file_to_slug(filename: str) -> str:
     slug = filename.replace(".md", "").replace(".html", "")
     slug = re.sub(r'^\d{4}-\d{2}-\d{2}-', '', slug)
@@ -121,189 +99,8 @@ _AFFILIATE_TRACKER_JS = """<script>
 })();
 </script>"""
 
-_BASE_CSS = """
-  *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
-  :root {
-    --bg:           #fafafa;
-    --surface:      #ffffff;
-    --text:         #18181b;
-    --muted:        #52525b;
-    --subtle:       #a1a1aa;
-    --border:       #e4e4e7;
-    --accent:       #2563eb;
-    --accent-h:     #1d4ed8;
-    --accent-light: #eff6ff;
-    --danger:       #dc2626;
-    --danger-bg:    #fef2f2;
-    --warning:      #d97706;
-    --warning-bg:   #fffbeb;
-    --success:      #059669;
-    --success-bg:   #f0fdf4;
-    --r:            4px;
-  }
-  body {
-    font-family: 'DM Sans', -apple-system, BlinkMacSystemFont, sans-serif;
-    background: var(--bg);
-    color: var(--text);
-    line-height: 1.6;
-    -webkit-font-smoothing: antialiased;
-  }
-  a { color: var(--accent); text-decoration: none; }
-  a:hover { color: var(--accent-h); }
-  
-  /* Global Focus State for Accessibility */
-  *:focus-visible {
-    outline: 2px solid var(--accent);
-    outline-offset: 2px;
-  }
-"""
-
-_NAV_CSS = """
-  nav.site-nav, body > nav:not(.footer-nav) {
-    position: sticky;
-    top: 0;
-    z-index: 100;
-    background: var(--surface);
-    border-bottom: 1px solid var(--border);
-  }
-  .nav-inner {
-    max-width: 1120px;
-    margin: 0 auto;
-    padding: 0 24px;
-    height: 56px;
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-  }
-  .nav-brand {
-    font-size: 1.125rem;
-    font-weight: 700;
-    color: var(--text);
-    text-decoration: none;
-    letter-spacing: -0.02em;
-    display: flex;
-    align-items: center;
-    min-height: 44px;
-  }
-  .brand-accent {
-    color: var(--accent);
-  }
-  .nav-links {
-    display: flex;
-    align-items: center;
-    gap: 4px;
-  }
-  .nav-links a {
-    font-size: 0.875rem;
-    font-weight: 500;
-    color: var(--muted);
-    text-decoration: none;
-    padding: 0 12px;
-    min-height: 44px;
-    display: flex;
-    align-items: center;
-    border-radius: var(--r);
-    transition: color 0.15s ease, background 0.15s ease;
-  }
-  .nav-links a:hover {
-    color: var(--text);
-    background: var(--bg);
-  }
-  .nav-links a.active {
-    color: var(--accent);
-    background: var(--accent-light);
-    border: 1px solid #bfdbfe;
-  }
-  .nav-back {
-    font-size: 0.875rem;
-    font-weight: 500;
-    color: var(--muted);
-    text-decoration: none;
-    display: flex;
-    align-items: center;
-    gap: 6px;
-    min-height: 44px;
-    padding: 0 8px;
-    border-radius: var(--r);
-    transition: color 0.15s ease;
-  }
-  .nav-back:hover {
-    color: var(--text);
-    background: var(--bg);
-  }
-  @media (max-width: 640px) {
-    .nav-inner { padding: 0 16px; }
-    .nav-links a { padding: 0 8px; }
-  }
-"""
-
-_FOOTER_CSS = """
-  footer {
-    background: var(--bg);
-    border-top: 1px solid var(--border);
-    margin-top: 80px;
-  }
-  .footer-inner {
-    max-width: 1120px;
-    margin: 0 auto;
-    padding: 48px 24px;
-  }
-  .footer-top {
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-    gap: 24px;
-  }
-  .footer-brand {
-    font-size: 1.0625rem;
-    font-weight: 700;
-    color: var(--text);
-    text-decoration: none;
-    letter-spacing: -0.02em;
-    display: flex;
-    align-items: center;
-    min-height: 44px;
-  }
-  .footer-accent { color: var(--accent); }
-  .footer-nav {
-    display: flex;
-    align-items: center;
-    gap: 4px;
-  }
-  .footer-nav a {
-    font-size: 0.875rem;
-    font-weight: 500;
-    color: var(--muted);
-    text-decoration: none;
-    padding: 0 12px;
-    min-height: 44px;
-    display: flex;
-    align-items: center;
-    border-radius: var(--r);
-    transition: color 0.15s ease;
-  }
-  .footer-nav a:hover { color: var(--text); }
-  .footer-bottom {
-    margin-top: 32px;
-    padding-top: 24px;
-    border-top: 1px solid var(--border);
-    font-size: 0.8125rem;
-    color: var(--muted);
-    line-height: 1.6;
-    font-family: "SFMono-Regular", Consolas, "JetBrains Mono", monospace;
-  }
-  @media (max-width: 640px) {
-    footer { margin-top: 48px; }
-    .footer-inner { padding: 40px 16px; }
-    .footer-top {
-      flex-direction: column;
-      align-items: flex-start;
-      gap: 16px;
-    }
-    .footer-nav { margin-left: -12px; }
-  }
-"""
-
+# Base, nav & footer CSS: SITE_CSS (postprocess.py) → /assets/site.{hash}.css.
+# CSS di bawah hanya dipakai halaman index, tetap inline.
 _HOMEPAGE_CSS = """
   .home-wrap {
     max-width: 760px;
@@ -642,11 +439,37 @@ _FOOTER = """<footer>
 # SITEMAP
 # ─────────────────────────────────────────────
 
-def build_sitemap(files: list) -> str:
-    today = datetime.utcnow().strftime("%Y-%m-%d")
+def _content_dates(content_index: dict) -> dict:
+    """{slug: "YYYY-MM-DD"} dari content-index.json."""
+    return {
+        e["slug"]: e["date"]
+        for key in ("articles", "tools")
+        for e in content_index.get(key, [])
+        if e.get("date")
+    }
+
+
+def file_date(filename: str, dates: dict) -> str:
+    """
+    Tanggal konten: prefix tanggal di nama file, lalu content-index.
+    Return "" jika tidak diketahui. Sengaja tidak memakai tanggal hari ini
+    supaya output identik antar run (write yang tidak berubah di-skip).
+    """
+    m = re.match(r'^(\d{4}-\d{2}-\d{2})', filename)
+    return m.group(1) if m else dates.get(file_to_slug(filename), "")
+
+
+@tracing.traced()
+def build_sitemap(files: list, content_index: dict | None = None) -> str:
+    dates    = _content_dates(content_index or {})
+    lastmods = {f["path"]: file_date(f["name"], dates) for f in files}
+    newest   = max(lastmods.values(), default="")
+
+    def lastmod_tag(date_str: str) -> str:
+        return f"\n    <lastmod>{date_str}</lastmod>" if date_str else ""
+
     url_entries = [f"""  <url>
-    <loc>{SITE_URL}/</loc>
-    <lastmod>{today}</lastmod>
+    <loc>{SITE_URL}/</loc>{lastmod_tag(newest)}
     <changefreq>weekly</changefreq>
     <priority>1.0</priority>
   </url>"""]
@@ -654,8 +477,7 @@ def build_sitemap(files: list) -> str:
         loc      = file_to_url(f["folder"], f["name"])
         priority = "0.8" if f["folder"] == "tools" else "0.6"
         url_entries.append(f"""  <url>
-    <loc>{loc}</loc>
-    <lastmod>{today}</lastmod>
+    <loc>{loc}</loc>{lastmod_tag(lastmods[f["path"]])}
     <changefreq>monthly</changefreq>
     <priority>{priority}</priority>
   </url>""")
@@ -666,6 +488,7 @@ def build_sitemap(files: list) -> str:
         + "\n</urlset>"
     )
 
+@tracing.traced()
 def build_rss_feed(files: list, content_index: dict) -> str:
     """Build RSS 2.0 feed dari 20 konten terbaru."""
     import email.utils
@@ -679,18 +502,20 @@ def build_rss_feed(files: list, content_index: dict) -> str:
         for e in content_index.get("tools", [])
     }
 
+    dates     = _content_dates(content_index)
     all_items = []
     for f in files:
         name   = f["name"]
         folder = f["folder"]
         slug   = file_to_slug(name)
 
-        date_match = re.match(r'^(\d{4}-\d{2}-\d{2})', name)
-        date_str   = date_match.group(1) if date_match else ""
+        # Item tanpa tanggal: tanpa pubDate (bukan tanggal hari ini) → feed.xml
+        # identik antar run selama kontennya sama
+        date_str = file_date(name, dates)
         try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d") if date_str else datetime.utcnow()
-        except Exception:
-            dt = datetime.utcnow()
+            dt = datetime.strptime(date_str, "%Y-%m-%d") if date_str else None
+        except ValueError:
+            dt = None
 
         meta    = article_meta.get(slug, {}) if folder == "articles" else tool_meta.get(slug, {})
         title   = meta.get("title") or slug_to_title(slug)
@@ -705,7 +530,8 @@ def build_rss_feed(files: list, content_index: dict) -> str:
             "url":     f"{SITE_URL}/{folder}/{slug}"
         })
 
-    all_items.sort(key=lambda x: x["dt"], reverse=True)
+    # Terbaru dulu; item tanpa tanggal di belakang, urutan file dipertahankan
+    all_items.sort(key=lambda x: (x["dt"] is not None, x["dt"] or datetime.min), reverse=True)
     all_items = all_items[:20]
 
     def xml_escape(s: str) -> str:
@@ -716,19 +542,23 @@ def build_rss_feed(files: list, content_index: dict) -> str:
 
     item_blocks = []
     for item in all_items:
-        pub_date = email.utils.format_datetime(item["dt"])
+        pub_date = (f"\n    <pubDate>{email.utils.format_datetime(item['dt'])}</pubDate>"
+                    if item["dt"] else "")
         category = "Tool" if item["folder"] == "tools" else "Article"
         desc_val = xml_escape(item["excerpt"]) if item["excerpt"] else xml_escape(item["title"])
         item_blocks.append(f"""  <item>
     <title>{xml_escape(item['title'])}</title>
     <link>{item['url']}</link>
     <guid isPermaLink="true">{item['url']}</guid>
-    <description>{desc_val}</description>
-    <pubDate>{pub_date}</pubDate>
+    <description>{desc_val}</description>{pub_date}
     <category>{category}</category>
   </item>""")
 
-    last_build = email.utils.format_datetime(datetime.utcnow())
+    # lastBuildDate = item terbaru (bukan waktu run) → feed stabil antar run
+    # Tanpa item bertanggal → tanpa lastBuildDate (opsional di RSS 2.0)
+    newest     = all_items[0]["dt"] if all_items else None
+    last_build = (f"\n    <lastBuildDate>{email.utils.format_datetime(newest)}</lastBuildDate>"
+                  if newest else "")
     items_xml  = "\n".join(item_blocks)
 
     return f"""<?xml version="1.0" encoding="UTF-8"?>
@@ -737,8 +567,7 @@ def build_rss_feed(files: list, content_index: dict) -> str:
     <title>SaaS Tools — Calculators &amp; Guides for Bootstrapped Founders</title>
     <link>{SITE_URL}</link>
     <description>Free financial calculators and practical guides for bootstrapped SaaS founders. No fluff, no VC narratives.</description>
-    <language>en-us</language>
-    <lastBuildDate>{last_build}</lastBuildDate>
+    <language>en-us</language>{last_build}
     <atom:link href="{SITE_URL}/feed.xml" rel="self" type="application/rss+xml"/>
 {items_xml}
   </channel>
@@ -748,6 +577,7 @@ def build_rss_feed(files: list, content_index: dict) -> str:
 # HOMEPAGE
 # ─────────────────────────────────────────────
 
+@tracing.traced()
 def build_homepage(files: list, content_index: dict) -> str:
     """Build homepage index.html with exploration components (no emoji)."""
     article_files = sorted(
@@ -836,10 +666,8 @@ def build_homepage(files: list, content_index: dict) -> str:
   <link rel="manifest" href="/favicon/site.webmanifest" />
   {_FONT}
   <link rel="alternate" type="application/rss+xml" title="SaaS Tools Feed" href="/feed.xml">
+  {SITE_CSS.link()}
   <style>
-{_BASE_CSS}
-{_NAV_CSS}
-{_FOOTER_CSS}
 {_HOMEPAGE_CSS}
 /* EXPLORATION COMPONENTS (No Emoji, Responsive) */
 .explore-controls {{
@@ -1057,6 +885,7 @@ def build_homepage(files: list, content_index: dict) -> str:
 # ARTICLES INDEX
 # ─────────────────────────────────────────────
 
+@tracing.traced()
 def build_articles_index(files: list, content_index: dict) -> str:
     """Build articles/index.html with exploration components (no emoji)."""
     article_files = sorted(
@@ -1118,10 +947,8 @@ def build_articles_index(files: list, content_index: dict) -> str:
   <link rel="manifest" href="/favicon/site.webmanifest" />
   {_FONT}
   <link rel="alternate" type="application/rss+xml" title="SaaS Tools Feed" href="/feed.xml">
+  {SITE_CSS.link()}
   <style>
-{_BASE_CSS}
-{_NAV_CSS}
-{_FOOTER_CSS}
 {_HOMEPAGE_CSS}
 {_INDEX_CSS}
 /* EXPLORATION COMPONENTS (No Emoji, Responsive) */
@@ -1298,6 +1125,7 @@ def build_articles_index(files: list, content_index: dict) -> str:
 # TOOLS INDEX
 # ─────────────────────────────────────────────
 
+@tracing.traced()
 def build_tools_index(files: list, content_index: dict) -> str:
     """Build tools/index.html with exploration components (no emoji)."""
     tool_files = sorted(
@@ -1347,10 +1175,8 @@ def build_tools_index(files: list, content_index: dict) -> str:
   <link rel="manifest" href="/favicon/site.webmanifest" />
   {_FONT}
   <link rel="alternate" type="application/rss+xml" title="SaaS Tools Feed" href="/feed.xml">
+  {SITE_CSS.link()}
   <style>
-{_BASE_CSS}
-{_NAV_CSS}
-{_FOOTER_CSS}
 {_HOMEPAGE_CSS}
 {_INDEX_CSS}
 /* EXPLORATION COMPONENTS (No Emoji, Responsive) */
@@ -1524,135 +1350,70 @@ def build_tools_index(files: list, content_index: dict) -> str:
 
 
 # ─────────────────────────────────────────────
-# PUBLISH HELPER
+# CONTENT INDEX COMPACTION
 # ─────────────────────────────────────────────
 
-def publish_file(path: str, content: str, label: str):
-    """Publish satu file ke branch output."""
-    url = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}"
-    sha = None
-    try:
-        req = urllib.request.Request(
-            f"{url}?ref={OUTPUT_BRANCH}", headers=_headers()
-        )
-        with urllib.request.urlopen(req, timeout=60) as r:
-            sha = json.loads(r.read()).get("sha")
-    except Exception:
-        pass
-
-    payload = {
-        "message": f"[sitemap] {label} {datetime.utcnow().strftime('%Y-%m-%d')}",
-        "content": base64.b64encode(content.encode("utf-8")).decode("utf-8"),
-        "branch":  OUTPUT_BRANCH
-    }
-    if sha:
-        payload["sha"] = sha
-
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={**_headers(), "Content-Type": "application/json"},
-        method="PUT"
-    )
-    with urllib.request.urlopen(req, timeout=60) as r:
-        print(f"{label} published: HTTP {r.status}")
-
-
-# ─────────────────────────────────────────────
-# CONTENT INDEX PRUNING
-# ─────────────────────────────────────────────
-
-def prune_content_index(files: list) -> None:
+@tracing.traced()
+def compact_content_index(files: list) -> tuple:
     """
-    Hapus entri dari content-index.json yang file-nya
-    sudah tidak ada di branch output.
+    content-index.json terkini: hasil kompaksi terakhir + event log yang
+    tertunda (content_index.py), tanpa entri yang file-nya sudah tidak ada
+    di branch output.
+    Return (index, body, consumed): body = isi baru content-index.json atau
+    None jika tidak berubah; consumed = file event yang dihapus di commit ini.
     """
-    path    = "content-index.json"
-    api_url = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}"
-
-    sha   = None
-    index = {"articles": [], "tools": []}
-    try:
-        req = urllib.request.Request(
-            f"{api_url}?ref={OUTPUT_BRANCH}", headers=_headers()
-        )
-        with urllib.request.urlopen(req) as r:
-            data  = json.loads(r.read())
-            sha   = data.get("sha")
-            raw   = base64.b64decode(data["content"]).decode("utf-8")
-            index = json.loads(raw)
-    except Exception:
-        print("content-index.json not found — skip pruning")
-        return
-
-    active_slugs = set()
-    for f in files:
-        slug = f["name"].replace(".html", "").replace(".md", "")
-        slug = re.sub(r'^\d{4}-\d{2}-\d{2}-', '', slug)
-        active_slugs.add(slug)
-
-    before_articles = len(index.get("articles", []))
-    before_tools    = len(index.get("tools", []))
-
-    index["articles"] = [
-        e for e in index.get("articles", [])
-        if e["slug"] in active_slugs
-    ]
-    index["tools"] = [
-        e for e in index.get("tools", [])
-        if e["slug"] in active_slugs
-    ]
-
-    removed = (before_articles + before_tools) - \
-              (len(index["articles"]) + len(index["tools"]))
-
-    if removed == 0:
-        print("content-index.json: no stale entries found")
-        return
-
-    payload = {
-        "message": f"[sitemap] Prune {removed} stale entries from content-index",
-        "content": base64.b64encode(
-            json.dumps(index, indent=2).encode("utf-8")
-        ).decode("utf-8"),
-        "branch":  OUTPUT_BRANCH,
-        "sha":     sha
-    }
-    req = urllib.request.Request(
-        api_url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={**_headers(), "Content-Type": "application/json"},
-        method="PUT"
-    )
+    # Listing output gagal / kosong → jangan prune (semua entri akan hilang)
+    active = {file_to_slug(f["name"]) for f in files} if files else None
     try:
-        with urllib.request.urlopen(req) as r:
-            print(f"content-index.json pruned: {removed} entries removed "
-                  f"(HTTP {r.status})")
+        return content_index.compact(_store(), active)
     except Exception as e:
-        print(f"Warning: Could not prune content-index.json: {e}")
+        print(f"Warning: content index tidak bisa dikompaksi, skip update index: {e}")
+        return content_index.empty(), None, []
 
 
 # ─────────────────────────────────────────────
 # MAIN
 # ─────────────────────────────────────────────
 
-if __name__ == "__main__":
+def main():
     print("Generating sitemap and index pages...")
     files = get_output_files()
     print(f"Found {len(files)} content files in output branch")
 
-    content_index = get_content_index()
-    print(f"Content index: {len(content_index.get('articles', []))} articles, "
-          f"{len(content_index.get('tools', []))} tools")
+    index, index_body, consumed = compact_content_index(files)
+    print(f"Content index: {len(index.get('articles', []))} articles, "
+          f"{len(index.get('tools', []))} tools")
 
-    publish_file("sitemap.xml",         build_sitemap(files),                         "Sitemap")
-    publish_file("index.html",          build_homepage(files, content_index),         "Homepage")
-    publish_file("articles/index.html", build_articles_index(files, content_index),   "Articles index")
-    publish_file("tools/index.html",    build_tools_index(files, content_index),      "Tools index")
+    # Semua halaman index + sitemap + feed masuk SATU commit ke branch output
+    batch = PublishBatch(
+        f"[sitemap] Rebuild indexes {clock.utcnow().strftime('%Y-%m-%d')}",
+        repo=ENGINE_REPO, branch=OUTPUT_BRANCH
+    )
+    batch.add("sitemap.xml",         build_sitemap(files, index))
+    assets.add_to(batch, _store())
+    batch.add("index.html",          minify_page(build_homepage(files, index), "index"))
+    batch.add("articles/index.html", minify_page(build_articles_index(files, index), "articles"))
+    batch.add("tools/index.html",    minify_page(build_tools_index(files, index), "tools"))
     try:
-        publish_file("feed.xml",        build_rss_feed(files, content_index),         "RSS feed")
+        batch.add("feed.xml",        build_rss_feed(files, index))
     except Exception as e:
         print(f"Warning: RSS feed generation failed: {e}")
-    prune_content_index(files)
+
+    # Index hasil kompaksi + hapus event yang sudah diterapkan, satu commit
+    if index_body is not None:
+        batch.add(content_index.INDEX_PATH, index_body)
+    for path in consumed:
+        batch.remove(path)
+
+    with tracing.span("publish_commit", files=len(batch)):
+        committed = batch.commit()
+    if not committed:
+        print("FATAL: Gagal commit rebuild indexes & sitemap")
+        raise SystemExit(1)
 
     print("Done")
+
+
+if __name__ == "__main__":
+    with tracing.span("sitemap_gen"):
+        main()
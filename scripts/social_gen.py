@@ -17,12 +17,14 @@ import os
 import re
 import sys
 import json
-import base64
-import urllib.request
 import urllib.error
-import urllib.parse
 from datetime import datetime
 
+import http_client
+import tracing
+import html_meta
+from publisher import output_store
+
 # ── Environment ───────────────────────────────────────────────────────────────
 ENGINE_REPO    = os.environ.get("ENGINE_REPO", "")
 GITHUB_TOKEN   = os.environ.get("GITHUB_TOKEN", "")
@@ -47,7 +49,6 @@ MASTODON_ACCESS_TOKEN = os.environ.get("MASTODON_ACCESS_TOKEN", "")
 # Company Page creation diblokir LinkedIn (waitlist verifikasi workplace, tanpa ETA).
 
 OUTPUT_BRANCH = "output"
-API_BASE      = "https://api.github.com"
 
 # ── AI endpoints & model priority ────────────────────────────────────────────
 OR_URL = "https://openrouter.ai/api/v1/chat/completions"
@@ -72,86 +73,42 @@ if DEEPSEEK_KEY:
 
 # ── GitHub helpers ─────────────────────────────────────────────────────────────
 
-def _gh_headers() -> dict:
-    return {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept":        "application/vnd.github.v3+json",
-        "User-Agent":    "ai-engine"
-    }
-
-
+@tracing.traced()
 def fetch_article_html(folder: str, slug: str) -> str:
     """
     Fetch HTML dari output branch.
     Publisher menulis file tanpa date prefix: articles/slug.html
     """
     path = f"{folder}/{slug}.html"
-    url  = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}?ref={OUTPUT_BRANCH}"
-    req  = urllib.request.Request(url, headers=_gh_headers())
     try:
-        with urllib.request.urlopen(req, timeout=30) as r:
-            data = json.loads(r.read())
-            return base64.b64decode(data["content"]).decode("utf-8")
+        return output_store(ENGINE_REPO, OUTPUT_BRANCH).read(path)
     except urllib.error.HTTPError as e:
         raise RuntimeError(f"Gagal fetch {path}: HTTP {e.code}")
+    except FileNotFoundError:
+        raise RuntimeError(f"Gagal fetch {path}: tidak ada")
 
 
+@tracing.traced()
 def save_social_post(slug: str, posts: dict) -> None:
     """Simpan generated posts ke social_posts/{slug}.json di output branch."""
-    path    = f"social_posts/{slug}.json"
-    api_url = f"{API_BASE}/repos/{ENGINE_REPO}/contents/{path}"
-
-    sha = None
-    try:
-        req = urllib.request.Request(
-            f"{api_url}?ref={OUTPUT_BRANCH}", headers=_gh_headers()
-        )
-        with urllib.request.urlopen(req, timeout=15) as r:
-            sha = json.loads(r.read()).get("sha")
-    except Exception:
-        pass
-
-    payload = {
-        "message": f"[social] Generated posts for {slug}",
-        "content": base64.b64encode(
-            json.dumps(posts, indent=2, ensure_ascii=False).encode()
-        ).decode(),
-        "branch": OUTPUT_BRANCH
-    }
-    if sha:
-        payload["sha"] = sha
-
-    req = urllib.request.Request(
-        api_url,
-        data=json.dumps(payload).encode(),
-        headers={**_gh_headers(), "Content-Type": "application/json"},
-        method="PUT"
+    path = f"social_posts/{slug}.json"
+    ok = output_store(ENGINE_REPO, OUTPUT_BRANCH).write(
+        path, json.dumps(posts, indent=2, ensure_ascii=False),
+        f"[social] Generated posts for {slug}"
     )
-    with urllib.request.urlopen(req, timeout=30) as r:
-        print(f"Social post saved: HTTP {r.status}")
+    print(f"Social post saved: {'OK' if ok else 'FAILED'}")
 
 
 # ── Content extraction ─────────────────────────────────────────────────────────
 
 def strip_html(html: str) -> str:
-    html = re.sub(r'<script[^>]*>.*?</script>', ' ', html,
-                  flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<style[^>]*>.*?</style>', ' ', html,
-                  flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<[^>]+>', ' ', html)
-    return re.sub(r'\s+', ' ', html).strip()
+    return html_meta.extract(html).text
 
 
 def extract_meta(html: str) -> dict:
-    title_m = re.search(r'<title>([^<]+)</title>', html, re.IGNORECASE)
-    desc_m  = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']',
-        html, re.IGNORECASE
-    )
-    title = title_m.group(1).strip() if title_m else ""
-    title = re.sub(r'\s*[—\-]\s*SaaS Tools.*$', '', title).strip()
-    desc  = desc_m.group(1).strip() if desc_m else ""
-    return {"title": title, "description": desc}
+    meta  = html_meta.extract(html)
+    title = re.sub(r'\s*[—\-]\s*SaaS Tools.*$', '', meta.title).strip()
+    return {"title": title, "description": meta.description}
 
 
 # ── AI call — identik pola dengan auto_generate.py ────────────────────────────
@@ -196,27 +153,23 @@ def call_ai(messages: list, label: str = "") -> str:
             print(f"    Skip {model}: key tidak tersedia.")
             continue
 
-        payload = json.dumps({
+        payload = {
             "model":      model,
             "messages":   messages,
             "max_tokens": 700,
-        }).encode("utf-8")
-
-        req = urllib.request.Request(
-            url,
-            data=payload,
-            headers={
-                "Authorization": f"Bearer {key}",
-                "Content-Type":  "application/json",
-                "HTTP-Referer":  SITE_URL,
-                "X-Title":       "SaaS Tools Content Engine",
-                "User-Agent":    "ai-engine",
-            },
-            method="POST"
-        )
+        }
+
         try:
-            with urllib.request.urlopen(req, timeout=90) as r:
-                data = json.loads(r.read())
+            data = http_client.send_json(
+                "POST", url, payload,
+                headers={
+                    "Authorization": f"Bearer {key}",
+                    "HTTP-Referer":  SITE_URL,
+                    "X-Title":       "SaaS Tools Content Engine",
+                    "User-Agent":    "ai-engine",
+                },
+                timeout=90
+            ).json()
         except urllib.error.HTTPError as e:
             body = e.read().decode(errors="replace")
             if _should_fallback(e.code, body):
@@ -248,6 +201,7 @@ def call_ai(messages: list, label: str = "") -> str:
 
 # ── Social post generation ─────────────────────────────────────────────────────
 
+@tracing.traced()
 def generate_social_posts(folder: str, slug: str, html: str) -> dict:
     """Generate Twitter + LinkedIn post via AI."""
     article_url  = f"{SITE_URL}/{folder}/{slug}"
@@ -309,6 +263,7 @@ def _build_bluesky_facets(text: str) -> list:
     return facets
 
 
+@tracing.traced()
 def post_to_bluesky(text: str) -> dict:
     """
     Post ke Bluesky via AT Protocol (gratis, tanpa billing).
@@ -322,15 +277,12 @@ def post_to_bluesky(text: str) -> dict:
     base = "https://bsky.social/xrpc"
 
     # Auth: dapat accessJwt + DID dari App Password
-    req = urllib.request.Request(
-        f"{base}/com.atproto.server.createSession",
-        data=json.dumps({"identifier": BSKY_HANDLE, "password": BSKY_APP_PASSWORD}).encode(),
-        headers={"Content-Type": "application/json"},
-        method="POST"
-    )
     try:
-        with urllib.request.urlopen(req, timeout=30) as r:
-            session = json.loads(r.read())
+        session = http_client.send_json(
+            "POST", f"{base}/com.atproto.server.createSession",
+            {"identifier": BSKY_HANDLE, "password": BSKY_APP_PASSWORD},
+            timeout=30
+        ).json()
     except urllib.error.HTTPError as e:
         raise RuntimeError(f"Bluesky auth {e.code}: {e.read().decode(errors='replace')}")
 
@@ -352,28 +304,24 @@ def post_to_bluesky(text: str) -> dict:
     if facets:
         record["facets"] = facets
 
-    req = urllib.request.Request(
-        f"{base}/com.atproto.repo.createRecord",
-        data=json.dumps({
-            "repo":       session["did"],
-            "collection": "app.bsky.feed.post",
-            "record":     record,
-        }).encode(),
-        headers={
-            "Authorization": f"Bearer {session['accessJwt']}",
-            "Content-Type":  "application/json",
-        },
-        method="POST"
-    )
     try:
-        with urllib.request.urlopen(req, timeout=30) as r:
-            result = json.loads(r.read())
+        result = http_client.send_json(
+            "POST", f"{base}/com.atproto.repo.createRecord",
+            {
+                "repo":       session["did"],
+                "collection": "app.bsky.feed.post",
+                "record":     record,
+            },
+            headers={"Authorization": f"Bearer {session['accessJwt']}"},
+            timeout=30
+        ).json()
         print(f"    Bluesky: posted → {result.get('uri', 'unknown')}")
         return result
     except urllib.error.HTTPError as e:
         raise RuntimeError(f"Bluesky post {e.code}: {e.read().decode(errors='replace')}")
 
 
+@tracing.traced()
 def post_to_mastodon(text: str) -> dict:
     """
     Post ke Mastodon via ActivityPub API (gratis).
@@ -384,18 +332,13 @@ def post_to_mastodon(text: str) -> dict:
         print("    SKIP Mastodon: MASTODON_INSTANCE / MASTODON_ACCESS_TOKEN tidak tersedia.")
         return {"skipped": True}
 
-    req = urllib.request.Request(
-        f"https://{MASTODON_INSTANCE}/api/v1/statuses",
-        data=json.dumps({"status": text[:500], "visibility": "public"}).encode(),
-        headers={
-            "Authorization": f"Bearer {MASTODON_ACCESS_TOKEN}",
-            "Content-Type":  "application/json",
-        },
-        method="POST"
-    )
     try:
-        with urllib.request.urlopen(req, timeout=30) as r:
-            result = json.loads(r.read())
+        result = http_client.send_json(
+            "POST", f"https://{MASTODON_INSTANCE}/api/v1/statuses",
+            {"status": text[:500], "visibility": "public"},
+            headers={"Authorization": f"Bearer {MASTODON_ACCESS_TOKEN}"},
+            timeout=30
+        ).json()
         print(f"    Mastodon: posted → {result.get('url', 'unknown')}")
         return result
     except urllib.error.HTTPError as e:
@@ -497,4 +440,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.span("social_gen"):
+        main()
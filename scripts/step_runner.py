@@ -0,0 +1,129 @@
+"""
+step_runner.py
+Jalankan langkah-langkah independen secara paralel dengan urutan yang tetap
+dijaga lewat dependensi.
+
+    steps = StepRunner()
+    steps.add("delete", delete_file, path, sha, msg)
+    steps.add("manifest", update_file, path, body, msg, after=("delete",))
+    steps.add("notify", notify_keyword_done, slug)
+    results = steps.run()
+
+Step dimulai begitu semua step di `after` selesai; jumlah thread dibatasi
+STEP_WORKERS. Jika step prasyarat melempar exception, step yang bergantung
+padanya di-skip. Exception tidak pernah keluar dari run(): semua hasil dan
+error dikumpulkan, lalu dicetak sebagai satu ringkasan.
+"""
+import os
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import tracing
+
+STEP_WORKERS = int(os.environ.get("STEP_WORKERS", 8))
+
+
+class StepResult:
+    def __init__(self, name: str):
+        self.name     = name
+        self.status   = "pending"   # ok | error | skipped
+        self.value    = None
+        self.error    = None
+        self.duration = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+class StepRunner:
+    def __init__(self, max_workers: int = STEP_WORKERS):
+        self.max_workers = max(max_workers, 1)
+        self._steps      = {}   # name → (fn, args, kwargs, after); urutan = urutan add
+        self.results     = {}   # name → StepResult
+        self.elapsed     = 0.0
+
+    def add(self, name: str, fn, *args, after: tuple = (), **kwargs) -> str:
+        """
+        Daftarkan step. `after`: nama step yang harus selesai lebih dulu;
+        harus sudah di-add sebelumnya (jadi graf selalu tanpa siklus).
+        Return nama step, supaya mudah dipakai sebagai dependensi berikutnya.
+        """
+        if name in self._steps:
+            raise ValueError(f"step {name!r} sudah ada")
+        missing = [dep for dep in after if dep not in self._steps]
+        if missing:
+            raise ValueError(f"step {name!r} bergantung pada step yang belum ada: {missing}")
+        self._steps[name] = (fn, args, kwargs, tuple(after))
+        return name
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    # ── Eksekusi ──────────────────────────────────────────────────────────────
+
+    def _call(self, name: str) -> StepResult:
+        fn, args, kwargs, _ = self._steps[name]
+        result  = self.results[name]
+        started = time.monotonic()
+        try:
+            with tracing.span(f"step:{name}"):
+                result.value = fn(*args, **kwargs)
+            result.status = "ok"
+        except Exception as e:
+            result.error  = e
+            result.status = "error"
+        result.duration = time.monotonic() - started
+        return result
+
+    def run(self) -> dict:
+        """Jalankan semua step. Return {nama: StepResult}."""
+        started      = time.monotonic()
+        self.results = {name: StepResult(name) for name in self._steps}
+        pending      = dict(self._steps)
+        running      = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="step") as pool:
+            while pending or running:
+                for name, (_, _, _, after) in list(pending.items()):
+                    deps   = [self.results[d] for d in after]
+                    failed = [d.name for d in deps if d.status in ("error", "skipped")]
+                    if failed:
+                        self.results[name].status = "skipped"
+                        self.results[name].error  = f"prasyarat {failed[0]} gagal"
+                        del pending[name]
+                    elif all(d.status == "ok" for d in deps):
+                        # copy_context: span step menjadi anak span pemanggil run()
+                        ctx = contextvars.copy_context()
+                        running[pool.submit(ctx.run, self._call, name)] = name
+                        del pending[name]
+                if not running:
+                    continue   # step yang di-skip bisa membuka skip berikutnya
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+
+        self.elapsed = time.monotonic() - started
+        return self.results
+
+    # ── Ringkasan ─────────────────────────────────────────────────────────────
+
+    @property
+    def failed(self) -> list:
+        return [r for r in self.results.values() if r.status != "ok"]
+
+    def summary(self, title: str = "steps") -> None:
+        counts = {}
+        for r in self.results.values():
+            counts[r.status] = counts.get(r.status, 0) + 1
+        serial = sum(r.duration for r in self.results.values())
+        parts  = ", ".join(f"{n} {s}" for s, n in sorted(counts.items()))
+        print(f"[{title}] {len(self.results)} step dalam {self.elapsed:.2f}s "
+              f"(serial {serial:.2f}s): {parts}")
+        for r in self.results.values():
+            line = f"  {r.status:<7} {r.duration:6.2f}s  {r.name}"
+            if r.error is not None:
+                line += f" — {r.error}"
+            print(line)
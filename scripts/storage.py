@@ -0,0 +1,745 @@
+"""
+storage.py
+Backend penyimpanan untuk loader (ai-brain) dan publisher (branch output).
+
+Dipilih lewat STORAGE_BACKEND:
+  github (default) — GitHub Contents API + Git Data API (perilaku lama)
+  local            — direktori lokal biasa, tanpa network
+  git              — worktree git lokal; perubahan di-stage selama run,
+                     lalu di-commit SEKALI (dan di-push jika STORAGE_PUSH=1)
+                     saat proses selesai
+
+Backend lokal memetakan setiap repo/branch ke satu direktori di bawah
+STORAGE_ROOT: "owner/ai-brain" → {STORAGE_ROOT}/ai-brain,
+"owner/ai-engine" branch output → {STORAGE_ROOT}/ai-engine@output.
+Untuk backend git, direktori tersebut harus berupa clone / worktree, mis.
+  git clone <ai-brain> .storage/ai-brain
+  git -C <ai-engine> worktree add .storage/ai-engine@output output
+
+Semua backend punya API yang sama:
+  read(path) -> str            raise FileNotFoundError jika tidak ada
+  write(path, data, message)   -> bool
+  delete(path, message, sha)   -> bool
+  list_folder(folder)          -> [{name, path, sha}]  ([] jika tidak ada)
+  list_tree()                  -> [{path, sha}]  semua file
+  folder_sha(folder)           -> sha tree folder | None  (berubah jika isi berubah)
+  commit(files, message)       -> sha | None  (atomik, banyak file sekaligus;
+                                  isi None = hapus path tersebut)
+  read_versioned(path, fresh)  -> (teks, sha)  raise FileNotFoundError
+  write_if(path, data, message, sha) -> bool   raise ConflictError jika sha
+                                  remote bukan `sha` lagi (None = belum ada)
+
+snapshot() membungkus backend github dengan SnapshotStorage: satu tarball
+per run, lalu read / list_folder dilayani dari memori.
+"""
+import io
+import os
+import time
+import atexit
+import base64
+import hashlib
+import tarfile
+import threading
+import subprocess
+import http.client
+import urllib.error
+
+import rate_limit
+import blob_registry
+import github_contents
+from fetch_cache import cache
+
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "github")
+STORAGE_ROOT    = os.environ.get("STORAGE_ROOT", ".storage")
+STORAGE_PUSH    = os.environ.get("STORAGE_PUSH", "0") == "1"
+API_BASE        = github_contents.API_BASE
+TMP_SUFFIX      = ".tmp"    # file sementara write atomik LocalStorage
+
+
+class ConflictError(RuntimeError):
+    """File berubah sejak dibaca (write_if dengan sha yang sudah basi)."""
+
+
+def _as_bytes(data) -> bytes:
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+# ─────────────────────────────────────────────
+# GITHUB API
+# ─────────────────────────────────────────────
+
+class GitHubStorage:
+    """Repo GitHub (opsional satu branch) via REST API."""
+
+    def __init__(self, repo: str, branch: str = "", token: str = ""):
+        self.repo   = repo
+        self.branch = branch
+        self.token  = token
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"token {self.token}",
+            "Accept":        "application/vnd.github.v3+json",
+            "User-Agent":    "ai-engine"
+        }
+
+    def _cache_key(self) -> str:
+        return f"{self.repo}@{self.branch}" if self.branch else self.repo
+
+    def _ref_query(self) -> str:
+        return f"?ref={self.branch}" if self.branch else ""
+
+    def read(self, path: str) -> str:
+        """
+        GET file teks. Pakai If-None-Match dari fetch_cache:
+        304 → isi diambil dari cache lokal.
+        """
+        url     = github_contents.contents_url(self.repo, path) + self._ref_query()
+        headers = self._headers()
+        key     = self._cache_key()
+        cached  = cache.get(key, path)
+        if cached:
+            # sha dari listing run ini sama dengan isi cache → tanpa request
+            known = blob_registry.lookup(self.repo, self.branch, path)
+            if known and known == cached.get("sha"):
+                cache.hits += 1
+                return cached["body"]
+            headers["If-None-Match"] = cached["etag"]
+
+        try:
+            r = rate_limit.request("GET", url, headers=headers)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                blob_registry.remember(self.repo, self.branch, path, None)
+                raise FileNotFoundError(path) from e
+            raise
+        if r.status == 304 and cached:
+            cache.hits += 1
+            if cached.get("sha"):
+                blob_registry.remember(self.repo, self.branch, path, cached["sha"])
+            return cached["body"]
+
+        data = r.json()
+        body = base64.b64decode(data["content"]).decode("utf-8")
+        blob_registry.remember(self.repo, self.branch, path, data.get("sha"))
+        cache.misses += 1
+        cache.put(key, path, r.headers.get("ETag", ""), body, data.get("sha", ""))
+        return body
+
+    def read_versioned(self, path: str, fresh: bool = False) -> tuple:
+        """
+        (isi, sha) file. fresh=True: sha dari registry tidak dipercaya, jadi
+        selalu ada GET bersyarat (304 murah jika isinya tidak berubah).
+        """
+        if fresh:
+            blob_registry.forget(self.repo, self.branch, path)
+        body = self.read(path)
+        return body, blob_registry.lookup(self.repo, self.branch, path)
+
+    def write_if(self, path: str, data, message: str, sha: str | None) -> bool:
+        cache.invalidate(self._cache_key(), path)
+        try:
+            r = github_contents.put_if(self.repo, path, _as_bytes(data), message, sha,
+                                       self._headers(), branch=self.branch)
+        except urllib.error.HTTPError as e:
+            if e.code in (409, 422):
+                raise ConflictError(f"{path}: HTTP {e.code}") from e
+            raise
+        return r is None or r.status in (200, 201)
+
+    def write(self, path: str, data, message: str) -> bool:
+        cache.invalidate(self._cache_key(), path)
+        r = github_contents.put_file(self.repo, path, _as_bytes(data), message,
+                                     self._headers(), branch=self.branch)
+        return r is None or r.status in (200, 201)
+
+    def delete(self, path: str, message: str, sha: str = "") -> bool:
+        cache.invalidate(self._cache_key(), path)
+        sha = sha or github_contents.current_sha(self.repo, path, self._headers(),
+                                                 ref=self.branch)
+        if not sha:
+            return True
+        payload = {"message": message, "sha": sha}
+        if self.branch:
+            payload["branch"] = self.branch
+        try:
+            r = rate_limit.send_json("DELETE", github_contents.contents_url(self.repo, path),
+                                     payload, headers=self._headers())
+        except Exception:
+            blob_registry.forget(self.repo, self.branch, path)
+            return False
+        blob_registry.remember(self.repo, self.branch, path, None)
+        return r.status == 200
+
+    def list_folder(self, folder: str) -> list:
+        url = github_contents.contents_url(self.repo, folder) + self._ref_query()
+        try:
+            items = rate_limit.get_json(url, headers=self._headers())
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return []  # Folder tidak ada, anggap kosong
+            raise
+        files = [
+            {"name": i["name"], "path": i["path"], "sha": i["sha"]}
+            for i in items if i["type"] == "file"
+        ]
+        blob_registry.remember_listing(self.repo, self.branch, folder, files)
+        return files
+
+    def folder_sha(self, folder: str) -> str | None:
+        """
+        sha tree folder dari listing folder induknya (1 request). File di
+        folder induk ikut dicatat di blob_registry, jadi read berikutnya di
+        sana (mis. manifest.json) bisa dilayani dari fetch_cache tanpa GET.
+        """
+        folder = folder.strip("/")
+        parent, _, name = folder.rpartition("/")
+        url = github_contents.contents_url(self.repo, parent) + self._ref_query()
+        try:
+            items = rate_limit.get_json(url, headers=self._headers())
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        files = [{"name": i["name"], "path": i["path"], "sha": i["sha"]}
+                 for i in items if i["type"] == "file"]
+        blob_registry.remember_listing(self.repo, self.branch, parent, files)
+        return next((i["sha"] for i in items
+                     if i["name"] == name and i["type"] == "dir"), None)
+
+    def list_tree(self) -> list:
+        """Semua blob via Git Trees API (tidak kena limit 1000 file Contents API)."""
+        ref  = self.branch or "HEAD"
+        url  = f"{API_BASE}/repos/{self.repo}/git/trees/{ref}?recursive=1"
+        data = rate_limit.get_json(url, headers=self._headers())
+        tree = data.get("tree", [])
+        if not data.get("truncated"):
+            blob_registry.remember_tree(self.repo, self.branch, tree)
+        return [{"path": i["path"], "sha": i["sha"]}
+                for i in tree if i.get("type") == "blob"]
+
+    # ── Commit atomik (Git Data API) ──────────────────────────────────────────
+
+    def _git_api(self, method: str, url: str, payload: dict | None = None) -> dict:
+        """Satu call ke Git Data API. Raise urllib.error.HTTPError jika gagal."""
+        if payload is None:
+            return rate_limit.request(method, url, headers=self._headers(),
+                                      timeout=60).json()
+        return rate_limit.send_json(method, url, payload, headers=self._headers(),
+                                    timeout=60).json()
+
+    def _tree_entries(self, files: dict, paths: list, blobs: dict) -> list:
+        base    = f"{API_BASE}/repos/{self.repo}"
+        entries = []
+        for path in paths:
+            content = files[path]
+            entry   = {"path": path, "mode": "100644", "type": "blob"}
+            if content is None:
+                entry["sha"] = None   # hapus path dari tree
+            elif isinstance(content, str):
+                entry["content"] = content
+            else:
+                if path not in blobs:
+                    blob = self._git_api("POST", f"{base}/git/blobs", {
+                        "content":  base64.b64encode(content).decode("utf-8"),
+                        "encoding": "base64"
+                    })
+                    blobs[path] = blob["sha"]
+                entry["sha"] = blobs[path]
+            entries.append(entry)
+        return entries
+
+    def _remember_all(self, files: dict) -> None:
+        for path, content in files.items():
+            blob_registry.remember(self.repo, self.branch, path,
+                                   None if content is None
+                                   else blob_registry.git_blob_sha(content))
+
+    def _unchanged(self, path: str, content) -> bool:
+        if content is None:
+            return (blob_registry.known(self.repo, self.branch, path)
+                    and blob_registry.lookup(self.repo, self.branch, path) is None)
+        return blob_registry.unchanged(self.repo, self.branch, path, content)
+
+    def commit(self, files: dict, message: str, max_attempts: int = 4) -> str | None:
+        """
+        Alur:
+          1. GET  branches/{branch}        → head commit + tree sha (1 call)
+          2. POST git/blobs                → hanya untuk file binary (PNG, dll)
+          3. POST git/trees (base_tree)    → file teks di-inline langsung di tree
+          4. POST git/commits
+          5. PATCH git/refs/heads/{branch} → force=false (fast-forward only)
+
+        Jika ref bergeser di tengah jalan (422 non-fast-forward), ulangi dari
+        langkah 1 di atas head yang baru. Blob yang sudah dibuat dipakai ulang.
+        File yang sha blob-nya sama dengan sha remote (blob_registry) dibuang
+        dari tree; jika tidak ada yang berubah tidak ada commit yang dibuat.
+        Isi None menghapus path (dilewati jika sudah diketahui tidak ada).
+        """
+        paths   = sorted(files)
+        changed = [p for p in paths if not self._unchanged(p, files[p])]
+        skipped = len(paths) - len(changed)
+        if skipped:
+            print(f"PublishBatch: {skipped} file tidak berubah, dilewati")
+
+        base  = f"{API_BASE}/repos/{self.repo}"
+        blobs = {}
+        for attempt in range(1, max_attempts + 1):
+            try:
+                branch    = self._git_api("GET", f"{base}/branches/{self.branch}")
+                head_sha  = branch["commit"]["sha"]
+                base_tree = branch["commit"]["commit"]["tree"]["sha"]
+                if not changed:
+                    print(f"PublishBatch: tidak ada perubahan, "
+                          f"{self.branch} tetap @{head_sha[:7]}")
+                    return head_sha
+
+                tree = self._git_api("POST", f"{base}/git/trees", {
+                    "base_tree": base_tree,
+                    "tree":      self._tree_entries(files, changed, blobs)
+                })
+                if tree["sha"] == base_tree:
+                    print(f"PublishBatch: isi sama dengan {self.branch}, "
+                          f"skip commit kosong")
+                    self._remember_all(files)
+                    return head_sha
+                commit = self._git_api("POST", f"{base}/git/commits", {
+                    "message": message,
+                    "tree":    tree["sha"],
+                    "parents": [head_sha]
+                })
+                self._git_api("PATCH", f"{base}/git/refs/heads/{self.branch}", {
+                    "sha":   commit["sha"],
+                    "force": False
+                })
+            except urllib.error.HTTPError as e:
+                body = e.read().decode(errors="replace")
+                # 422 = ref sudah bergeser (non-fast-forward) → rebase & ulangi
+                if e.code in (409, 422) and attempt < max_attempts:
+                    print(f"PublishBatch: ref {self.branch} bergeser "
+                          f"(HTTP {e.code}), retry {attempt}/{max_attempts}...")
+                    time.sleep(attempt)
+                    continue
+                if e.code >= 500 and attempt < max_attempts:
+                    print(f"PublishBatch: HTTP {e.code}, retry {attempt}/{max_attempts}...")
+                    time.sleep(attempt)
+                    continue
+                print(f"PublishBatch error: HTTP {e.code} {body[:300]}")
+                return None
+            except (OSError, http.client.HTTPException) as e:
+                # Timeout / koneksi putus. Aman diulang dari langkah 1: jika ref
+                # ternyata sudah dipindah, tree baru == base_tree → tanpa commit kedua
+                if attempt < max_attempts:
+                    print(f"PublishBatch: {type(e).__name__}: {e}, "
+                          f"retry {attempt}/{max_attempts}...")
+                    time.sleep(attempt)
+                    continue
+                print(f"PublishBatch error: {type(e).__name__}: {e}")
+                return None
+
+            self._remember_all(files)
+            print(f"PublishBatch: {len(changed)} file → "
+                  f"{self.branch}@{commit['sha'][:7]}")
+            return commit["sha"]
+
+        return None
+
+
+# ─────────────────────────────────────────────
+# DIREKTORI LOKAL
+# ─────────────────────────────────────────────
+
+def _ignored(name: str) -> bool:
+    """.git (direktori di clone, FILE di worktree) dan sisa write yang terputus."""
+    return name == ".git" or name.endswith(TMP_SUFFIX)
+
+
+class LocalStorage:
+    """Direktori lokal biasa. Commit = tulis semua file (tanpa history)."""
+
+    _cas_lock = threading.Lock()
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _abs(self, path: str) -> str:
+        root = os.path.normpath(self.root)
+        full = os.path.normpath(os.path.join(root, path))
+        if full != root and not full.startswith(root + os.sep):
+            raise ValueError(f"path di luar storage: {path}")
+        return full
+
+    def read(self, path: str) -> str:
+        with open(self._abs(path), encoding="utf-8") as f:
+            return f.read()
+
+    def _write_bytes(self, path: str, data: bytes) -> bool:
+        """Tulis atomik. Return False jika isi sama (tidak ditulis)."""
+        full = self._abs(path)
+        try:
+            with open(full, "rb") as f:
+                if f.read() == data:
+                    return False
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        tmp = full + TMP_SUFFIX
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, full)
+        return True
+
+    def write(self, path: str, data, message: str) -> bool:
+        try:
+            self._write_bytes(path, _as_bytes(data))
+        except OSError as e:
+            print(f"storage write error for {path}: {e}")
+            return False
+        return True
+
+    def read_versioned(self, path: str, fresh: bool = False) -> tuple:
+        full = self._abs(path)
+        with open(full, "rb") as f:
+            data = f.read()
+        return data.decode("utf-8"), blob_registry.git_blob_sha(data)
+
+    def write_if(self, path: str, data, message: str, sha: str | None) -> bool:
+        with self._cas_lock:
+            full    = self._abs(path)
+            current = self._file_sha(full) if os.path.isfile(full) else None
+            if current != sha:
+                raise ConflictError(f"{path}: sha {current} != {sha}")
+            return self.write(path, data, message)
+
+    def delete(self, path: str, message: str, sha: str = "") -> bool:
+        try:
+            os.remove(self._abs(path))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"storage delete error for {path}: {e}")
+            return False
+        return True
+
+    def _file_sha(self, full: str) -> str:
+        with open(full, "rb") as f:
+            return blob_registry.git_blob_sha(f.read())
+
+    def list_folder(self, folder: str) -> list:
+        try:
+            entries = sorted(os.scandir(self._abs(folder)), key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        return [
+            {"name": e.name, "path": f"{folder.strip('/')}/{e.name}",
+             "sha": self._file_sha(e.path)}
+            for e in entries if e.is_file() and not _ignored(e.name)
+        ]
+
+    def folder_sha(self, folder: str) -> str | None:
+        if not os.path.isdir(self._abs(folder)):
+            return None
+        return blob_registry.git_tree_sha(self.list_folder(folder))
+
+    def list_tree(self) -> list:
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if not _ignored(d))
+            for name in sorted(n for n in filenames if not _ignored(n)):
+                full = os.path.join(dirpath, name)
+                rel  = os.path.relpath(full, self.root).replace(os.sep, "/")
+                files.append({"path": rel, "sha": self._file_sha(full)})
+        return files
+
+    def commit(self, files: dict, message: str) -> str | None:
+        written = 0
+        try:
+            for path in sorted(files):
+                if files[path] is None:
+                    if os.path.exists(self._abs(path)):
+                        os.remove(self._abs(path))
+                        written += 1
+                    continue
+                written += self._write_bytes(path, _as_bytes(files[path]))
+        except OSError as e:
+            print(f"PublishBatch error: {e}")
+            return None
+        print(f"PublishBatch: {written} file → {self.root}")
+        # "sha" tree-like dari isi batch, supaya caller tetap dapat id non-kosong
+        digest = hashlib.sha1()
+        for path in sorted(files):
+            sha = "" if files[path] is None else blob_registry.git_blob_sha(files[path])
+            digest.update(f"{path}\0{sha}\n".encode())
+        return digest.hexdigest()
+
+
+# ─────────────────────────────────────────────
+# WORKTREE GIT LOKAL
+# ─────────────────────────────────────────────
+
+class GitStorage(LocalStorage):
+    """
+    Worktree git lokal. Setiap write/delete/commit hanya men-stage perubahan;
+    finish() membuat satu commit berisi semua pesan, lalu push (opsional).
+    """
+
+    def __init__(self, root: str, push: bool = False):
+        super().__init__(root)
+        self.push      = push
+        self._messages = []
+        self._lock     = threading.Lock()
+
+    def _git(self, *args) -> str:
+        r = subprocess.run(["git", "-C", self.root, *args],
+                           capture_output=True, text=True, check=True)
+        return r.stdout.strip()
+
+    def _stage(self, paths: list, message: str) -> None:
+        with self._lock:
+            try:
+                self._git("add", "-A", "--ignore-errors", "--", *paths)
+            except subprocess.CalledProcessError as e:
+                # path yang dihapus tapi belum pernah di-track → tidak ada yang di-stage
+                print(f"Warning: [storage] git add: {e.stderr.strip()[:200]}")
+                return
+            if message not in self._messages:
+                self._messages.append(message)
+
+    def write(self, path: str, data, message: str) -> bool:
+        if not super().write(path, data, message):
+            return False
+        self._stage([path], message)
+        return True
+
+    def delete(self, path: str, message: str, sha: str = "") -> bool:
+        if not super().delete(path, message, sha):
+            return False
+        self._stage([path], message)
+        return True
+
+    def commit(self, files: dict, message: str) -> str | None:
+        if LocalStorage.commit(self, files, message) is None:
+            return None
+        try:
+            self._stage(sorted(files), message)
+            return self._git("write-tree")
+        except subprocess.CalledProcessError as e:
+            print(f"PublishBatch error: git {e.stderr.strip()[:300]}")
+            return None
+
+    def finish(self) -> None:
+        """Commit semua perubahan yang di-stage (1 commit), lalu push."""
+        with self._lock:
+            messages, self._messages = self._messages, []
+        if not messages:
+            return
+        try:
+            if not self._git("diff", "--cached", "--name-only"):
+                return
+            subject = messages[0] if len(messages) == 1 else \
+                f"[storage] {len(messages)} changes"
+            body = "\n".join(f"- {m}" for m in messages) if len(messages) > 1 else ""
+            args = ["commit", "-q", "-m", subject] + (["-m", body] if body else [])
+            self._git(*args)
+            print(f"[storage] commit {self.root}@{self._git('rev-parse', '--short', 'HEAD')}")
+            if self.push:
+                self._git("push", "-q")
+                print(f"[storage] pushed {self.root}")
+        except subprocess.CalledProcessError as e:
+            print(f"Warning: [storage] git gagal di {self.root}: {e.stderr.strip()[:300]}")
+
+
+# ─────────────────────────────────────────────
+# SNAPSHOT TARBALL (baca massal, 1 request)
+# ─────────────────────────────────────────────
+
+class SnapshotStorage:
+    """
+    Bungkus GitHubStorage: tarball repo diunduh SEKALI (saat read/list
+    pertama), di-stream lewat tarfile di memori (tanpa file sementara), lalu
+    read / list_folder dilayani dari memori. Membaca 100 draft = 1 request,
+    dan tidak kena batas 1 MB per file Contents API.
+
+    Hanya path di bawah salah satu prefixes yang disimpan; path lain
+    diteruskan ke backend asli. Write / delete / commit selalu diteruskan,
+    lalu snapshot di-update supaya read berikutnya tetap konsisten.
+    """
+
+    def __init__(self, inner: GitHubStorage, prefixes: tuple = ("",)):
+        self.inner    = inner
+        self.repo     = inner.repo
+        self.branch   = inner.branch
+        self.prefixes = tuple(p.strip("/") for p in prefixes) or ("",)
+        self._files   = None   # path → bytes
+        self._lock    = threading.Lock()
+
+    def _covered(self, path: str) -> bool:
+        path = path.strip("/")
+        return any(not p or path == p or path.startswith(p + "/") for p in self.prefixes)
+
+    def _load(self) -> dict:
+        with self._lock:
+            if self._files is None:
+                self._files = self._download()
+            return self._files
+
+    def _download(self) -> dict:
+        url = f"{API_BASE}/repos/{self.repo}/tarball"
+        if self.branch:
+            url += f"/{self.branch}"
+        r = rate_limit.request("GET", url, headers=self.inner._headers(), timeout=120)
+
+        files = {}
+        with tarfile.open(fileobj=io.BytesIO(r.body), mode="r|gz") as tar:
+            for member in tar:
+                if not member.isfile() or "/" not in member.name:
+                    continue
+                path = member.name.split("/", 1)[1]   # buang "owner-repo-sha/"
+                if self._covered(path):
+                    files[path] = tar.extractfile(member).read()
+
+        # sha blob semua file → write berikutnya tidak perlu GET sha
+        folders = {}
+        for path, data in files.items():
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            folders.setdefault(parent, []).append(
+                {"path": path, "sha": blob_registry.git_blob_sha(data)}
+            )
+        for folder, items in folders.items():
+            blob_registry.remember_listing(self.repo, self.branch, folder, items)
+        print(f"[snapshot] {self.repo}: {len(files)} file, "
+              f"{len(r.body) / 1024:.0f} KB tarball")
+        return files
+
+    def files(self) -> dict:
+        """Semua file yang tercakup prefixes: {path: bytes} (dipakai replay.py)."""
+        return dict(self._load())
+
+    def read(self, path: str) -> str:
+        if not self._covered(path):
+            return self.inner.read(path)
+        files = self._load()
+        if path not in files:
+            raise FileNotFoundError(path)
+        return files[path].decode("utf-8")
+
+    def list_folder(self, folder: str) -> list:
+        folder = folder.strip("/")
+        if not self._covered(folder):
+            return self.inner.list_folder(folder)
+        prefix = f"{folder}/" if folder else ""
+        return [
+            {"name": path[len(prefix):], "path": path,
+             "sha": blob_registry.git_blob_sha(data)}
+            for path, data in sorted(self._load().items())
+            if path.startswith(prefix) and "/" not in path[len(prefix):]
+        ]
+
+    def folder_sha(self, folder: str) -> str | None:
+        if not self._covered(folder):
+            return self.inner.folder_sha(folder)
+        items = self.list_folder(folder)
+        return blob_registry.git_tree_sha(items) if items else None
+
+    def list_tree(self) -> list:
+        if self.prefixes != ("",):
+            return self.inner.list_tree()
+        return [{"path": p, "sha": blob_registry.git_blob_sha(d)}
+                for p, d in sorted(self._load().items())]
+
+    def _update(self, path: str, data) -> None:
+        with self._lock:
+            if self._files is None or not self._covered(path):
+                return
+            if data is None:
+                self._files.pop(path, None)
+            else:
+                self._files[path] = _as_bytes(data)
+
+    def write(self, path: str, data, message: str) -> bool:
+        ok = self.inner.write(path, data, message)
+        if ok:
+            self._update(path, data)
+        return ok
+
+    def read_versioned(self, path: str, fresh: bool = False) -> tuple:
+        # Selalu dari backend asli: snapshot bisa lebih tua dari isi remote
+        return self.inner.read_versioned(path, fresh)
+
+    def write_if(self, path: str, data, message: str, sha: str | None) -> bool:
+        ok = self.inner.write_if(path, data, message, sha)
+        if ok:
+            self._update(path, data)
+        return ok
+
+    def delete(self, path: str, message: str, sha: str = "") -> bool:
+        ok = self.inner.delete(path, message, sha)
+        if ok:
+            self._update(path, None)
+        return ok
+
+    def commit(self, files: dict, message: str) -> str | None:
+        sha = self.inner.commit(files, message)
+        if sha:
+            for path, data in files.items():
+                self._update(path, data)
+        return sha
+
+
+# ─────────────────────────────────────────────
+# PEMILIHAN BACKEND
+# ─────────────────────────────────────────────
+
+_instances = {}
+_lock      = threading.Lock()
+
+
+def local_dir(repo: str, branch: str = "") -> str:
+    """Direktori lokal untuk repo/branch: {STORAGE_ROOT}/{nama repo}[@branch]."""
+    name = repo.rsplit("/", 1)[-1] or "repo"
+    return os.path.join(STORAGE_ROOT, f"{name}@{branch}" if branch else name)
+
+
+def get(repo: str, branch: str = "", token: str = ""):
+    """Backend untuk repo/branch sesuai STORAGE_BACKEND (satu instance per run)."""
+    key = (repo, branch)
+    with _lock:
+        store = _instances.get(key)
+        if store is None:
+            if STORAGE_BACKEND == "local":
+                store = LocalStorage(local_dir(repo, branch))
+            elif STORAGE_BACKEND == "git":
+                store = GitStorage(local_dir(repo, branch), push=STORAGE_PUSH)
+            elif STORAGE_BACKEND == "github":
+                store = GitHubStorage(repo, branch, token)
+            else:
+                raise ValueError(f"STORAGE_BACKEND tidak dikenal: {STORAGE_BACKEND}")
+            _instances[key] = store
+        return store
+
+
+def snapshot(repo: str, branch: str = "", token: str = "", prefixes: tuple = ("",)):
+    """
+    Seperti get(), tapi untuk backend github dibungkus SnapshotStorage
+    (bulk read via tarball). Backend lokal sudah secepat disk → dikembalikan apa adanya.
+    """
+    store = get(repo, branch, token)
+    if not isinstance(store, GitHubStorage):
+        return store
+    key = ("snapshot", repo, branch, tuple(prefixes))
+    with _lock:
+        if key not in _instances:
+            _instances[key] = SnapshotStorage(store, prefixes)
+        return _instances[key]
+
+
+def finish_all() -> None:
+    """Commit + push worktree git yang masih punya perubahan (dipanggil at exit)."""
+    with _lock:
+        stores = list(_instances.values())
+    for store in stores:
+        if isinstance(store, GitStorage):
+            store.finish()
+
+
+atexit.register(finish_all)
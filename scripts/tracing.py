@@ -0,0 +1,212 @@
+"""
+tracing.py
+Span timing ringan untuk semua script pipeline.
+
+    with tracing.span("sync_manifest"):
+        ...
+
+    @tracing.traced()
+    def wrap_article_html(...): ...
+
+Setiap span mencatat: nama, start (detik sejak awal run), durasi, jumlah
+call HTTP, bytes in dan bytes out. Call HTTP (http_client) dihitung ke span
+aktif beserta semua parent-nya. Span induk diteruskan lewat contextvars,
+jadi thread yang dijalankan dengan copy_context() (StepRunner) ikut tercatat.
+
+Saat proses selesai:
+- trace ditulis sebagai JSON ke TRACE_DIR/{script}.json (artifact workflow)
+- tabel TRACE_TOP span paling lambat dicetak ke stdout
+TRACE=0 mematikan semuanya (span tetap bisa dipakai, hanya tidak dicatat).
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+TRACE_ENABLED = os.environ.get("TRACE", "1") != "0"
+TRACE_DIR     = os.environ.get("TRACE_DIR", "traces")
+TRACE_TOP     = int(os.environ.get("TRACE_TOP", 10))
+
+
+class Span:
+    __slots__ = ("id", "parent", "name", "start", "duration", "http_calls",
+                 "bytes_in", "bytes_out", "thread", "attrs", "error")
+
+    def __init__(self, span_id: int, parent, name: str, start: float, attrs: dict):
+        self.id         = span_id
+        self.parent     = parent    # Span | None
+        self.name       = name
+        self.start      = start
+        self.duration   = None
+        self.http_calls = 0
+        self.bytes_in   = 0
+        self.bytes_out  = 0
+        self.thread     = threading.current_thread().name
+        self.attrs      = attrs
+        self.error      = None
+
+    def set(self, **attrs) -> None:
+        """Tambah atribut bebas (mis. jumlah file, ukuran output)."""
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            "id":         self.id,
+            "parent":     self.parent.id if self.parent else None,
+            "name":       self.name,
+            "start":      round(self.start - origin, 6),
+            "duration":   round(self.duration, 6) if self.duration is not None else None,
+            "http_calls": self.http_calls,
+            "bytes_in":   self.bytes_in,
+            "bytes_out":  self.bytes_out,
+            "thread":     self.thread,
+            "attrs":      self.attrs,
+            "error":      self.error,
+        }
+
+
+class _NullSpan:
+    def set(self, **attrs) -> None:
+        pass
+
+
+class Tracer:
+    def __init__(self, enabled: bool = TRACE_ENABLED):
+        self.enabled    = enabled
+        self.origin     = time.monotonic()
+        self.started_at = time.time()
+        self.spans      = []
+        self.http_calls = 0   # total, termasuk call di luar span
+        self.bytes_in   = 0
+        self.bytes_out  = 0
+        self._current   = contextvars.ContextVar("tracing_span", default=None)
+        self._lock      = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            yield _NullSpan()
+            return
+        parent = self._current.get()
+        with self._lock:
+            s = Span(len(self.spans) + 1, parent, name, time.monotonic(), attrs)
+            self.spans.append(s)
+        token = self._current.set(s)
+        try:
+            yield s
+        except BaseException as e:
+            s.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            s.duration = time.monotonic() - s.start
+            self._current.reset(token)
+
+    def record_http(self, bytes_out: int, bytes_in: int) -> None:
+        """Dipanggil http_client untuk setiap request yang dikirim."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.http_calls += 1
+            self.bytes_out  += bytes_out
+            self.bytes_in   += bytes_in
+            s = self._current.get()
+            while s is not None:
+                s.http_calls += 1
+                s.bytes_out  += bytes_out
+                s.bytes_in   += bytes_in
+                s = s.parent
+
+    # ── Output ────────────────────────────────────────────────────────────────
+
+    def to_dict(self, script: str) -> dict:
+        with self._lock:
+            spans = [s.to_dict(self.origin) for s in self.spans]
+        return {
+            "script":     script,
+            "started_at": self.started_at,
+            "duration":   round(time.monotonic() - self.origin, 6),
+            "http_calls": self.http_calls,
+            "bytes_in":   self.bytes_in,
+            "bytes_out":  self.bytes_out,
+            "spans":      spans,
+        }
+
+    def write(self, script: str, directory: str = TRACE_DIR) -> str | None:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{script}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(script), f, indent=2)
+            return path
+        except OSError as e:
+            print(f"Warning: trace tidak bisa ditulis: {e}")
+            return None
+
+    def print_top(self, n: int = TRACE_TOP) -> None:
+        done = [s for s in self.spans if s.duration is not None]
+        if not done or n <= 0:
+            return
+        print(f"[trace] {n} span paling lambat "
+              f"(total {time.monotonic() - self.origin:.2f}s, {self.http_calls} HTTP, "
+              f"in {_fmt_bytes(self.bytes_in)}, out {_fmt_bytes(self.bytes_out)})")
+        print(f"  {'durasi':>8}  {'http':>4}  {'in':>8}  {'out':>8}  span")
+        for s in sorted(done, key=lambda s: s.duration, reverse=True)[:n]:
+            print(f"  {s.duration:7.3f}s  {s.http_calls:>4}  {_fmt_bytes(s.bytes_in):>8}  "
+                  f"{_fmt_bytes(s.bytes_out):>8}  {s.name}"
+                  + (f"  [{s.error}]" if s.error else ""))
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024 or unit == "MB":
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n}B"
+
+
+tracer = Tracer()
+
+
+def _script_name() -> str:
+    name = os.path.basename(sys.argv[0] or "python")
+    return name[:-3] if name.endswith(".py") else name or "python"
+
+
+def _finish() -> None:
+    if not tracer.enabled or not tracer.spans:
+        return
+    path = tracer.write(_script_name())
+    tracer.print_top()
+    if path:
+        print(f"[trace] ditulis ke {path}")
+
+
+atexit.register(_finish)
+
+
+# ── Helper modul ─────────────────────────────────────────────────────────────
+
+def span(name: str, **attrs):
+    return tracer.span(name, **attrs)
+
+
+def traced(name: str = ""):
+    """Decorator: bungkus seluruh fungsi dalam satu span."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record_http(bytes_out: int, bytes_in: int) -> None:
+    tracer.record_http(bytes_out, bytes_in)
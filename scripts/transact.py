@@ -0,0 +1,93 @@
+"""
+transact.py
+Update file state JSON (manifest, editorial memory, journal) dengan
+optimistic concurrency: read → mutate → write bersyarat, ulangi saat konflik.
+
+    def mutate(manifest):
+        manifest["queue"] = [e for e in manifest.get("queue", []) if ...]
+        return manifest
+
+    result = transact.update_json(store, "staging/articles/manifest.json",
+                                  mutate, "[pipeline] Sync manifest")
+    result.ok, result.attempts, result.value
+
+mutate(doc) menerima isi terkini (json.loads, atau salinan `default` jika file
+belum ada) dan mengembalikan isi baru, atau None jika tidak ada yang perlu
+ditulis. mutate harus murni — hanya bergantung pada doc dan data yang
+ditangkapnya — karena saat write ditolak (file berubah sejak dibaca:
+409/422 GitHub, sha beda di backend lokal) file dibaca ulang dan mutate
+dijalankan lagi di atas isi terbaru. Jeda antar attempt: backoff eksponensial
+dengan jitter, maksimal TRANSACT_ATTEMPTS attempt.
+
+Jumlah attempt dicatat di span "transact:{path}" (tracing) dan dicetak jika
+lebih dari satu.
+"""
+import os
+import copy
+import json
+import time
+import random
+from typing import NamedTuple
+
+import tracing
+from storage import ConflictError
+
+TRANSACT_ATTEMPTS = int(os.environ.get("TRANSACT_ATTEMPTS", 5))
+TRANSACT_BACKOFF  = float(os.environ.get("TRANSACT_BACKOFF", 0.5))
+
+
+class Result(NamedTuple):
+    ok:       bool
+    attempts: int
+    value:    object    # isi terakhir (yang ditulis, atau yang dibaca jika tidak berubah)
+    written:  bool      # False jika mutate mengembalikan None / gagal
+
+
+def _encode(doc) -> str:
+    return json.dumps(doc, indent=2)
+
+
+def backoff(attempt: int, base: float = TRANSACT_BACKOFF) -> float:
+    """Jeda sebelum attempt berikutnya: base * 2^(attempt-1), jitter 50–100%."""
+    return base * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+def update_json(store, path: str, mutate, message: str, default=None,
+                encode=_encode, max_attempts: int = TRANSACT_ATTEMPTS) -> Result:
+    """
+    Jalankan mutate di atas isi terkini `path` lalu tulis dengan write_if.
+    Error baca selain file tidak ada (rate limit, JSON rusak) di-raise:
+    menimpa file dari keadaan kosong akan menghapus isinya.
+    """
+    with tracing.span(f"transact:{path}") as sp:
+        for attempt in range(1, max_attempts + 1):
+            try:
+                text, sha = store.read_versioned(path, fresh=attempt > 1)
+                doc = json.loads(text)
+            except FileNotFoundError:
+                sha, doc = None, copy.deepcopy(default if default is not None else {})
+
+            new = mutate(copy.deepcopy(doc))
+            if new is None:
+                sp.set(attempts=attempt, written=False)
+                return Result(True, attempt, doc, False)
+
+            try:
+                ok = store.write_if(path, encode(new), message, sha)
+            except ConflictError as e:
+                if attempt == max_attempts:
+                    print(f"Warning: {path} masih konflik setelah {attempt} attempt, "
+                          f"update dibatalkan: {e}")
+                    sp.set(attempts=attempt, written=False)
+                    return Result(False, attempt, new, False)
+                delay = backoff(attempt)
+                print(f"{path}: berubah sejak dibaca ({e}), baca ulang & ulangi "
+                      f"dalam {delay:.1f}s ({attempt}/{max_attempts})")
+                time.sleep(delay)
+                continue
+
+            if attempt > 1:
+                print(f"{path}: ditulis setelah {attempt} attempt")
+            sp.set(attempts=attempt, written=ok)
+            return Result(ok, attempt, new, ok)
+    return Result(False, max_attempts, None, False)
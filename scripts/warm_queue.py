@@ -0,0 +1,279 @@
+"""
+warm_queue.py
+Antrian warm-up cache scraper sosial (Facebook, ...) di branch output,
+dikuras oleh proses terpisah dengan batas concurrency dan rate.
+
+    warm-queue/{waktu}-{id}.jsonl   job yang belum diproses, satu per baris:
+                                    {"url", "scrapers": [...], "queued_at", "attempts"}
+    warm-queue/seen.json            {scraper: {url: waktu scrape terakhir}}
+
+Publish hanya menambahkan file job ke commit output (enqueue), tanpa call
+keluar. Nama file unik per commit, jadi publish yang bersamaan tidak saling
+menimpa. `drain` membaca semua file job, membuang duplikat dan URL yang
+sudah di-scrape dalam WARM_DEDUP_HOURS terakhir, lalu memanggil scraper
+secara paralel (WARM_CONCURRENCY thread, WARM_RATE request/detik per
+scraper). File job yang sudah diproses dihapus, seen.json diperbarui dan
+job yang gagal diantrekan ulang (maks WARM_MAX_ATTEMPTS) dalam SATU commit.
+
+Scraper baru cukup didaftarkan dengan @scraper("nama"); endpoint Facebook
+bisa diarahkan ke stand-in lokal lewat WARM_FACEBOOK_ENDPOINT
+(mis. gh_emulator: http://127.0.0.1:8765/__emulator/scrape).
+
+    python scripts/warm_queue.py drain
+    python scripts/warm_queue.py enqueue https://.../articles/a https://.../articles/b
+    python scripts/warm_queue.py enqueue --all-articles      # mis. setelah migrasi domain
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import contextvars
+import urllib.parse
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import clock
+import storage
+import tracing
+import http_client
+import content_index
+from publisher import PublishBatch, ENGINE_REPO, GITHUB_TOKEN, OUTPUT_BRANCH
+
+QUEUE_DIR         = "warm-queue"
+SEEN_PATH         = f"{QUEUE_DIR}/seen.json"
+SITE_BASE_URL     = os.environ.get("SITE_BASE_URL", "https://saastools.corenk.com")
+WARM_CONCURRENCY  = int(os.environ.get("WARM_CONCURRENCY", 4))
+WARM_RATE         = float(os.environ.get("WARM_RATE", 2))
+WARM_DEDUP_HOURS  = float(os.environ.get("WARM_DEDUP_HOURS", 24))
+WARM_MAX_ATTEMPTS = int(os.environ.get("WARM_MAX_ATTEMPTS", 3))
+WARM_LIMIT        = int(os.environ.get("WARM_LIMIT", 0))   # job per drain, 0 = semua
+FACEBOOK_ENDPOINT = os.environ.get("WARM_FACEBOOK_ENDPOINT", "https://graph.facebook.com/")
+
+DEFAULT_SCRAPERS = ("facebook",)
+
+
+# ── Scraper ──────────────────────────────────────────────────────────────────
+
+class _Pacer:
+    """Jarak minimal antar request satu scraper (thread-safe)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next    = 0.0
+        self._lock    = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now        = time.monotonic()
+            start      = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+SCRAPERS = {}   # nama → (fn(url) -> status HTTP, _Pacer)
+
+
+def scraper(name: str, rate: float = WARM_RATE):
+    """Decorator: daftarkan fungsi scrape(url) -> int (status HTTP)."""
+    def register(fn):
+        SCRAPERS[name] = (fn, _Pacer(rate))
+        return fn
+    return register
+
+
+@scraper("facebook")
+def scrape_facebook(url: str) -> int:
+    """Paksa Facebook crawl ulang OG meta tag URL."""
+    params = urllib.parse.urlencode({"id": url, "scrape": "true"})
+    r = http_client.request("POST", f"{FACEBOOK_ENDPOINT}?{params}", body=b"",
+                            headers={"User-Agent": "ai-engine"}, timeout=10)
+    return r.status
+
+
+# ── Enqueue ──────────────────────────────────────────────────────────────────
+
+def job(url: str, scrapers: tuple = DEFAULT_SCRAPERS, attempts: int = 0) -> dict:
+    unknown = [s for s in scrapers if s not in SCRAPERS]
+    if unknown:
+        raise ValueError(f"scraper tidak dikenal: {', '.join(unknown)}")
+    return {"url": url, "scrapers": list(scrapers),
+            "queued_at": clock.utcnow().isoformat(), "attempts": attempts}
+
+
+def _queue_path(body: str) -> str:
+    stamp  = clock.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    digest = hashlib.sha1(body.encode("utf-8")).hexdigest()[:8]
+    return f"{QUEUE_DIR}/{stamp}-{digest}.jsonl"
+
+
+def enqueue(batch: PublishBatch, jobs: list) -> str | None:
+    """Tambahkan file job ke batch output. Return path, atau None jika kosong."""
+    if not jobs:
+        return None
+    body = "".join(json.dumps(j, ensure_ascii=False) + "\n" for j in jobs)
+    path = _queue_path(body)
+    batch.add(path, body)
+    return path
+
+
+# ── Drain ────────────────────────────────────────────────────────────────────
+
+def _store():
+    return storage.get(ENGINE_REPO, OUTPUT_BRANCH, token=GITHUB_TOKEN)
+
+
+def read_queue(store) -> tuple:
+    """(jobs, paths) dari semua file job, urut nama file (= urutan antre)."""
+    paths = sorted(f["path"] for f in store.list_folder(QUEUE_DIR)
+                   if f["name"].endswith(".jsonl"))
+    jobs = []
+    for path in paths:
+        for n, line in enumerate(store.read(path).splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                jobs.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                print(f"Warning: {path}:{n} bukan JSON valid, dilewati: {e}")
+    return jobs, paths
+
+
+def _load_seen(store) -> dict:
+    try:
+        return json.loads(store.read(SEEN_PATH))
+    except FileNotFoundError:
+        return {}
+
+
+def _scrape(name: str, url: str) -> tuple:
+    fn, pacer = SCRAPERS[name]
+    pacer.wait()
+    try:
+        with tracing.span(f"scrape:{name}", url=url):
+            status = fn(url)
+        return name, url, True, status
+    except Exception as e:
+        return name, url, False, str(e)
+
+
+@tracing.traced()
+def drain(concurrency: int = WARM_CONCURRENCY, limit: int = WARM_LIMIT) -> dict:
+    """
+    Proses antrian. Return ringkasan {scraped, deduped, failed, requeued, dropped}.
+    Job di luar `limit` tetap di antrian (file-nya ditulis ulang).
+    """
+    store = _store()
+    summary = {"scraped": 0, "deduped": 0, "failed": 0, "requeued": 0, "dropped": 0}
+    jobs, paths = read_queue(store)
+    if not paths:
+        print("Warm queue kosong")
+        return summary
+
+    now     = clock.utcnow()
+    cutoff  = (now - timedelta(hours=WARM_DEDUP_HOURS)).isoformat()
+    seen    = _load_seen(store)
+    # Buang catatan seen yang sudah di luar jendela dedup
+    seen    = {name: {u: t for u, t in urls.items() if t >= cutoff}
+               for name, urls in seen.items()}
+    later   = jobs[limit:] if limit else []
+    jobs    = jobs[:limit] if limit else jobs
+
+    tasks, attempts = [], {}
+    for j in jobs:
+        for name in j.get("scrapers") or DEFAULT_SCRAPERS:
+            key = (name, j["url"])
+            if name not in SCRAPERS:
+                print(f"Warning: scraper tidak dikenal, job dibuang: {name} {j['url']}")
+                summary["dropped"] += 1
+            elif key in attempts or j["url"] in seen.get(name, {}):
+                summary["deduped"] += 1
+            else:
+                attempts[key] = j.get("attempts", 0)
+                tasks.append(key)
+
+    print(f"Warm queue: {len(jobs)} job dari {len(paths)} file → {len(tasks)} scrape "
+          f"({summary['deduped']} duplikat / baru di-scrape dilewati)")
+    retry = []
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1),
+                            thread_name_prefix="warm") as pool:
+        # copy_context: span scrape menjadi anak span drain
+        futures = [pool.submit(contextvars.copy_context().run, _scrape, name, url)
+                   for name, url in tasks]
+        for future in futures:
+            name, url, ok, status = future.result()
+            if ok:
+                summary["scraped"] += 1
+                seen.setdefault(name, {})[url] = now.isoformat()
+                print(f"Warmed [{name}] {url} (HTTP {status})")
+                continue
+            summary["failed"] += 1
+            tries = attempts[(name, url)] + 1
+            if tries < WARM_MAX_ATTEMPTS:
+                retry.append(job(url, (name,), attempts=tries))
+                summary["requeued"] += 1
+            else:
+                summary["dropped"] += 1
+            print(f"Warning: warm [{name}] {url} gagal ({tries}/{WARM_MAX_ATTEMPTS}): {status}")
+
+    batch = PublishBatch(
+        f"[warm] Drain {summary['scraped']} scrape, {summary['requeued']} diulang",
+        repo=ENGINE_REPO, branch=OUTPUT_BRANCH
+    )
+    for path in paths:
+        batch.remove(path)
+    enqueue(batch, later + retry)
+    batch.add(SEEN_PATH, json.dumps(seen, indent=2, sort_keys=True))
+    if not batch.commit():
+        # Job tetap di antrian; scrape yang sudah jalan akan dedup di Facebook
+        print("Warning: Gagal commit hasil drain warm queue, antrian tidak berubah")
+    print(f"Warm queue selesai: {summary}")
+    return summary
+
+
+def article_urls() -> list:
+    """URL semua artikel di content-index.json (untuk enqueue massal)."""
+    index = content_index.load(_store())
+    return [f"{SITE_BASE_URL}/articles/{e['slug']}" for e in index.get("articles", [])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Antrian warm-up cache scraper sosial")
+    sub    = parser.add_subparsers(dest="command", required=True)
+    p_drain = sub.add_parser("drain", help="proses antrian")
+    p_drain.add_argument("--concurrency", type=int, default=WARM_CONCURRENCY)
+    p_drain.add_argument("--limit", type=int, default=WARM_LIMIT,
+                         help="job maksimal per drain (0 = semua)")
+    p_enq = sub.add_parser("enqueue", help="tambah URL ke antrian")
+    p_enq.add_argument("urls", nargs="*")
+    p_enq.add_argument("--all-articles", action="store_true",
+                       help="semua artikel di content-index.json")
+    p_enq.add_argument("--scraper", action="append", dest="scrapers",
+                       help=f"default: {', '.join(DEFAULT_SCRAPERS)}")
+    args = parser.parse_args()
+
+    if args.command == "drain":
+        drain(concurrency=args.concurrency, limit=args.limit)
+        return
+
+    urls = list(args.urls) + (article_urls() if args.all_articles else [])
+    if not urls:
+        print("Tidak ada URL untuk diantrekan")
+        return
+    batch = PublishBatch(f"[warm] Enqueue {len(urls)} URL",
+                         repo=ENGINE_REPO, branch=OUTPUT_BRANCH)
+    enqueue(batch, [job(u, tuple(args.scrapers or DEFAULT_SCRAPERS)) for u in urls])
+    if not batch.commit():
+        print("FATAL: Gagal commit warm queue")
+        sys.exit(1)
+    print(f"{len(urls)} URL diantrekan")
+
+
+if __name__ == "__main__":
+    with tracing.span("warm_queue"):
+        main()
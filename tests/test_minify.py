@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import minify  # noqa: E402
+from page_template import Template, json_ld, slot  # noqa: E402
+
+
+# ── JS: ASI ──────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("src, expected", [
+    ("var a = 1\nvar b = 2", "var a=1\nvar b=2"),       # baris baru = akhir statement
+    ("a = b\n(c)", "a=b\n(c)"),                         # bukan a = b(c)
+    ("return\nx", "return\nx"),                         # return; x
+    ("i\n++\nj", "i\n++\nj"),                           # i; ++j
+    ("f(function () {\n  return 1;\n});", "f(function(){return 1;});"),
+    ("a = 1 /* c */\nb = 2", "a=1\nb=2"),
+    ("var s = 'a // b' // c\nf()", "var s='a // b'\nf()"),
+    ("x = y++ + +z", "x=y++ + +z"),
+])
+def test_js_asi(src, expected):
+    assert minify.js(src) == expected
+
+
+# ── JS: regex vs pembagian ───────────────────────────────────────────────────
+
+def test_js_division():
+    assert minify.js("a = b / c / d") == "a=b/c/d"
+    assert minify.js("x = (a) / 2 / (b)") == "x=(a)/2/(b)"
+
+
+def test_js_regex_literal():
+    # Spasi & kutip di dalam regex bukan whitespace / string JS
+    assert minify.js('a = b.replace(/ +/g, "-")') == 'a=b.replace(/ +/g,"-")'
+    assert minify.js("s = t.replace(/'/g, '')") == "s=t.replace(/'/g,'')"
+    assert minify.js("var r = /[/]/g") == "var r=/[/]/g"
+    assert minify.js("return /a b/.test(x)") == "return/a b/.test(x)"
+
+
+def test_js_uncertain_left_alone():
+    for src in ("var t = `a ${b}`", "x = 'unterminated", "a = /* open"):
+        assert minify.js(src) == src
+
+
+# ── HTML ─────────────────────────────────────────────────────────────────────
+
+def test_html_preserves_pre_and_textarea():
+    src = "<p>a   b</p>\n\n<pre>  x\n\n y </pre><textarea> a  b\n</textarea><p>  c </p>"
+    assert minify.html(src) == "<p>a b</p>\n<pre>  x\n\n y </pre><textarea> a  b\n</textarea><p> c </p>"
+
+
+def test_html_preserves_white_space_pre_style():
+    src = '<div style="white-space:pre">  a  <div> b </div>  </div>  z  '
+    assert minify.html(src) == '<div style="white-space:pre">  a  <div> b </div>  </div> z'
+
+
+def test_html_self_closing_after_unquoted_value():
+    assert minify.html("<input value=a />") == "<input value=a />"
+    assert minify.html('<img alt="x" />') == '<img alt="x"/>'
+    assert minify.html("<br />") == "<br/>"
+    assert minify.html('<a title="a >" >x</a>') == '<a title="a >">x</a>'
+
+
+def test_fragment():
+    src = ('<p>a   b\n\n c</p>  <!-- x --><pre>  x\n  y</pre>\n\n'
+           '<div style="white-space:pre-wrap">  a <div> b </div>  c </div>  d  '
+           '<script>var  a = 1;\n\n  b</script>')
+    assert minify.fragment(src) == (
+        '<p>a b\nc</p> <pre>  x\n  y</pre>\n'
+        '<div style="white-space:pre-wrap">  a <div> b </div>  c </div> d '
+        '<script>var  a = 1;\n\n  b</script>')
+
+
+# ── Deterministik & idempoten ────────────────────────────────────────────────
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <title>  T  </title>
+  <style>
+    a { color : red ; }
+  </style>
+  <script type="application/ld+json">
+  {"@type": "Article",  "name": "x"}
+  </script>
+</head>
+<body>
+  <!-- komentar -->
+  <pre>  keep  </pre>
+  <input value=a />
+  <script>
+    var a = b / c
+    var r = / +/g
+  </script>
+</body>
+</html>
+"""
+
+
+def test_deterministic_and_idempotent():
+    once = minify.html(_PAGE)
+    assert once == minify.html(_PAGE)
+    assert minify.html(once) == once
+    assert minify.fragment(once) == once
+    css = minify.css(" a { b: c ; } .x :hover { } ")
+    assert css == "a{b:c}.x :hover{}"
+    assert minify.css(css) == css
+
+
+def test_template_minified_at_compile_time():
+    page = Template("<html>\n  <title>{{title}}</title>{{ld}}\n  <main>\n    {{body}}\n  </main>\n</html>",
+                    name="t", minify=minify.html,
+                    ld=json_ld({"name": slot("title"), "faq": slot("faq")}))
+    out = page.render(title="A  B", faq=[{"q": 1}], body=minify.fragment("<p>x   y</p>"))
+    assert out == ('<html>\n<title>A  B</title>\n<script type="application/ld+json">'
+                   '{"name":"A  B","faq":[{"q":1}]}</script>\n<main>\n<p>x y</p>\n</main>\n</html>')
+    assert minify.html(out) == out.replace("A  B</title>", "A B</title>")